@@ -34,12 +34,16 @@ def main():
 
             sharename = f"MarketingShare0{x}"
 
-            findshare = client.shares.get(spec=f"name=eq={sharename}")
-            logger.info(f"Attempting to delete share count: {len(findshare)}")
+            # Resolved from the client's in-memory name index (one list call for all shares)
+            share_uuid = client.resolver.resolve("shares", sharename)
+            if not share_uuid:
+                logger.warning(f"Share {sharename} not found, skipping.")
+                continue
+            logger.info(f"Attempting to delete share {sharename} ({share_uuid})")
 
             # Simpler call if no extra query params are needed beyond the body
             result = client.shares.delete_share(
-                identifier=findshare[0].get('uoid', {}).get('uuid', {}),
+                identifier=share_uuid,
                 monitor_task=False, # Set to False if you know it's always synchronous (200 OK)
                 task_timeout_seconds=600
             )
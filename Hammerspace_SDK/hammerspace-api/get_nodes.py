@@ -17,7 +17,7 @@ import os
 import sys
 import json
 import argparse
-from typing import Dict, List, Optional, TypedDict
+from typing import Any, Dict, List, Optional, TypedDict, Iterator
 
 from hammerspace.client import HammerspaceApiClient
 
@@ -91,6 +91,75 @@ def get_management_ips(
     return nodes
 
 
+def iter_nodes_by_type(
+    nodes_api: Any,
+    node_types: List[str],
+    page_size: int = 100
+) -> Iterator[Dict]:
+    """
+    Stream nodes of the given product types page by page, filtered server-side.
+
+    Args:
+        nodes_api: Anything with NodesClient's list_nodes(spec=, page=, page_size=),
+            e.g. client.nodes
+        node_types: Product node types to include (e.g., ['ANVIL', 'DSX'])
+        page_size: Nodes per page request
+
+    Yields:
+        Node objects as returned by GET /nodes
+    """
+    spec = f"productNodeType=in=({','.join(node_types)})"
+    seen = set()
+    page = 0
+    while True:
+        batch = nodes_api.list_nodes(spec=spec, page=page, page_size=page_size) or []
+        new = 0
+        for node in batch:
+            key = node.get('uoid', {}).get('uuid') or node.get('name')
+            if key in seen:
+                continue
+            seen.add(key)
+            new += 1
+            yield node
+        # Stop on a short page, or if the server ignores paging and repeats nodes
+        if len(batch) < page_size or new == 0:
+            return
+        page += 1
+
+
+def get_management_ips_filtered(
+    client: HammerspaceApiClient,
+    node_types: Optional[List[str]] = None,
+    page_size: int = 100
+) -> List[NodeInfo]:
+    """
+    Same result as get_management_ips, but lists only the matching nodes via
+    NodesClient.list_nodes with a spec predicate instead of every network interface.
+    """
+    if node_types is None:
+        node_types = ['ANVIL', 'DSX']
+
+    node_types = [t.upper() for t in node_types]
+    nodes = []
+    for node in iter_nodes_by_type(client.nodes, node_types, page_size):
+        node_name = node.get('name')
+        node_type = (node.get('productNodeType') or '').upper()
+        # Re-check the type in case the server does not support the spec predicate
+        if node_type not in node_types or not node_name:
+            continue
+        ip_address = (node.get('mgmtIpAddress') or {}).get('address')
+        if not ip_address:
+            continue
+        nodes.append({
+            'name': node_name,
+            'ip': ip_address,
+            'type': node_type.lower(),
+            'product_node_type': node_type
+        })
+
+    return nodes
+
+
 def main():
     """Main function to parse arguments and run the discovery."""
     parser = argparse.ArgumentParser(description='Discover Hammerspace nodes')
@@ -101,6 +170,8 @@ def main():
                       help='Hammerspace password')
     parser.add_argument('--output-format', choices=['json', 'prometheus'], default='json',
                       help='Output format (default: json)')
+    parser.add_argument('--method', choices=['nodes', 'interfaces'], default='nodes',
+                      help='nodes: filtered node listing (default); interfaces: all network interfaces')
     
     args = parser.parse_args()
     
@@ -114,7 +185,10 @@ def main():
         )
         
         # Get node information
-        nodes = get_management_ips(client)
+        if args.method == 'nodes':
+            nodes = get_management_ips_filtered(client)
+        else:
+            nodes = get_management_ips(client)
         
         if args.output_format == 'prometheus':
             # Output in Prometheus static_configs format
@@ -13,6 +13,7 @@ from .ad import AdClient
 from .antivirus import AntivirusClient
 from .backup import BackupClient
 from .base_storage_volumes import BaseStorageVolumesClient
+from .capacity import CapacityClient
 from .cntl import CntlClient
 from .data_analytics import DataAnalyticsClient
 from .data_copy_to_object import DataCopyToObjectClient
@@ -22,10 +23,14 @@ from .dnss import DnssClient
 from .domain_idmaps import DomainIdmapsClient
 from .events import EventsClient
 from .file_snapshots import FileSnapshotsClient
+from .file_sync import FileSyncClient
 from .files import FilesClient
 from .gateways import GatewaysClient
 from .heartbeat import HeartbeatClient
+from .history_store import HistoryStore
 from .i18n import I18nClient
+from .informer import Informer, InformerFactory
+from .inventory import InventoryClient, diff_snapshots, load_snapshot, save_snapshot
 from .identity_group_mappings import IdentityGroupMappingsClient
 from .identity import IdentityClient
 from .idp import IdpClient
@@ -39,6 +44,7 @@ from .login_policy import LoginPolicyClient
 from .login import LoginClient # Assuming LoginClient exists for /login endpoint
 from .mailsmtp import MailsmtpClient
 from .metrics import MetricsClient
+from .metrics_cache import MetricsCache
 from .modeler import ModelerClient
 from .network_interfaces import NetworkInterfacesClient
 from .nis import NisClient
@@ -52,6 +58,7 @@ from .objectives import ObjectivesClient
 from .pd_node_cntl import PdNodeCntlClient
 from .pd_support import PdSupportClient
 from .processor import ProcessorClient
+from .resolver import NameResolver
 from .reports import ReportsClient
 from .roles import RolesClient
 from .s3server import S3ServerClient
@@ -82,6 +89,7 @@ __all__ = [
     "AntivirusClient",
     "BackupClient",
     "BaseStorageVolumesClient",
+    "CapacityClient",
     "CntlClient",
     "DataAnalyticsClient",
     "DataCopyToObjectClient",
@@ -91,10 +99,18 @@ __all__ = [
     "DomainIdmapsClient",
     "EventsClient",
     "FileSnapshotsClient",
+    "FileSyncClient",
     "FilesClient",
     "GatewaysClient",
     "HeartbeatClient",
+    "HistoryStore",
     "I18nClient",
+    "Informer",
+    "InformerFactory",
+    "InventoryClient",
+    "diff_snapshots",
+    "load_snapshot",
+    "save_snapshot",
     "IdentityGroupMappingsClient",
     "IdentityClient",
     "IdpClient",
@@ -108,6 +124,7 @@ __all__ = [
     "LoginClient",
     "MailsmtpClient",
     "MetricsClient",
+    "MetricsCache",
     "ModelerClient",
     "NetworkInterfacesClient",
     "NisClient",
@@ -121,6 +138,7 @@ __all__ = [
     "PdNodeCntlClient",
     "PdSupportClient",
     "ProcessorClient",
+    "NameResolver",
     "ReportsClient",
     "RolesClient",
     "S3ServerClient",
@@ -0,0 +1,230 @@
+# hammerspace/capacity.py
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+
+from . import columnar
+
+logger = logging.getLogger(__name__)
+
+CAPACITY_OBJECT_TYPES = ("SHARE", "STORAGE_VOLUME", "OBJECT_STORAGE_VOLUME")
+
+
+class CapacityClient:
+    def __init__(self, api_client: Any):
+        """
+        Bulk capacity and stats collection across shares, storage volumes and
+        object-storage volumes. Per-object requests run concurrently with bounded
+        parallelism, and stats are fetched with 'breakdown' (many objects per request)
+        where the server supports it.
+        """
+        self.api_client = api_client
+
+    def _list_client(self, object_type: str) -> Any:
+        return {
+            "SHARE": self.api_client.shares,
+            "STORAGE_VOLUME": self.api_client.storage_volumes,
+            "OBJECT_STORAGE_VOLUME": self.api_client.object_storage_volumes,
+        }[object_type]
+
+    @staticmethod
+    def _entity_uuid(entity: Dict[str, Any]) -> Optional[str]:
+        return (entity.get("uoid") or {}).get("uuid") or entity.get("uuid")
+
+    def list_objects(
+        self, object_types: Tuple[str, ...] = CAPACITY_OBJECT_TYPES, max_workers: int = 4
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Lists the objects of each type concurrently.
+
+        Returns:
+            A dict mapping each object type to its list of entities.
+
+        Raises:
+            The first listing error, once all types have been tried, so callers can tell an
+            API failure from a cluster without objects.
+        """
+        for object_type in object_types:
+            if object_type not in CAPACITY_OBJECT_TYPES:
+                raise ValueError(f"Invalid object type '{object_type}', expected one of {CAPACITY_OBJECT_TYPES}.")
+        objects: Dict[str, List[Dict[str, Any]]] = {}
+        first_error: Optional[Exception] = None
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {t: pool.submit(self._list_client(t).get) for t in object_types}
+            for object_type, future in futures.items():
+                try:
+                    objects[object_type] = future.result() or []
+                except Exception as e:
+                    logger.warning(f"Failed to list {object_type} objects: {e}")
+                    first_error = first_error or e
+        if first_error is not None:
+            raise first_error
+        return objects
+
+    @staticmethod
+    def _tag_series(response: Any, tags: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Returns the series of a response with the given tags added (existing server tags win)."""
+        return [
+            {
+                "name": serie.get("name"),
+                "tags": {**tags, **(serie.get("tags") or {})},
+                "columns": serie.get("columns") or [],
+                "values": serie.get("values") or [],
+            }
+            for serie in columnar.iter_series(response)
+        ]
+
+    def _fetch_per_object(
+        self,
+        pool: ThreadPoolExecutor,
+        source: str,
+        entities: List[Tuple[str, Dict[str, Any]]],
+        fetch: Any
+    ) -> List[Any]:
+        futures = []
+        for object_type, entity in entities:
+            uuid = self._entity_uuid(entity)
+            if not uuid:
+                continue
+            tags = {"source": source, "object_type": object_type, "object_name": entity.get("name"), "object_uuid": uuid}
+            futures.append((tags, pool.submit(fetch, object_type, uuid)))
+        return futures
+
+    def _fetch_stats_breakdown(
+        self,
+        pool: ThreadPoolExecutor,
+        category: str,
+        cluster_uuid: str,
+        objects: Dict[str, List[Dict[str, Any]]],
+        chunk_size: int,
+        **kwargs
+    ) -> List[Any]:
+        """Submits one cluster-level stats request per chunk of share / volume uuids, broken down by object type."""
+        futures = []
+        uuid_params = {"SHARE": "share_uuid", "STORAGE_VOLUME": "volume_uuid", "OBJECT_STORAGE_VOLUME": "volume_uuid"}
+        for object_type, entities in objects.items():
+            uuids = [u for u in (self._entity_uuid(e) for e in entities) if u]
+            for i in range(0, len(uuids), chunk_size):
+                params = dict(kwargs, breakdown=[object_type], **{uuid_params[object_type]: uuids[i:i + chunk_size]})
+                tags = {"source": f"stats:{category}", "object_type": object_type}
+                futures.append((tags, set(uuids[i:i + chunk_size]), pool.submit(
+                    self.api_client.reports.get_stats_report, category, "CLUSTER", cluster_uuid, **params
+                )))
+        return futures
+
+    def collect(
+        self,
+        object_types: Tuple[str, ...] = CAPACITY_OBJECT_TYPES,
+        stats_category: Optional[str] = None,
+        preceding_duration: str = "5m",
+        interval_duration: Optional[str] = None,
+        use_breakdown: bool = True,
+        breakdown_chunk_size: int = 100,
+        cluster_uuid: Optional[str] = None,
+        max_workers: int = 16,
+        output: str = "columns",
+        objects: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        errors: Optional[List[str]] = None
+    ) -> Any:
+        """
+        Collects capacity metrics (and optionally stats) for every share, storage volume and
+        object-storage volume into one merged columnar result.
+
+        Capacity has no multi-object endpoint, so it is fetched per object with at most
+        max_workers requests in flight. Stats are fetched from the cluster-level stats report
+        with 'breakdown' in chunks of breakdown_chunk_size objects; if a breakdown request
+        fails the stats of that chunk's objects are fetched per object instead.
+
+        Args:
+            object_types (Tuple[str, ...]): Object types to collect.
+            stats_category (str): Also collect this get_stats_report category
+                ('alignment', 'metadata', 'performance' or 'space'); None collects capacity only.
+            preceding_duration (str): Window of data to fetch (e.g. "5m").
+            interval_duration (str): Sampling interval (e.g. "60s"); None uses the server default.
+            use_breakdown (bool): Fetch stats with 'breakdown' requests instead of one per object.
+            breakdown_chunk_size (int): Object uuids per breakdown request.
+            cluster_uuid (str): Cluster uuid for breakdown requests (default: from cntl state).
+            max_workers (int): Maximum number of concurrent requests.
+            output (str): 'columns' (default), 'numpy', 'arrow' or 'pandas' (see hammerspace.columnar).
+            objects (Dict[str, List]): Pre-listed objects per type, as returned by list_objects.
+            errors (List[str]): If given, a message for every failed request is appended, so
+                callers can report partial failures; the series that did succeed are returned.
+
+        Returns:
+            The merged series, each tagged with 'source' ('capacity' or 'stats:<category>'),
+            'object_type' and, for per-object requests, 'object_name' and 'object_uuid'.
+        """
+        start_time = time.time()
+        if objects is None:
+            objects = self.list_objects(object_types)
+        entities = [(t, e) for t in object_types for e in objects.get(t, [])]
+        query = {"preceding_duration": preceding_duration}
+        if interval_duration:
+            query["interval_duration"] = interval_duration
+
+        def fetch_capacity(object_type: str, uuid: str) -> Any:
+            return self.api_client.metrics.get_metrics_capacity(object_type, uuid, **query)
+
+        def fetch_stats(object_type: str, uuid: str) -> Any:
+            return self.api_client.reports.get_stats_report(stats_category, object_type, uuid, **query)
+
+        series: List[Dict[str, Any]] = []
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = self._fetch_per_object(pool, "capacity", entities, fetch_capacity)
+            if stats_category and use_breakdown and entities:
+                if cluster_uuid is None:
+                    state = self.api_client.cntl.get_cluster_state() or {}
+                    cluster_uuid = self._entity_uuid(state)
+                if cluster_uuid:
+                    breakdown_futures = self._fetch_stats_breakdown(
+                        pool, stats_category, cluster_uuid,
+                        {t: objects.get(t, []) for t in object_types}, breakdown_chunk_size, **query
+                    )
+                else:
+                    logger.warning("Cluster uuid unknown; fetching stats per object.")
+                    breakdown_futures = None
+            else:
+                breakdown_futures = None
+            if stats_category and breakdown_futures is None:
+                futures.extend(self._fetch_per_object(pool, f"stats:{stats_category}", entities, fetch_stats))
+
+            for tags, future in futures:
+                try:
+                    series.extend(self._tag_series(future.result(), tags))
+                except Exception as e:
+                    message = f"Failed to collect {tags.get('source')} for {tags.get('object_type')} {tags.get('object_uuid')}: {e}"
+                    logger.warning(message)
+                    failed += 1
+                    if errors is not None:
+                        errors.append(message)
+
+            retry_uuids = set()
+            for tags, uuids, future in breakdown_futures or []:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.warning(f"Breakdown stats request for {tags['object_type']} failed ({e}); falling back to per-object requests.")
+                    response = None
+                if response is None:
+                    retry_uuids.update(uuids)
+                    continue
+                series.extend(self._tag_series(response, tags))
+            if retry_uuids:
+                retry_entities = [(t, e) for t, e in entities if self._entity_uuid(e) in retry_uuids]
+                for tags, future in self._fetch_per_object(pool, f"stats:{stats_category}", retry_entities, fetch_stats):
+                    try:
+                        series.extend(self._tag_series(future.result(), tags))
+                    except Exception as e:
+                        message = f"Failed to collect stats for {tags['object_type']} {tags['object_uuid']}: {e}"
+                        logger.warning(message)
+                        failed += 1
+                        if errors is not None:
+                            errors.append(message)
+
+        logger.info(
+            f"Collected {len(series)} series for {len(entities)} objects in "
+            f"{time.time() - start_time:.2f}s ({failed} failed requests)"
+        )
+        return columnar.convert(series, output)
@@ -2,12 +2,15 @@
 import requests
 import time
 import logging
-from typing import Optional, Dict, Any, Union, List, IO
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Union, List, IO, Iterable, Callable
 
 from .ad import AdClient
 from .antivirus import AntivirusClient
 from .backup import BackupClient
 from .base_storage_volumes import BaseStorageVolumesClient
+from .capacity import CapacityClient
 from .cntl import CntlClient
 from .data_analytics import DataAnalyticsClient
 from .data_copy_to_object import DataCopyToObjectClient
@@ -17,6 +20,7 @@ from .dnss import DnssClient
 from .domain_idmaps import DomainIdmapsClient
 from .events import EventsClient
 from .file_snapshots import FileSnapshotsClient
+from .file_sync import FileSyncClient
 from .files import FilesClient
 from .gateways import GatewaysClient
 from .heartbeat import HeartbeatClient
@@ -24,6 +28,7 @@ from .i18n import I18nClient
 from .identity_group_mappings import IdentityGroupMappingsClient
 from .identity import IdentityClient
 from .idp import IdpClient
+from .inventory import InventoryClient
 from .kmses import KmsesClient
 from .labels import LabelsClient
 from .ldaps import LdapsClient
@@ -47,6 +52,7 @@ from .objectives import ObjectivesClient
 from .pd_node_cntl import PdNodeCntlClient
 from .pd_support import PdSupportClient
 from .processor import ProcessorClient
+from .resolver import NameResolver
 from .reports import ReportsClient
 from .roles import RolesClient
 from .s3server import S3ServerClient
@@ -73,6 +79,7 @@ from .volume_groups import VolumeGroupsClient
 
 logger = logging.getLogger(__name__)
 
+
 class HammerspaceApiClient:
     def __init__(
         self,
@@ -89,6 +96,7 @@ class HammerspaceApiClient:
         self.timeout = timeout
         self.verify_ssl = verify_ssl
         self.session = requests.Session()
+        self._mutation_listeners: List[Callable[[str, str], None]] = []
 
         if not verify_ssl:
             from requests.packages.urllib3.exceptions import InsecureRequestWarning
@@ -99,6 +107,7 @@ class HammerspaceApiClient:
         self.antivirus = AntivirusClient(self)
         self.backup = BackupClient(self)
         self.base_storage_volumes = BaseStorageVolumesClient(self)
+        self.capacity = CapacityClient(self)
         self.cntl = CntlClient(self)
         self.data_analytics = DataAnalyticsClient(self)
         self.data_copy_to_object = DataCopyToObjectClient(self)
@@ -108,6 +117,7 @@ class HammerspaceApiClient:
         self.domain_idmaps = DomainIdmapsClient(self)
         self.events = EventsClient(self)
         self.file_snapshots = FileSnapshotsClient(self)
+        self.file_sync = FileSyncClient(self)
         self.files = FilesClient(self)
         self.gateways = GatewaysClient(self)
         self.heartbeat = HeartbeatClient(self)
@@ -115,6 +125,7 @@ class HammerspaceApiClient:
         self.identity_group_mappings = IdentityGroupMappingsClient(self)
         self.identity = IdentityClient(self)
         self.idp = IdpClient(self)
+        self.inventory = InventoryClient(self)
         self.kmses = KmsesClient(self)
         self.labels = LabelsClient(self)
         self.ldaps = LdapsClient(self)
@@ -161,9 +172,30 @@ class HammerspaceApiClient:
         self.users = UsersClient(self)
         self.versions = VersionsClient(self)
         self.volume_groups = VolumeGroupsClient(self)
+        # Name -> uuid index, invalidated through the mutation listener below
+        self.resolver = NameResolver(self)
 
         logger.info(f"HammerspaceApiClient initialized for {self.base_url} with all clients.")
 
+    def add_mutation_listener(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Registers callback(method, path), called after every successful non-GET request
+        (create / update / delete) with the path relative to base_url. Used by caches such
+        as the NameResolver to invalidate themselves.
+        """
+        self._mutation_listeners.append(callback)
+
+    def remove_mutation_listener(self, callback: Callable[[str, str], None]) -> None:
+        if callback in self._mutation_listeners:
+            self._mutation_listeners.remove(callback)
+
+    def _notify_mutation(self, method: str, url: str) -> None:
+        path = url[len(self.base_url) - 1:] if url.startswith(self.base_url) else url
+        for callback in list(self._mutation_listeners):
+            try:
+                callback(method.upper(), path)
+            except Exception as e:
+                logger.error(f"Mutation listener failed for {method} {path}: {e}")
 
     def make_rest_call(
         self,
@@ -223,6 +255,8 @@ class HammerspaceApiClient:
             else:
                 logger.debug(log_msg_prefix)
             response.raise_for_status()
+            if not is_login and method.upper() not in ("GET", "HEAD", "OPTIONS"):
+                self._notify_mutation(method, url)
             return response
         except requests.exceptions.HTTPError as e:
             err_msg = f"HTTP error: {e.response.status_code} {e.response.reason} for {method} {url}."
@@ -321,9 +355,7 @@ class HammerspaceApiClient:
                     continue
 
                 if current_task_data and isinstance(current_task_data, dict):
-                    task_state = current_task_data.get('state', current_task_data.get('status', '')).upper()
-                    if not task_state:
-                        task_state = current_task_data.get('statusMessage', '').upper()
+                    task_state = self.get_task_state(current_task_data)
                     
                     progress = current_task_data.get("progressPercent", "N/A")
                     logger.info(f"Task at {location_url} - State: {task_state}, Progress: {progress}%")
@@ -361,3 +393,168 @@ class HammerspaceApiClient:
 
         logger.warning(f"Initial call returned status {initial_response.status_code} which is not a standard success or task initiation. Response: {initial_response_data}")
         return initial_response_data
+
+    @staticmethod
+    def get_task_state(task_data: Optional[Dict[str, Any]]) -> str:
+        """Returns the upper-cased state of a TaskView dict ('' if unknown)."""
+        if not isinstance(task_data, dict):
+            return ''
+        task_state = str(task_data.get('state', task_data.get('status', '')) or '').upper()
+        if not task_state:
+            task_state = str(task_data.get('statusMessage', '') or '').upper()
+        return task_state
+
+    def submit_task(
+        self,
+        path: str,
+        method: str = "POST",
+        initial_json_data: Optional[Dict[str, Any]] = None,
+        initial_query_params: Optional[Dict[str, Any]] = None,
+        initial_headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Issues an API call that may start an asynchronous task, without waiting for it.
+        Pair with monitor_tasks() to track many submitted tasks together.
+
+        Returns:
+            A dict with 'status_code', 'location' (task URL from a 202 Location header, or None)
+            and 'data' (parsed response body). Raises requests.exceptions.RequestException on failure.
+        """
+        response = self.make_rest_call(
+            path,
+            method=method,
+            json_data=initial_json_data,
+            query_params=initial_query_params,
+            custom_headers=initial_headers
+        )
+        location_url = response.headers.get('Location') if response.status_code == 202 else None
+        return {
+            "status_code": response.status_code,
+            "location": location_url,
+            "data": self.read_and_parse_json_body(response),
+        }
+
+    @staticmethod
+    def _field_value(item: Dict[str, Any], field: str) -> Any:
+        """Reads a (dotted) field of a listed object; uuid fields fall back to a top-level 'uuid'."""
+        if field in ("uoid.uuid", "uuid"):
+            return (item.get("uoid") or {}).get("uuid") or item.get("uuid")
+        value: Any = item
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    def _chunk_in_predicates(self, path: str, field: str, values: List[str], max_url_length: int) -> List[List[str]]:
+        """Splits values into groups whose 'field=in=(...)' spec keeps the request URL under max_url_length."""
+        overhead = len(f"{self.base_url}{path.lstrip('/')}?spec=") + len(quote(f"{field}=in=()", safe=""))
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        length = overhead
+        for value in values:
+            # Quote values that contain RSQL reserved characters
+            term = value if value.replace("-", "").replace("_", "").replace(".", "").isalnum() else '"' + value.replace('"', '\\"') + '"'
+            term_length = len(quote(term, safe="")) + (len(quote(",", safe="")) if current else 0)
+            if current and length + term_length > max_url_length:
+                chunks.append(current)
+                current, length = [], overhead
+                term_length = len(quote(term, safe=""))
+            current.append(term)
+            length += term_length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def get_by_identifiers(
+        self,
+        resource: str,
+        identifiers: Iterable[str],
+        field: str = "uoid.uuid",
+        max_url_length: int = 4000,
+        max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Fetches many objects of one resource type with 'field=in=(...)' spec filters instead of
+        one get(identifier) call per object. The identifiers are chunked so each request URL
+        stays under max_url_length, and the chunks are fetched concurrently.
+
+        Args:
+            resource (str): Resource client attribute with a listing get() (e.g. "shares", "nodes").
+            identifiers (Iterable[str]): Values to look up, e.g. uuids or names.
+            field (str): Spec field matched against the identifiers ("uoid.uuid", "name", ...).
+            max_url_length (int): Maximum length of each request URL.
+            max_workers (int): Maximum number of concurrent chunk requests.
+
+        Returns:
+            A dict with 'items' (the objects in input order, None where not found) and
+            'missing' (identifiers that matched no object, in input order).
+        """
+        identifiers = [str(i) for i in identifiers]
+        unique = list(dict.fromkeys(identifiers))
+        resource_client = getattr(self, resource)
+        path = "/" + resource.replace("_", "-")  # Only used to estimate the URL length
+        chunks = self._chunk_in_predicates(path, field, unique, max_url_length)
+
+        def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+            return resource_client.get(spec=f"{field}=in=({','.join(chunk)})") or []
+
+        found: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for items in pool.map(fetch, chunks):
+                for item in items:
+                    key = self._field_value(item, field)
+                    if key is not None:
+                        found[str(key)] = item
+        logger.info(f"Fetched {len(found)}/{len(unique)} {resource} by {field} in {len(chunks)} request(s)")
+        return {
+            "items": [found.get(i) for i in identifiers],
+            "missing": [i for i in identifiers if i not in found],
+        }
+
+    def monitor_tasks(
+        self,
+        location_urls: Iterable[str],
+        task_timeout_seconds: int = 300,
+        poll_interval_seconds: int = 5,
+        max_workers: int = 16
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Monitors many task Location URLs together. Each round polls every outstanding
+        task concurrently (bounded by max_workers) until all of them reach a terminal
+        state or the shared timeout expires.
+
+        Returns:
+            A dict mapping each location URL to its last known TaskView. Tasks still
+            running at the timeout keep their last polled state (or None if never polled).
+        """
+        outstanding = list(dict.fromkeys(location_urls))
+        results: Dict[str, Optional[Dict[str, Any]]] = {url: None for url in outstanding}
+        if not outstanding:
+            return results
+
+        def poll(url: str) -> Optional[Dict[str, Any]]:
+            try:
+                response = self.make_rest_call(path=url, method="GET", is_absolute_url=True)
+                return self.read_and_parse_json_body(response)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Polling request failed for {url}: {e}. Retrying...")
+                return None
+
+        logger.info(f"Monitoring {len(outstanding)} tasks (timeout {task_timeout_seconds}s)")
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while outstanding and (time.time() - start_time) < task_timeout_seconds:
+                still_running = []
+                for url, task_data in zip(outstanding, pool.map(poll, outstanding)):
+                    if task_data is not None:
+                        results[url] = task_data
+                    if self.get_task_state(task_data) not in ("COMPLETED", "FAILED", "CANCELLED", "TIMED_OUT"):
+                        still_running.append(url)
+                done = len(outstanding) - len(still_running)
+                outstanding = still_running
+                logger.info(f"Task batch: {done} finished this round, {len(outstanding)} still running")
+                if outstanding:
+                    time.sleep(poll_interval_seconds)
+
+        if outstanding:
+            logger.warning(f"Task monitoring timed out after {task_timeout_seconds} seconds with {len(outstanding)} tasks unfinished.")
+        return results
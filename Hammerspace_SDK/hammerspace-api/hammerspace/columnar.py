@@ -0,0 +1,250 @@
+# hammerspace/columnar.py
+"""
+Columnar decoding of influx "Serie" responses ({"name", "tags", "columns", "values"})
+returned by the reports, metrics and data-analytics endpoints. NumPy, pyarrow and
+pandas are optional and imported only when that output is requested.
+"""
+import logging
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+TIME_COLUMN = "time"
+COLUMNAR_OUTPUTS = ("columns", "numpy", "arrow", "pandas")
+
+
+def _import_optional(module_name: str, output: str) -> Any:
+    try:
+        return __import__(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"Columnar output '{output}' requires the optional dependency '{module_name}' "
+            f"(pip install {module_name})."
+        ) from e
+
+
+def iter_series(response: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every Serie dict (one having 'columns' and 'values') found in a response,
+    walking lists and the common 'series' / 'results' / 'data' envelopes.
+    A plain list of flat record dicts is treated as a single serie.
+    """
+    if isinstance(response, dict):
+        if "columns" in response and "values" in response:
+            yield response
+            return
+        for key in ("series", "results", "data", "result"):
+            if key in response:
+                yield from iter_series(response[key])
+    elif isinstance(response, list):
+        if response and all(isinstance(r, dict) and "columns" not in r and not _has_envelope(r) for r in response):
+            columns: List[str] = []
+            for record in response:
+                for key in record:
+                    if key not in columns and not isinstance(record[key], (dict, list)):
+                        columns.append(key)
+            yield {
+                "name": None,
+                "tags": {},
+                "columns": columns,
+                "values": [[record.get(c) for c in columns] for record in response],
+            }
+            return
+        for item in response:
+            yield from iter_series(item)
+
+
+def _has_envelope(record: Dict[str, Any]) -> bool:
+    return any(key in record for key in ("series", "results"))
+
+
+def to_epoch_millis(value: Any) -> Optional[int]:
+    """Converts a time value (epoch ms, or an ISO-8601 / RFC3339 string) to epoch milliseconds."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        text = value.replace("Z", "+00:00")
+        # fromisoformat() handles at most microseconds; trim influx nanosecond precision
+        if "." in text:
+            head, _, tail = text.partition(".")
+            digits = "".join(ch for ch in tail if ch.isdigit())
+            rest = tail[len(digits):]
+            text = f"{head}.{digits[:6]}{rest}" if digits else f"{head}{rest}"
+        return int(datetime.fromisoformat(text).timestamp() * 1000)
+    raise ValueError(f"Unsupported time value: {value!r}")
+
+
+def _to_float(value: Any) -> float:
+    if value is None:
+        return float("nan")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _is_numeric_column(raw: List[Any]) -> bool:
+    seen_value = False
+    for value in raw:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        seen_value = True
+    return seen_value or not raw
+
+
+def _decode_serie(serie: Dict[str, Any]) -> Dict[str, Tuple[str, List[Any]]]:
+    """Transposes a Serie into {column: (kind, values)} with kind 'time', 'float' or 'object'."""
+    columns = serie.get("columns") or []
+    values = serie.get("values") or []
+    decoded: Dict[str, Tuple[str, List[Any]]] = {}
+    for index, column in enumerate(columns):
+        raw = [row[index] if index < len(row) else None for row in values]
+        if column == TIME_COLUMN:
+            decoded[column] = ("time", [to_epoch_millis(v) for v in raw])
+        elif _is_numeric_column(raw):
+            decoded[column] = ("float", [_to_float(v) for v in raw])
+        else:
+            decoded[column] = ("object", raw)
+    return decoded
+
+
+def _drop_untimed_rows(decoded: Dict[str, Tuple[str, List[Any]]]) -> Dict[str, Tuple[str, List[Any]]]:
+    """
+    Removes the rows whose time is missing: a typed time column has no null, and a
+    placeholder such as 0 would read as a 1970 sample.
+    """
+    times = decoded.get(TIME_COLUMN, (None, []))[1]
+    keep = [i for i, t in enumerate(times) if t is not None]
+    if len(keep) == len(times):
+        return decoded
+    logger.debug(f"Dropping {len(times) - len(keep)} row(s) without a time value")
+    return {column: (kind, [values[i] for i in keep]) for column, (kind, values) in decoded.items()}
+
+
+def series_to_columns(serie: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    Transposes one Serie into a dict of plain Python column lists. The time column is
+    converted to epoch ms ints, numeric columns to floats (None -> NaN), other columns
+    are left as-is.
+    """
+    return {column: values for column, (_, values) in _decode_serie(serie).items()}
+
+
+def to_numpy(response: Any) -> List[Dict[str, Any]]:
+    """
+    Decodes every Serie in a response into NumPy arrays.
+
+    Returns:
+        A list of {'name', 'tags', 'columns'} dicts, where 'columns' maps column names to
+        arrays: int64 for the time column, float64 for numeric columns, object otherwise.
+        Rows without a time value are dropped (int64 has no null to hold them).
+    """
+    np = _import_optional("numpy", "numpy")
+    decoded = []
+    for serie in iter_series(response):
+        arrays = {}
+        for column, (kind, values) in _drop_untimed_rows(_decode_serie(serie)).items():
+            if kind == "time":
+                arrays[column] = np.fromiter(values, dtype=np.int64, count=len(values))
+            elif kind == "float":
+                arrays[column] = np.fromiter(values, dtype=np.float64, count=len(values))
+            else:
+                arrays[column] = np.array(values, dtype=object)
+        decoded.append({"name": serie.get("name"), "tags": serie.get("tags") or {}, "columns": arrays})
+    return decoded
+
+
+def to_arrow(response: Any) -> Any:
+    """
+    Decodes every Serie in a response into a single pyarrow.Table. Rows of all series are
+    concatenated, with 'series' (the serie name) and one column per tag key added.
+    Rows without a time value are dropped, as in to_numpy.
+    """
+    pa = _import_optional("pyarrow", "arrow")
+    series = list(iter_series(response))
+    tag_keys: List[str] = []
+    value_columns: List[str] = []
+    for serie in series:
+        for key in (serie.get("tags") or {}):
+            if key not in tag_keys:
+                tag_keys.append(key)
+        for column in serie.get("columns") or []:
+            if column not in value_columns:
+                value_columns.append(column)
+
+    merged: Dict[str, List[Any]] = {"series": []}
+    merged.update({f"tag_{key}" if key in value_columns or key == "series" else key: [] for key in tag_keys})
+    merged.update({column: [] for column in value_columns})
+    numeric = {column: True for column in value_columns}
+    for serie in series:
+        columns = _drop_untimed_rows(_decode_serie(serie))
+        rows = len(columns[TIME_COLUMN][1]) if TIME_COLUMN in columns else len(serie.get("values") or [])
+        tags = serie.get("tags") or {}
+        merged["series"].extend([serie.get("name")] * rows)
+        for key in tag_keys:
+            out_key = f"tag_{key}" if key in value_columns or key == "series" else key
+            merged[out_key].extend([tags.get(key)] * rows)
+        for column in value_columns:
+            kind, values = columns.get(column, ("float", [None] * rows))
+            if kind == "object":
+                numeric[column] = False
+            merged[column].extend(values)
+
+    arrays = {}
+    for column, values in merged.items():
+        if column == TIME_COLUMN:
+            arrays[column] = pa.array(values, type=pa.int64())
+        elif column in numeric and numeric[column]:
+            arrays[column] = pa.array(values, type=pa.float64())
+        else:
+            arrays[column] = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    return pa.table(arrays)
+
+
+def to_pandas(response: Any) -> Any:
+    """Decodes every Serie in a response into a pandas DataFrame (via to_arrow when pyarrow is available)."""
+    pd = _import_optional("pandas", "pandas")
+    try:
+        return to_arrow(response).to_pandas()
+    except ImportError:
+        frames = []
+        for serie in iter_series(response):
+            columns = _drop_untimed_rows(_decode_serie(serie))
+            frame = pd.DataFrame({column: values for column, (_, values) in columns.items()})
+            if TIME_COLUMN in frame:
+                frame[TIME_COLUMN] = frame[TIME_COLUMN].astype("int64")
+            frame.insert(0, "series", serie.get("name"))
+            for key, value in (serie.get("tags") or {}).items():
+                frame[key if key not in frame else f"tag_{key}"] = value
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def convert(response: Any, output: str = "numpy") -> Any:
+    """
+    Converts a series response to the requested columnar output:
+    'columns' (plain Python lists per serie), 'numpy', 'arrow' or 'pandas'.
+    """
+    if output == "columns":
+        return [
+            {"name": s.get("name"), "tags": s.get("tags") or {}, "columns": series_to_columns(s)}
+            for s in iter_series(response)
+        ]
+    if output == "numpy":
+        return to_numpy(response)
+    if output == "arrow":
+        return to_arrow(response)
+    if output == "pandas":
+        return to_pandas(response)
+    raise ValueError(f"Invalid columnar output '{output}', expected one of {COLUMNAR_OUTPUTS}.")
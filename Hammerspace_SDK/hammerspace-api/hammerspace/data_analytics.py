@@ -1,6 +1,7 @@
 # hammerspace/data_analytics.py
 import logging
 from typing import Optional, List, Dict, Any
+from . import columnar
 logger = logging.getLogger(__name__)
 
 class DataAnalyticsClient:
@@ -28,4 +29,13 @@ class DataAnalyticsClient:
         if group_by is not None: query_params["groupBy"] = group_by
         
         response = self.api_client.make_rest_call(path=api_path, method="GET", query_params=query_params)
-        return self.api_client.read_and_parse_json_body(response)
\ No newline at end of file
+        return self.api_client.read_and_parse_json_body(response)
+
+    def query_data_analytics_columnar(self, output: str = "numpy", **kwargs) -> Any:
+        """
+        Same query as query_data_analytics, decoded straight into columns.
+        Args:
+            output (str): 'numpy' (default), 'arrow', 'pandas' or 'columns' (plain lists).
+                See hammerspace.columnar for the result layout; time is int64 ms, values float64.
+        """
+        return columnar.convert(self.query_data_analytics(**kwargs), output)
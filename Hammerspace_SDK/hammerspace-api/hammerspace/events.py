@@ -1,10 +1,55 @@
 # hammerspace/events.py
+import os
+import json
+import time
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any, Union
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Union, Iterator, AsyncIterator, Tuple
 # from .client import HammerspaceApiClient
 
 logger = logging.getLogger(__name__)
 
+class _TailState:
+    """High-water mark plus a bounded set of recently seen event ids, optionally persisted as JSON."""
+
+    def __init__(self, state_file: Optional[str], dedupe_size: int, start_millis: Optional[int]):
+        self.state_file = state_file
+        self.dedupe_size = dedupe_size
+        self.high_water_mark = start_millis
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        if state_file and os.path.exists(state_file):
+            try:
+                with open(state_file, "r") as f:
+                    saved = json.load(f)
+                self.high_water_mark = saved.get("high_water_mark", self.high_water_mark)
+                for event_id in saved.get("recent_ids", [])[-dedupe_size:]:
+                    self.seen[event_id] = None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable event tail state {state_file}: {e}")
+
+    def is_new(self, event_id: Optional[str]) -> bool:
+        return event_id is None or event_id not in self.seen
+
+    def commit(self, high_water_mark: Optional[int], event_ids: List[str]) -> None:
+        """Advances the high-water mark and records event ids once their batch was delivered."""
+        self.high_water_mark = high_water_mark
+        for event_id in event_ids:
+            self.seen[event_id] = None
+            self.seen.move_to_end(event_id)
+        while len(self.seen) > self.dedupe_size:
+            self.seen.popitem(last=False)
+
+    def save(self) -> None:
+        if not self.state_file:
+            return
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"high_water_mark": self.high_water_mark, "recent_ids": list(self.seen)}, f)
+        os.replace(tmp_path, self.state_file)
+
+
 class EventsClient:
     def __init__(self, api_client: Any):
         self.api_client = api_client
@@ -99,4 +144,179 @@ class EventsClient:
             initial_json_data=event_data,
             monitor_task=monitor_task,
             task_timeout_seconds=task_timeout_seconds
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def _event_id(event: Dict[str, Any]) -> Optional[str]:
+        return (event.get("uoid") or {}).get("uuid") or event.get("uuid") or event.get("id")
+
+    def _poll_new_events(
+        self, state: _TailState, time_field: str, spec: Optional[str], page_size: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], List[str]]:
+        """
+        Fetches events at or after the high-water mark in ascending time order, minus already-seen ones.
+        The state is not modified: if any page fails, the whole poll is retried from the same mark.
+
+        Returns:
+            (new events, new high-water mark, ids of the new events) for _TailState.commit.
+        """
+        predicates = [f"{time_field}=ge={state.high_water_mark}"] if state.high_water_mark is not None else []
+        if spec:
+            predicates.append(f"({spec})")
+        new_events = []
+        new_ids: List[str] = []
+        batch_ids = set()
+        high_water_mark = state.high_water_mark
+        page = 0
+        while True:
+            kwargs = {"page": page, "page_size": page_size, "page_sort": time_field, "page_sort_dir": "asc"}
+            if predicates:
+                kwargs["spec"] = ";".join(predicates)
+            batch = self.get(**kwargs) or []
+            for event in batch:
+                event_id = self._event_id(event)
+                if state.is_new(event_id) and (event_id is None or event_id not in batch_ids):
+                    new_events.append(event)
+                    if event_id is not None:
+                        batch_ids.add(event_id)
+                        new_ids.append(event_id)
+                event_time = event.get(time_field)
+                if isinstance(event_time, (int, float)) and (high_water_mark is None or event_time > high_water_mark):
+                    high_water_mark = int(event_time)
+            if len(batch) < page_size:
+                return new_events, high_water_mark, new_ids
+            page += 1
+
+    def _tail_setup(
+        self,
+        state_file: Optional[str],
+        spec: Optional[str],
+        time_field: str,
+        page_size: int,
+        dedupe_size: int,
+        start_millis: Optional[int],
+        from_now: bool
+    ) -> Tuple[_TailState, Any]:
+        state = _TailState(state_file, dedupe_size, start_millis)
+        if state.high_water_mark is None and from_now:
+            state.high_water_mark = int(time.time() * 1000)
+
+        def poll() -> Tuple[List[Dict[str, Any]], Optional[int], List[str]]:
+            return self._poll_new_events(state, time_field, spec, page_size)
+
+        return state, poll
+
+    def tail(
+        self,
+        state_file: Optional[str] = None,
+        spec: Optional[str] = None,
+        time_field: str = "created",
+        page_size: int = 100,
+        min_poll_seconds: float = 1.0,
+        max_poll_seconds: float = 30.0,
+        dedupe_size: int = 10000,
+        start_millis: Optional[int] = None,
+        from_now: bool = True,
+        stop_event: Optional[threading.Event] = None,
+        save_state: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields new events as they appear, fetching only events newer than a high-water mark
+        (sorted by time_field, paged) instead of re-listing /events.
+
+        The poll interval starts at min_poll_seconds, doubles while no events arrive up to
+        max_poll_seconds, and resets when events are found. Events sharing the high-water
+        timestamp are re-read on the next poll and dropped by a bounded set of recent ids.
+        The high-water mark and recent ids only advance after every event of a poll has
+        been yielded; a poll that fails on any page is retried from the previous mark. With
+        state_file they are persisted at that point, so a restarted tail resumes where it
+        stopped (at-least-once).
+
+        Args:
+            state_file (str): JSON file holding the high-water mark between runs.
+            spec (str): Additional filter predicate (e.g. "severity=in=(CRITICAL,ERROR)").
+            time_field (str): Event timestamp field (ms from epoch) to sort and filter on.
+            page_size (int): Events per page request.
+            min_poll_seconds (float): Poll interval while events are arriving.
+            max_poll_seconds (float): Upper bound of the idle poll interval.
+            dedupe_size (int): Number of recent event ids remembered for deduplication.
+            start_millis (int): Start point when no state file exists.
+            from_now (bool): Without a state file or start_millis, only tail events from now on
+                (False replays all stored events first).
+            stop_event (threading.Event): Set to end the generator.
+            save_state (bool): Write state_file after each batch. Consumers that only count
+                an event as delivered once they forwarded it elsewhere pass False, read
+                state_file on start only, and record progress with save_tail_state().
+        """
+        state, poll = self._tail_setup(state_file, spec, time_field, page_size, dedupe_size, start_millis, from_now)
+        interval = min_poll_seconds
+        while stop_event is None or not stop_event.is_set():
+            try:
+                events, high_water_mark, event_ids = poll()
+            except Exception as e:
+                logger.warning(f"Event tail poll failed: {e}")
+                events = []
+            else:
+                for event in events:
+                    yield event
+                state.commit(high_water_mark, event_ids)
+                if save_state:
+                    state.save()
+            interval = min_poll_seconds if events else min(interval * 2, max_poll_seconds)
+            if stop_event is not None:
+                stop_event.wait(interval)
+            else:
+                time.sleep(interval)
+
+    def save_tail_state(
+        self,
+        state_file: str,
+        events: List[Dict[str, Any]],
+        time_field: str = "created",
+        dedupe_size: int = 10000
+    ) -> None:
+        """
+        Records delivered events in a tail state file: the high-water mark advances to the
+        latest event time and their ids join the recent ids. Used with tail(save_state=False).
+        """
+        state = _TailState(state_file, dedupe_size, None)
+        high_water_mark = state.high_water_mark
+        for event in events:
+            event_time = event.get(time_field)
+            if isinstance(event_time, (int, float)) and (high_water_mark is None or event_time > high_water_mark):
+                high_water_mark = int(event_time)
+        state.commit(high_water_mark, [i for i in (self._event_id(e) for e in events) if i is not None])
+        state.save()
+
+    async def atail(
+        self,
+        state_file: Optional[str] = None,
+        spec: Optional[str] = None,
+        time_field: str = "created",
+        page_size: int = 100,
+        min_poll_seconds: float = 1.0,
+        max_poll_seconds: float = 30.0,
+        dedupe_size: int = 10000,
+        start_millis: Optional[int] = None,
+        from_now: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async iterator variant of tail(); polls run in the default executor so the event
+        loop is never blocked. Stop by breaking out of the loop or cancelling the task.
+        """
+        state, poll = self._tail_setup(state_file, spec, time_field, page_size, dedupe_size, start_millis, from_now)
+        loop = asyncio.get_running_loop()
+        interval = min_poll_seconds
+        while True:
+            try:
+                events, high_water_mark, event_ids = await loop.run_in_executor(None, poll)
+            except Exception as e:
+                logger.warning(f"Event tail poll failed: {e}")
+                events = []
+            else:
+                for event in events:
+                    yield event
+                state.commit(high_water_mark, event_ids)
+                state.save()
+            interval = min_poll_seconds if events else min(interval * 2, max_poll_seconds)
+            await asyncio.sleep(interval)
@@ -0,0 +1,470 @@
+# hammerspace/file_sync.py
+import os
+import time
+import shutil
+import hashlib
+import logging
+import posixpath
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# FileView keys that may carry the modification time / a content checksum,
+# in order of preference.
+_MTIME_KEYS = ("modifyTime", "mtime", "modifiedTime", "lastModified", "modificationTime")
+_CHECKSUM_KEYS = ("md5", "checksum", "contentMd5")
+
+
+def _to_epoch_seconds(value: Any) -> Optional[float]:
+    """Normalizes a FileView timestamp (epoch s/ms or ISO-8601 string) to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        # Values past year ~5000 in seconds are really milliseconds
+        return value / 1000.0 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _is_directory(entry: Dict[str, Any]) -> bool:
+    if entry.get("isDirectory") or entry.get("directory"):
+        return True
+    entry_type = str(entry.get("type", entry.get("fileType", ""))).upper()
+    return entry_type in ("DIRECTORY", "DIR")
+
+
+def _remote_mtime(entry: Dict[str, Any]) -> Optional[float]:
+    for key in _MTIME_KEYS:
+        if key in entry:
+            return _to_epoch_seconds(entry[key])
+    return None
+
+
+def _remote_checksum(entry: Dict[str, Any]) -> Optional[str]:
+    for key in _CHECKSUM_KEYS:
+        if entry.get(key):
+            return str(entry[key]).lower()
+    return None
+
+
+def _join_remote(remote_dir: str, rel_path: str) -> str:
+    """Joins a path relative to remote_dir, treating "" and "." as the share root."""
+    if not rel_path:
+        return remote_dir or "."
+    if remote_dir in ("", ".", "/"):
+        return rel_path
+    return posixpath.join(remote_dir, rel_path)
+
+
+def _is_not_found(error: requests.exceptions.RequestException) -> bool:
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code == 404
+
+
+def _task_succeeded(api_client: Any, result: Any) -> bool:
+    """
+    Whether a files call returned success. Monitored tasks must end COMPLETED; a body
+    without a task state (a FileView, or the result of a completed task) counts as success.
+    """
+    if result is None:
+        return False
+    state = api_client.get_task_state(result)
+    return not state or state == "COMPLETED"
+
+
+def _local_md5(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileSyncClient:
+    def __init__(self, api_client: Any):
+        """
+        Initializes the FileSyncClient, an rsync-style incremental sync engine
+        between a local directory and a path within a share. Built on the
+        single-file primitives of FilesClient.
+
+        Args:
+            api_client: An instance of HammerspaceApiClient.
+        """
+        self.api_client = api_client
+
+    def list_remote_tree(
+        self,
+        share_name_or_uuid: str,
+        remote_dir: str = ".",
+        page_size: int = 1000
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Recursively lists a directory within a share.
+
+        Args:
+            share_name_or_uuid (str): The name or UUID of the share.
+            remote_dir (str): Directory within the share. Use "." for the share root.
+            page_size (int): Number of FileView entries requested per browse call.
+
+        Returns:
+            A dict mapping paths relative to remote_dir (POSIX separators) to FileView dicts.
+            Directories are included so callers can tell which ones already exist.
+            A remote_dir that does not exist yet is listed as empty.
+        """
+        return self._list_remote_tree(share_name_or_uuid, remote_dir, page_size)[0]
+
+    def _list_remote_tree(
+        self, share_name_or_uuid: str, remote_dir: str, page_size: int
+    ) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        """list_remote_tree, also returning whether remote_dir itself exists."""
+        tree: Dict[str, Dict[str, Any]] = {}
+        exists = True
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            browse_path = _join_remote(remote_dir, rel_dir)
+            page = 0
+            while True:
+                try:
+                    entries = self.api_client.files.browse_files(
+                        share_name_or_uuid, browse_path, page=page, page_size=page_size
+                    ) or []
+                except requests.exceptions.HTTPError as e:
+                    if not _is_not_found(e):
+                        raise
+                    # Missing remote_dir, or a directory removed while listing
+                    if not rel_dir:
+                        exists = False
+                    break
+                for entry in entries:
+                    name = entry.get("name") or posixpath.basename(str(entry.get("path", "")).rstrip("/"))
+                    if not name or name in (".", ".."):
+                        continue
+                    rel_path = posixpath.join(rel_dir, name) if rel_dir else name
+                    tree[rel_path] = entry
+                    if _is_directory(entry):
+                        pending.append(rel_path)
+                if len(entries) < page_size:
+                    break
+                page += 1
+        logger.info(f"Listed {len(tree)} remote entries under share '{share_name_or_uuid}' path '{remote_dir}'")
+        return tree, exists
+
+    def _ensure_remote_dir(self, share_name_or_uuid: str, remote_dir: str) -> None:
+        """Creates remote_dir and any missing parents, top-down."""
+        parts = [p for p in remote_dir.strip("/").split("/") if p and p != "."]
+        for depth in range(1, len(parts) + 1):
+            path = "/".join(parts[:depth])
+            try:
+                self.api_client.files.browse_files(share_name_or_uuid, path, page=0, page_size=1)
+                continue
+            except requests.exceptions.HTTPError as e:
+                if not _is_not_found(e):
+                    raise
+            if self.api_client.files.create_directory(share_name_or_uuid, path) is None:
+                raise RuntimeError(f"creating remote directory '{path}' failed")
+
+    def list_local_tree(self, local_dir: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Recursively lists a local directory.
+
+        Returns:
+            A dict mapping paths relative to local_dir (POSIX separators) to
+            {'is_dir', 'size', 'mtime', 'abs_path'} dicts.
+        """
+        tree: Dict[str, Dict[str, Any]] = {}
+        for root, dirs, files in os.walk(local_dir):
+            rel_root = os.path.relpath(root, local_dir)
+            rel_root = "" if rel_root == "." else rel_root.replace(os.sep, "/")
+            for name in dirs:
+                rel_path = posixpath.join(rel_root, name) if rel_root else name
+                tree[rel_path] = {"is_dir": True, "size": 0, "mtime": None, "abs_path": os.path.join(root, name)}
+            for name in files:
+                abs_path = os.path.join(root, name)
+                st = os.stat(abs_path)
+                rel_path = posixpath.join(rel_root, name) if rel_root else name
+                tree[rel_path] = {"is_dir": False, "size": st.st_size, "mtime": st.st_mtime, "abs_path": abs_path}
+        return tree
+
+    def _is_changed(
+        self,
+        local: Dict[str, Any],
+        remote: Dict[str, Any],
+        direction: str,
+        checksum: bool,
+        mtime_tolerance_seconds: float
+    ) -> bool:
+        remote_size = remote.get("size")
+        if remote_size is not None and int(remote_size) != local["size"]:
+            return True
+        if checksum:
+            remote_sum = _remote_checksum(remote)
+            if remote_sum:
+                return _local_md5(local["abs_path"]) != remote_sum
+        remote_mtime = _remote_mtime(remote)
+        if remote_mtime is None or remote_size is None:
+            # Not enough metadata to prove the copies match
+            return True
+        if direction == "upload":
+            return local["mtime"] > remote_mtime + mtime_tolerance_seconds
+        return remote_mtime > local["mtime"] + mtime_tolerance_seconds
+
+    def plan_sync(
+        self,
+        local_dir: str,
+        share_name_or_uuid: str,
+        remote_dir: str = ".",
+        direction: str = "upload",
+        delete: bool = False,
+        checksum: bool = False,
+        mtime_tolerance_seconds: float = 2.0,
+        page_size: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Computes the operations needed to bring the destination in line with the source,
+        without transferring anything.
+
+        Args:
+            local_dir (str): Local directory.
+            share_name_or_uuid (str): The name or UUID of the share.
+            remote_dir (str): Directory within the share. Use "." for the share root.
+            direction (str): 'upload' (local -> share) or 'download' (share -> local).
+            delete (bool): Whether to delete destination files that no longer exist at the source.
+            checksum (bool): Compare MD5 checksums when the FileView exposes one, instead of
+                relying on mtime alone. Size is always compared.
+            mtime_tolerance_seconds (float): Slack allowed between local and remote mtimes.
+            page_size (int): Page size for remote directory listing.
+
+        Returns:
+            A plan dict with 'mkdir', 'transfer' and 'delete' lists of relative paths,
+            plus 'unchanged' (count), 'bytes' (total size of files to transfer) and
+            'create_remote_dir' (True when an upload target directory does not exist yet).
+
+        Raises:
+            FileNotFoundError: If the source directory (local_dir for an upload, remote_dir
+                for a download) does not exist. A missing destination is created instead;
+                a missing source is never taken as empty, which with delete=True would
+                remove everything at the destination.
+        """
+        if direction not in ("upload", "download"):
+            raise ValueError(f"Invalid direction '{direction}', expected 'upload' or 'download'.")
+        if direction == "upload" and not os.path.isdir(local_dir):
+            raise FileNotFoundError(f"Local source directory '{local_dir}' does not exist")
+
+        local_tree = self.list_local_tree(local_dir) if os.path.isdir(local_dir) else {}
+        remote_tree, remote_exists = self._list_remote_tree(share_name_or_uuid, remote_dir, page_size)
+        if direction == "download" and not remote_exists:
+            raise FileNotFoundError(
+                f"Remote source directory '{remote_dir}' does not exist in share '{share_name_or_uuid}'"
+            )
+
+        if direction == "upload":
+            src_dirs = {p for p, e in local_tree.items() if e["is_dir"]}
+            dst_dirs = {p for p, e in remote_tree.items() if _is_directory(e)}
+            src_files = {p for p, e in local_tree.items() if not e["is_dir"]}
+            dst_files = {p for p, e in remote_tree.items() if not _is_directory(e)}
+        else:
+            src_dirs = {p for p, e in remote_tree.items() if _is_directory(e)}
+            dst_dirs = {p for p, e in local_tree.items() if e["is_dir"]}
+            src_files = {p for p, e in remote_tree.items() if not _is_directory(e)}
+            dst_files = {p for p, e in local_tree.items() if not e["is_dir"]}
+
+        plan: Dict[str, Any] = {
+            "direction": direction,
+            "mkdir": sorted(src_dirs - dst_dirs, key=lambda p: (p.count("/"), p)),
+            "transfer": [],
+            "delete": [],
+            "unchanged": 0,
+            "bytes": 0,
+            "create_remote_dir": False,
+        }
+        for rel_path in sorted(src_files):
+            if rel_path in dst_files:
+                local = local_tree[rel_path]
+                remote = remote_tree[rel_path]
+                if not self._is_changed(local, remote, direction, checksum, mtime_tolerance_seconds):
+                    plan["unchanged"] += 1
+                    continue
+            plan["transfer"].append(rel_path)
+            if direction == "upload":
+                plan["bytes"] += local_tree[rel_path]["size"]
+            else:
+                plan["bytes"] += int(remote_tree[rel_path].get("size") or 0)
+
+        if direction == "upload" and not remote_exists and (plan["mkdir"] or plan["transfer"]):
+            plan["create_remote_dir"] = True
+
+        if delete:
+            # Directories are removed recursively, so only the top-most stale
+            # directory needs an operation; entries beneath it are pruned.
+            stale_dirs: List[str] = []
+            for rel_path in sorted(dst_dirs - src_dirs, key=lambda p: (p.count("/"), p)):
+                if not any(rel_path.startswith(d + "/") for d in stale_dirs):
+                    stale_dirs.append(rel_path)
+            stale_files = [
+                p for p in sorted(dst_files - src_files)
+                if not any(p.startswith(d + "/") for d in stale_dirs)
+            ]
+            plan["delete"] = stale_files + stale_dirs
+
+        logger.info(
+            f"Sync plan ({direction}) for '{local_dir}' <-> '{share_name_or_uuid}:{remote_dir}': "
+            f"{len(plan['mkdir'])} mkdir, {len(plan['transfer'])} transfer ({plan['bytes']} bytes), "
+            f"{len(plan['delete'])} delete, {plan['unchanged']} unchanged"
+        )
+        return plan
+
+    def _transfer_one(
+        self, local_dir: str, share_name_or_uuid: str, remote_dir: str, rel_path: str, direction: str
+    ) -> int:
+        remote_path = _join_remote(remote_dir, rel_path)
+        local_path = os.path.join(local_dir, *rel_path.split("/"))
+        if direction == "upload":
+            with open(local_path, "rb") as f:
+                result = self.api_client.files.upload_file(share_name_or_uuid, remote_path, f, overwrite=True)
+            if not _task_succeeded(self.api_client, result):
+                raise RuntimeError(f"upload of '{rel_path}' failed")
+            return os.path.getsize(local_path)
+
+        content = self.api_client.files.download_file(share_name_or_uuid, remote_path)
+        if content is None:
+            raise RuntimeError(f"download of '{rel_path}' failed")
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        tmp_path = f"{local_path}.hs-sync-tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, local_path)
+        return len(content)
+
+    def _delete_one(
+        self, local_dir: str, share_name_or_uuid: str, remote_dir: str, rel_path: str, direction: str
+    ) -> None:
+        if direction == "upload":
+            remote_path = _join_remote(remote_dir, rel_path)
+            result = self.api_client.files.delete_file_or_directory(
+                share_name_or_uuid, remote_path, recursive=True
+            )
+            if not _task_succeeded(self.api_client, result):
+                state = self.api_client.get_task_state(result) or "no response"
+                raise RuntimeError(f"remote delete of '{rel_path}' failed ({state})")
+            return
+        local_path = os.path.join(local_dir, *rel_path.split("/"))
+        if os.path.isdir(local_path):
+            shutil.rmtree(local_path)
+        elif os.path.exists(local_path):
+            os.remove(local_path)
+
+    def sync_directory(
+        self,
+        local_dir: str,
+        share_name_or_uuid: str,
+        remote_dir: str = ".",
+        direction: str = "upload",
+        delete: bool = False,
+        checksum: bool = False,
+        dry_run: bool = False,
+        max_workers: int = 8,
+        mtime_tolerance_seconds: float = 2.0,
+        page_size: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Incrementally syncs a local directory with a directory in a share, transferring
+        only new or changed files through a concurrent transfer pool.
+
+        Args:
+            local_dir (str): Local directory.
+            share_name_or_uuid (str): The name or UUID of the share.
+            remote_dir (str): Directory within the share. Use "." for the share root.
+            direction (str): 'upload' (local -> share) or 'download' (share -> local).
+            delete (bool): Propagate deletions: remove destination entries missing at the source.
+            checksum (bool): Compare MD5 checksums when available (see plan_sync).
+            dry_run (bool): Only compute and return the plan; nothing is transferred or deleted.
+            max_workers (int): Number of concurrent transfers.
+            mtime_tolerance_seconds (float): Slack allowed between local and remote mtimes.
+            page_size (int): Page size for remote directory listing.
+
+        Returns:
+            A report dict: 'plan', 'dry_run', 'transferred', 'deleted', 'failed'
+            (list of {'path', 'error'}), 'bytes_transferred' and 'elapsed_seconds'.
+
+        Raises:
+            FileNotFoundError: If the source directory does not exist (see plan_sync).
+        """
+        start_time = time.time()
+        plan = self.plan_sync(
+            local_dir, share_name_or_uuid, remote_dir, direction=direction, delete=delete,
+            checksum=checksum, mtime_tolerance_seconds=mtime_tolerance_seconds, page_size=page_size
+        )
+        report: Dict[str, Any] = {
+            "plan": plan,
+            "dry_run": dry_run,
+            "transferred": [],
+            "deleted": [],
+            "failed": [],
+            "bytes_transferred": 0,
+            "elapsed_seconds": 0.0,
+        }
+        if dry_run:
+            report["elapsed_seconds"] = time.time() - start_time
+            return report
+
+        if plan["create_remote_dir"]:
+            try:
+                self._ensure_remote_dir(share_name_or_uuid, remote_dir)
+            except Exception as e:
+                # Nothing below a missing target directory can be uploaded
+                logger.error(f"Failed to create remote directory '{remote_dir}': {e}")
+                report["failed"].append({"path": remote_dir, "error": str(e)})
+                report["elapsed_seconds"] = time.time() - start_time
+                return report
+
+        # Directories are created sequentially, parents before children
+        for rel_path in plan["mkdir"]:
+            try:
+                if direction == "upload":
+                    remote_path = _join_remote(remote_dir, rel_path)
+                    self.api_client.files.create_directory(share_name_or_uuid, remote_path)
+                else:
+                    os.makedirs(os.path.join(local_dir, *rel_path.split("/")), exist_ok=True)
+            except Exception as e:
+                logger.error(f"Failed to create directory '{rel_path}': {e}")
+                report["failed"].append({"path": rel_path, "error": str(e)})
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self._transfer_one, local_dir, share_name_or_uuid, remote_dir, rel_path, direction): rel_path
+                for rel_path in plan["transfer"]
+            }
+            for future in as_completed(futures):
+                rel_path = futures[future]
+                try:
+                    report["bytes_transferred"] += future.result()
+                    report["transferred"].append(rel_path)
+                except Exception as e:
+                    logger.error(f"Failed to {direction} '{rel_path}': {e}")
+                    report["failed"].append({"path": rel_path, "error": str(e)})
+
+        for rel_path in plan["delete"]:
+            try:
+                self._delete_one(local_dir, share_name_or_uuid, remote_dir, rel_path, direction)
+                report["deleted"].append(rel_path)
+            except Exception as e:
+                logger.error(f"Failed to delete '{rel_path}': {e}")
+                report["failed"].append({"path": rel_path, "error": str(e)})
+
+        report["transferred"].sort()
+        report["elapsed_seconds"] = time.time() - start_time
+        logger.info(
+            f"Sync ({direction}) finished: {len(report['transferred'])} transferred "
+            f"({report['bytes_transferred']} bytes), {len(report['deleted'])} deleted, "
+            f"{len(report['failed'])} failed in {report['elapsed_seconds']:.1f}s"
+        )
+        return report
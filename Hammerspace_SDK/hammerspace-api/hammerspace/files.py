@@ -1,6 +1,8 @@
 # hammerspace/files.py
+import time
 import logging
-from typing import Optional, List, Dict, Any, Union, IO
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Union, IO, Iterable, Tuple
 import requests # For accessing response.content directly for download
 
 logger = logging.getLogger(__name__)
@@ -309,3 +311,198 @@ class FilesClient:
             path=api_path, method="POST", initial_query_params=query_params,
             monitor_task=monitor_task, task_timeout_seconds=task_timeout_seconds
         ) # Expected: {} (from 202 response)
+
+    # Bulk operation states whose outcome is not known yet
+    PENDING_BULK_STATES = ("SUBMITTED", "ACCEPTED", "RUNNING")
+
+    def _run_bulk_operation(
+        self,
+        operations: List[Tuple[str, str, str, Dict[str, Any]]],
+        max_workers: int,
+        monitor_task: bool,
+        task_timeout_seconds: int,
+        poll_interval_seconds: int
+    ) -> Dict[str, Any]:
+        """
+        Submits (label, api_path, method, query_params) operations with bounded concurrency,
+        then tracks all resulting 202 tasks together via HammerspaceApiClient.monitor_tasks.
+        """
+        start_time = time.time()
+        results: List[Dict[str, Any]] = [
+            {"path": label, "status": "PENDING", "task": None, "error": None} for label, _, _, _ in operations
+        ]
+
+        def submit(index: int) -> None:
+            label, api_path, method, query_params = operations[index]
+            if not api_path:
+                results[index].update(status="SUBMIT_FAILED", error="Path cannot be empty.")
+                return
+            try:
+                submitted = self.api_client.submit_task(api_path, method=method, initial_query_params=query_params)
+            except requests.exceptions.RequestException as e:
+                results[index].update(status="SUBMIT_FAILED", error=str(e))
+                return
+            if submitted["location"]:
+                results[index].update(status="SUBMITTED", task=submitted["location"])
+            elif submitted["status_code"] in (200, 201, 204):
+                results[index].update(status="COMPLETED", task=submitted["data"])
+            else:
+                results[index].update(status="ACCEPTED", task=submitted["data"])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(submit, range(len(operations))))
+        logger.info(f"Submitted {len(operations)} file operations in {time.time() - start_time:.1f}s")
+
+        locations = [r["task"] for r in results if r["status"] == "SUBMITTED"]
+        if monitor_task and locations:
+            task_results = self.api_client.monitor_tasks(
+                locations, task_timeout_seconds=task_timeout_seconds,
+                poll_interval_seconds=poll_interval_seconds, max_workers=max_workers
+            )
+            for result in results:
+                if result["status"] != "SUBMITTED":
+                    continue
+                task_data = task_results.get(result["task"])
+                task_state = self.api_client.get_task_state(task_data)
+                result["task"] = task_data
+                if task_state == "COMPLETED":
+                    result["status"] = "COMPLETED"
+                elif task_state in ("FAILED", "CANCELLED", "TIMED_OUT"):
+                    result["status"] = task_state
+                    result["error"] = (task_data or {}).get("errorMessage")
+                else:
+                    # Still running when monitoring gave up; the task itself has not failed
+                    result["status"] = "RUNNING"
+                    result["error"] = f"Task did not finish within {task_timeout_seconds} seconds."
+
+        elapsed = time.time() - start_time
+        succeeded = sum(1 for r in results if r["status"] == "COMPLETED")
+        pending = sum(1 for r in results if r["status"] in self.PENDING_BULK_STATES)
+        report = {
+            "results": results,
+            "total": len(results),
+            "succeeded": succeeded,
+            "pending": pending,
+            "failed": len(results) - succeeded - pending,
+            "elapsed_seconds": elapsed,
+            "paths_per_second": len(results) / elapsed if elapsed > 0 else float(len(results)),
+        }
+        logger.info(
+            f"Bulk file operation finished: {report['succeeded']}/{report['total']} succeeded, "
+            f"{report['pending']} pending in {elapsed:.1f}s ({report['paths_per_second']:.1f} paths/s)"
+        )
+        return report
+
+    def bulk_delete(
+        self,
+        share_name_or_uuid: str,
+        paths: Iterable[str],
+        recursive: bool = False,
+        max_workers: int = 16,
+        monitor_task: bool = True,
+        task_timeout_seconds: int = 300,
+        poll_interval_seconds: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Deletes many files or directories within a share. Requests are submitted concurrently
+        and the resulting tasks are monitored together rather than one after another.
+
+        Args:
+            share_name_or_uuid (str): The name or UUID of the share.
+            paths (Iterable[str]): Paths within the share to delete.
+            recursive (bool): Whether to delete directories recursively.
+            max_workers (int): Maximum number of concurrent submissions / task polls.
+            monitor_task (bool): Whether to wait for the asynchronous tasks to finish.
+            task_timeout_seconds (int): Timeout for monitoring the whole batch of tasks.
+            poll_interval_seconds (int): Delay between task polling rounds.
+
+        Returns:
+            A report dict: 'results' (per-path {'path', 'status', 'task', 'error'} in input order),
+            'total', 'succeeded', 'pending', 'failed', 'elapsed_seconds' and 'paths_per_second'.
+            Only COMPLETED operations count as succeeded; tasks that were not monitored
+            (SUBMITTED, ACCEPTED) or still ran at the timeout (RUNNING) are pending.
+        """
+        query_params = {"recursive": str(recursive).lower()}
+        operations = []
+        for path in paths:
+            effective_path = path.lstrip('/')
+            api_path = f"/files/delete/{share_name_or_uuid}/{effective_path}" if effective_path else ""
+            operations.append((path, api_path, "DELETE", query_params))
+        logger.info(f"Bulk deleting {len(operations)} paths in share '{share_name_or_uuid}', recursive: {recursive}")
+        return self._run_bulk_operation(operations, max_workers, monitor_task, task_timeout_seconds, poll_interval_seconds)
+
+    def _bulk_transfer(
+        self,
+        action: str,
+        source_share_name_or_uuid: str,
+        path_pairs: Iterable[Tuple[str, str]],
+        dest_share_name_or_uuid: str,
+        overwrite: bool,
+        max_workers: int,
+        monitor_task: bool,
+        task_timeout_seconds: int,
+        poll_interval_seconds: int
+    ) -> Dict[str, Any]:
+        operations = []
+        for source_path, dest_path in path_pairs:
+            effective_source_path = source_path.lstrip('/')
+            api_path = f"/files/{action}/{source_share_name_or_uuid}/{effective_source_path}" if effective_source_path else ""
+            query_params = {
+                "destShare": dest_share_name_or_uuid,
+                "destPath": dest_path,
+                "overwrite": str(overwrite).lower()
+            }
+            operations.append((source_path, api_path, "POST", query_params))
+        logger.info(f"Bulk {action} of {len(operations)} paths from share '{source_share_name_or_uuid}' "
+                    f"to share '{dest_share_name_or_uuid}', overwrite: {overwrite}")
+        return self._run_bulk_operation(operations, max_workers, monitor_task, task_timeout_seconds, poll_interval_seconds)
+
+    def bulk_move(
+        self,
+        source_share_name_or_uuid: str,
+        path_pairs: Iterable[Tuple[str, str]],
+        dest_share_name_or_uuid: str,
+        overwrite: bool = False,
+        max_workers: int = 16,
+        monitor_task: bool = True,
+        task_timeout_seconds: int = 600,
+        poll_interval_seconds: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Moves many files or directories. See bulk_delete for concurrency and the report format.
+
+        Args:
+            source_share_name_or_uuid (str): The name or UUID of the source share.
+            path_pairs (Iterable[Tuple[str, str]]): (source_path, dest_path) pairs.
+            dest_share_name_or_uuid (str): The name or UUID of the destination share.
+            overwrite (bool): Whether to overwrite if a destination exists.
+        """
+        return self._bulk_transfer(
+            "move", source_share_name_or_uuid, path_pairs, dest_share_name_or_uuid, overwrite,
+            max_workers, monitor_task, task_timeout_seconds, poll_interval_seconds
+        )
+
+    def bulk_copy(
+        self,
+        source_share_name_or_uuid: str,
+        path_pairs: Iterable[Tuple[str, str]],
+        dest_share_name_or_uuid: str,
+        overwrite: bool = False,
+        max_workers: int = 16,
+        monitor_task: bool = True,
+        task_timeout_seconds: int = 1800,
+        poll_interval_seconds: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Copies many files or directories. See bulk_delete for concurrency and the report format.
+
+        Args:
+            source_share_name_or_uuid (str): The name or UUID of the source share.
+            path_pairs (Iterable[Tuple[str, str]]): (source_path, dest_path) pairs.
+            dest_share_name_or_uuid (str): The name or UUID of the destination share.
+            overwrite (bool): Whether to overwrite if a destination exists.
+        """
+        return self._bulk_transfer(
+            "copy", source_share_name_or_uuid, path_pairs, dest_share_name_or_uuid, overwrite,
+            max_workers, monitor_task, task_timeout_seconds, poll_interval_seconds
+        )
@@ -0,0 +1,277 @@
+# hammerspace/history_store.py
+import json
+import math
+import time
+import sqlite3
+import logging
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+from . import columnar
+from .metrics_cache import parse_duration_millis
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    query TEXT NOT NULL,
+    last_synced_ms INTEGER
+);
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    name TEXT,
+    tags TEXT NOT NULL,
+    field TEXT NOT NULL,
+    UNIQUE (source, name, tags, field)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    series_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+"""
+
+_AGGREGATES = {"avg": "AVG", "min": "MIN", "max": "MAX", "sum": "SUM", "count": "COUNT", "last": None}
+
+
+class HistoryStore:
+    def __init__(self, api_client: Any, db_path: str, default_lookback_millis: int = 7 * 86400 * 1000):
+        """
+        Local SQLite history of selected report and metric series. Each named source is
+        synced incrementally: only the window after its last synced timestamp is fetched,
+        so long-range analysis and downsampling run locally without hitting the cluster.
+
+        Args:
+            api_client: An instance of HammerspaceApiClient.
+            db_path (str): Path of the SQLite database file.
+            default_lookback_millis (int): How far back the first sync of a source reaches
+                when no explicit start is given (default: 7 days).
+        """
+        self.api_client = api_client
+        self.db_path = db_path
+        self.default_lookback_millis = default_lookback_millis
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def list_sources(self) -> List[Dict[str, Any]]:
+        """Returns the registered sources with their kind, query and last synced timestamp."""
+        rows = self.conn.execute("SELECT source, kind, query, last_synced_ms FROM sources ORDER BY source").fetchall()
+        return [{"source": r[0], "kind": r[1], "query": json.loads(r[2]), "last_synced_ms": r[3]} for r in rows]
+
+    def _series_id(self, source: str, name: Optional[str], tags: Dict[str, Any], field: str) -> int:
+        tags_json = json.dumps(tags or {}, sort_keys=True)
+        row = self.conn.execute(
+            "SELECT id FROM series WHERE source = ? AND name IS ? AND tags = ? AND field = ?",
+            (source, name, tags_json, field)
+        ).fetchone()
+        if row:
+            return row[0]
+        cursor = self.conn.execute(
+            "INSERT INTO series (source, name, tags, field) VALUES (?, ?, ?, ?)", (source, name, tags_json, field)
+        )
+        return cursor.lastrowid
+
+    def _ingest(self, source: str, response: Any, time_field: str) -> int:
+        """Stores every numeric column of every serie in a response. Returns the number of samples written."""
+        written = 0
+        for serie in columnar.iter_series(response):
+            columns = columnar.series_to_columns(serie)
+            times = columns.get(time_field)
+            if times is None:
+                continue
+            if time_field != columnar.TIME_COLUMN:
+                times = [columnar.to_epoch_millis(t) for t in times]
+            for field, values in columns.items():
+                if field in (time_field, columnar.TIME_COLUMN):
+                    continue
+                if not values or not isinstance(values[0], float):
+                    continue
+                series_id = self._series_id(source, serie.get("name"), serie.get("tags") or {}, field)
+                rows = [
+                    (series_id, t, None if math.isnan(v) else v)
+                    for t, v in zip(times, values) if t is not None
+                ]
+                self.conn.executemany("INSERT OR REPLACE INTO samples (series_id, ts, value) VALUES (?, ?, ?)", rows)
+                written += len(rows)
+        return written
+
+    def _sync(
+        self,
+        source: str,
+        kind: str,
+        query: Dict[str, Any],
+        fetch: Callable[..., Any],
+        start: Optional[int],
+        overlap_millis: int,
+        slice_millis: int,
+        max_workers: int,
+        time_field: str
+    ) -> Dict[str, Any]:
+        now_millis = int(time.time() * 1000)
+        row = self.conn.execute("SELECT last_synced_ms FROM sources WHERE source = ?", (source,)).fetchone()
+        if row and row[0] is not None:
+            # Re-read the trailing interval: the last aggregation bucket may have been incomplete
+            window_start = row[0] - overlap_millis
+        else:
+            window_start = start if start is not None else now_millis - self.default_lookback_millis
+        self.conn.execute(
+            "INSERT INTO sources (source, kind, query) VALUES (?, ?, ?) "
+            "ON CONFLICT(source) DO UPDATE SET kind = excluded.kind, query = excluded.query",
+            (source, kind, json.dumps(query, sort_keys=True, default=str))
+        )
+
+        written = 0
+        slices = 0
+        for _, slice_end, response in self.api_client.reports.iter_report_slices(
+            fetch, window_start, now_millis, slice_millis=slice_millis, max_workers=max_workers
+        ):
+            written += self._ingest(source, response, time_field)
+            slices += 1
+            # Commit per slice so an interrupted sync resumes after the last stored slice
+            self.conn.execute("UPDATE sources SET last_synced_ms = ? WHERE source = ?", (slice_end, source))
+            self.conn.commit()
+        logger.info(f"History sync of '{source}': {written} samples from {slices} slices ({window_start}..{now_millis})")
+        return {"source": source, "start_ms": window_start, "end_ms": now_millis, "samples": written, "slices": slices}
+
+    def sync_metrics(
+        self,
+        source: str,
+        group_by: str = "60s",
+        start: Optional[int] = None,
+        slice_millis: int = 6 * 3600 * 1000,
+        max_workers: int = 4,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Incrementally syncs a MetricsClient.query_metrics_custom series into the store.
+
+        Args:
+            source (str): Local name of the synced series set (e.g. "cluster-cpu").
+            group_by (str): Time grouping interval passed to the API (e.g. "60s").
+            start (int): Start of the first sync in ms from epoch (default: now - default lookback).
+            slice_millis (int): Width of the time slices fetched in parallel.
+            max_workers (int): Maximum number of slices fetched in parallel.
+            **kwargs: Remaining query_metrics_custom kwargs (func, object_type, name, uuid, field).
+
+        Returns:
+            A dict with the synced 'start_ms', 'end_ms', number of 'samples' and 'slices'.
+        """
+        query = {"group_by": group_by, **kwargs}
+
+        def fetch(start_millis: int, end_millis: int) -> Any:
+            return self.api_client.metrics.query_metrics_custom(start=start_millis, end=end_millis, group_by=group_by, **kwargs)
+
+        return self._sync(
+            source, "metrics", query, fetch, start, parse_duration_millis(group_by),
+            slice_millis, max_workers, columnar.TIME_COLUMN
+        )
+
+    def sync_report(
+        self,
+        source: str,
+        report: str = "get_active_files_report",
+        start: Optional[int] = None,
+        time_field: str = "time",
+        overlap_millis: int = 60 * 1000,
+        slice_millis: int = 6 * 3600 * 1000,
+        max_workers: int = 4,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Incrementally syncs a start_millis/end_millis report (see ReportsClient.TIME_SLICEABLE_REPORTS)
+        into the store. Numeric fields of each record become samples keyed by time_field.
+
+        Args:
+            source (str): Local name of the synced series set.
+            report (str): ReportsClient method name.
+            start (int): Start of the first sync in ms from epoch (default: now - default lookback).
+            time_field (str): Record field holding the sample timestamp.
+            overlap_millis (int): Trailing interval re-read on each sync.
+            slice_millis (int): Width of the time slices fetched in parallel.
+            max_workers (int): Maximum number of slices fetched in parallel.
+            **kwargs: Passed through to the report method (e.g. share, sv, osv).
+        """
+        fetch = self.api_client.reports._resolve_report(report)
+        query = {"report": report, **kwargs}
+
+        def fetch_slice(start_millis: int, end_millis: int) -> Any:
+            return fetch(start_millis=start_millis, end_millis=end_millis, **kwargs)
+
+        return self._sync(source, "report", query, fetch_slice, start, overlap_millis, slice_millis, max_workers, time_field)
+
+    def query(
+        self,
+        source: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        step: Optional[Any] = None,
+        agg: str = "avg",
+        output: str = "columns"
+    ) -> Any:
+        """
+        Range query over locally stored samples, optionally downsampled.
+
+        Args:
+            source (str): Name of a synced source.
+            start (int): Start of the range in ms from epoch (default: unbounded).
+            end (int): End of the range in ms from epoch (default: unbounded).
+            fields (List[str]): Restrict to these fields (default: all).
+            step: Downsampling step in ms or as a duration string (e.g. "1h"); None returns raw samples.
+            agg (str): Aggregate per step: 'avg', 'min', 'max', 'sum', 'count' or 'last'.
+            output (str): 'columns' (default), 'numpy', 'arrow' or 'pandas' (see hammerspace.columnar).
+
+        Returns:
+            One serie per (name, tags) with a 'time' column and one column per field.
+        """
+        if agg not in _AGGREGATES:
+            raise ValueError(f"Invalid aggregate '{agg}', expected one of {sorted(_AGGREGATES)}.")
+        where = ["s.source = ?"]
+        params: List[Any] = [source]
+        if start is not None:
+            where.append("p.ts >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("p.ts <= ?")
+            params.append(end)
+        if fields:
+            where.append(f"s.field IN ({','.join('?' * len(fields))})")
+            params.extend(fields)
+
+        if step is None:
+            sql = (f"SELECT s.name, s.tags, s.field, p.ts, p.value, NULL FROM samples p JOIN series s ON s.id = p.series_id "
+                   f"WHERE {' AND '.join(where)} ORDER BY s.name, s.tags, p.ts")
+        else:
+            step_millis = parse_duration_millis(step)
+            # With a single MAX() aggregate SQLite returns bare columns from the row holding the max
+            value_expr = "p.value, MAX(p.ts)" if agg == "last" else f"{_AGGREGATES[agg]}(p.value), NULL"
+            sql = (f"SELECT s.name, s.tags, s.field, (p.ts / {step_millis}) * {step_millis} AS bucket, {value_expr} "
+                   f"FROM samples p JOIN series s ON s.id = p.series_id WHERE {' AND '.join(where)} "
+                   f"GROUP BY p.series_id, bucket ORDER BY s.name, s.tags, bucket")
+
+        # Pivot (name, tags, field, ts, value) rows into one serie per (name, tags)
+        pivot: Dict[Tuple[Any, str], Dict[int, Dict[str, Any]]] = {}
+        field_names: Dict[Tuple[Any, str], List[str]] = {}
+        for name, tags, field, ts, value, _ in self.conn.execute(sql, params):
+            key = (name, tags)
+            pivot.setdefault(key, {}).setdefault(ts, {})[field] = value
+            if field not in field_names.setdefault(key, []):
+                field_names[key].append(field)
+
+        series = []
+        for (name, tags), rows in pivot.items():
+            names = field_names[(name, tags)]
+            series.append({
+                "name": name,
+                "tags": json.loads(tags),
+                "columns": [columnar.TIME_COLUMN] + names,
+                "values": [[ts] + [rows[ts].get(f) for f in names] for ts in sorted(rows)],
+            })
+        return columnar.convert(series, output)
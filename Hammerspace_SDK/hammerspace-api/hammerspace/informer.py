@@ -0,0 +1,204 @@
+# hammerspace/informer.py
+import json
+import logging
+import threading
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+Handler = Tuple[Optional[Callable[[Dict[str, Any]], None]],
+                Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]],
+                Optional[Callable[[Dict[str, Any]], None]]]
+
+
+def object_key(obj: Dict[str, Any]) -> Optional[str]:
+    """Returns the uuid of a listed object (uoid.uuid, uuid or id), falling back to its name."""
+    return (obj.get("uoid") or {}).get("uuid") or obj.get("uuid") or obj.get("id") or obj.get("name")
+
+
+class Informer:
+    def __init__(self, api_client: Any, resource: str, resync_seconds: float = 30.0, list_kwargs: Optional[Dict[str, Any]] = None):
+        """
+        Periodically lists one resource type (e.g. "nodes", "shares", "tasks") into an in-memory
+        cache indexed by uuid and name, and calls the registered add / update / delete handlers
+        with the differences between consecutive lists.
+
+        Args:
+            api_client: An instance of HammerspaceApiClient.
+            resource (str): Name of the resource client on api_client whose get() lists the objects.
+            resync_seconds (float): Interval between lists.
+            list_kwargs (Dict[str, Any]): Passed to get() (e.g. {"spec": "..."}).
+        """
+        self.api_client = api_client
+        self.resource = resource
+        self.resync_seconds = resync_seconds
+        self.list_kwargs = list_kwargs or {}
+        self._list = getattr(api_client, resource).get
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+        self._handlers: List[Handler] = []
+        self._lock = threading.RLock()
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_event_handler(
+        self,
+        on_add: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_update: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+        on_delete: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Handler:
+        """
+        Registers callbacks: on_add(obj), on_update(old, new), on_delete(obj). If the cache is
+        already synced, on_add is called for every cached object first, so late subscribers see
+        the same state as early ones. Returns a handle for remove_event_handler.
+        """
+        handler = (on_add, on_update, on_delete)
+        with self._lock:
+            self._handlers.append(handler)
+            existing = list(self._objects.values()) if self._synced.is_set() else []
+        for obj in existing:
+            self._call(on_add, obj)
+        return handler
+
+    def remove_event_handler(self, handler: Handler) -> None:
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def _call(self, callback: Optional[Callable[..., None]], *args: Any) -> None:
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"Informer handler for '{self.resource}' failed: {e}", exc_info=True)
+
+    def resync(self) -> Dict[str, int]:
+        """
+        Lists the resource once, updates the cache and dispatches the differences.
+
+        Returns:
+            Counts of 'added', 'updated' and 'deleted' objects.
+        """
+        listed = self._list(**self.list_kwargs)
+        if listed is None:
+            raise RuntimeError(f"Listing '{self.resource}' failed.")
+        if isinstance(listed, dict):
+            listed = [listed]
+
+        objects: Dict[str, Dict[str, Any]] = {}
+        fingerprints: Dict[str, str] = {}
+        for obj in listed:
+            key = object_key(obj)
+            if key is None:
+                continue
+            objects[key] = obj
+            fingerprints[key] = json.dumps(obj, sort_keys=True, default=str)
+
+        with self._lock:
+            added = [objects[k] for k in objects if k not in self._objects]
+            updated = [(self._objects[k], objects[k]) for k in objects
+                       if k in self._objects and self._fingerprints[k] != fingerprints[k]]
+            deleted = [self._objects[k] for k in self._objects if k not in objects]
+            self._objects = objects
+            self._fingerprints = fingerprints
+            self._by_name = {obj["name"]: key for key, obj in objects.items() if obj.get("name")}
+            handlers = list(self._handlers)
+            self._synced.set()
+
+        for on_add, on_update, on_delete in handlers:
+            for obj in added:
+                self._call(on_add, obj)
+            for old, new in updated:
+                self._call(on_update, old, new)
+            for obj in deleted:
+                self._call(on_delete, obj)
+        if added or updated or deleted:
+            logger.info(f"Informer '{self.resource}': {len(added)} added, {len(updated)} updated, {len(deleted)} deleted")
+        return {"added": len(added), "updated": len(updated), "deleted": len(deleted)}
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.resync()
+            except Exception as e:
+                logger.warning(f"Informer '{self.resource}' list failed: {e}")
+            self._stop.wait(self.resync_seconds)
+
+    def start(self) -> "Informer":
+        """Starts the background list loop (idempotent)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=f"informer-{self.resource}", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the first list has completed. Returns False on timeout."""
+        return self._synced.wait(timeout)
+
+    def get(self, uuid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._objects.get(uuid)
+
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            key = self._by_name.get(name)
+            return self._objects.get(key) if key is not None else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._objects.values())
+
+
+class InformerFactory:
+    def __init__(self, api_client: Any, resync_seconds: float = 30.0):
+        """
+        Hands out one shared Informer per resource type, so all consumers in a process
+        (dashboards, exporters, automation) share a single poll and cache per resource.
+
+        Args:
+            api_client: An instance of HammerspaceApiClient.
+            resync_seconds (float): Default list interval of created informers.
+        """
+        self.api_client = api_client
+        self.resync_seconds = resync_seconds
+        self._informers: Dict[str, Informer] = {}
+        self._lock = threading.Lock()
+
+    def informer(self, resource: str, resync_seconds: Optional[float] = None, start: bool = True) -> Informer:
+        """
+        Returns the shared informer for a resource (e.g. "nodes"), creating and starting it on
+        first use. resync_seconds only applies when the informer is created.
+        """
+        with self._lock:
+            informer = self._informers.get(resource)
+            if informer is None:
+                informer = Informer(self.api_client, resource, resync_seconds or self.resync_seconds)
+                self._informers[resource] = informer
+        if start:
+            informer.start()
+        return informer
+
+    def wait_for_sync(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every created informer has completed its first list."""
+        with self._lock:
+            informers = list(self._informers.values())
+        return all(i.wait_for_sync(timeout) for i in informers)
+
+    def stop(self) -> None:
+        with self._lock:
+            informers = list(self._informers.values())
+        for informer in informers:
+            informer.stop()
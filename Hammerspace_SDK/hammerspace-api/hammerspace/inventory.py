@@ -0,0 +1,191 @@
+# hammerspace/inventory.py
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "hammerspace-inventory/1"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Resource clients whose get() lists configuration objects; events and tasks are opt-in
+INVENTORY_RESOURCES = (
+    "ad", "backup", "base_storage_volumes", "cntl", "data_portals", "disk_drives", "dnss",
+    "file_snapshots", "gateways", "identity_group_mappings", "idp", "kmses", "labels", "ldaps",
+    "licenses", "logical_volumes", "login_policy", "mailsmtp", "network_interfaces", "nis", "nodes",
+    "notification_rules", "ntps", "object_storage_volumes", "object_stores", "objectives", "processor",
+    "roles", "s3server", "schedules", "share_participants", "shares", "sites", "snapshot_retentions",
+    "snmp", "static_routes", "storage_volumes", "subnet_gateways", "syslog", "user_groups", "users",
+    "volume_groups",
+)
+
+
+def _object_key(obj: Any, index: int) -> str:
+    if isinstance(obj, dict):
+        key = (obj.get("uoid") or {}).get("uuid") or obj.get("uuid") or obj.get("id") or obj.get("name")
+        if key is not None:
+            return str(key)
+    return f"#{index}"
+
+
+def _content_hash(obj: Any) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")).hexdigest()
+
+
+def _compress(payload: bytes, path: str) -> bytes:
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Writing .zst snapshots requires the optional dependency 'zstandard' (pip install zstandard).") from e
+        return zstandard.ZstdCompressor(level=10).compress(payload)
+    return gzip.compress(payload)
+
+
+def _decompress(data: bytes) -> bytes:
+    if data.startswith(_ZSTD_MAGIC):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Reading .zst snapshots requires the optional dependency 'zstandard' (pip install zstandard).") from e
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if data[:2] == b"\x1f\x8b":
+        return gzip.decompress(data)
+    return data
+
+
+def save_snapshot(snapshot: Dict[str, Any], path: str) -> None:
+    """Writes a snapshot as compressed JSON: zstd for '*.zst' paths, gzip otherwise."""
+    payload = json.dumps(snapshot, separators=(",", ":"), default=str).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_compress(payload, path))
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    """Reads a snapshot written by save_snapshot (compression is detected from the content)."""
+    with open(path, "rb") as f:
+        snapshot = json.loads(_decompress(f.read()).decode("utf-8"))
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"{path} is not a {SNAPSHOT_FORMAT} snapshot")
+    return snapshot
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Compares two snapshots by object key (uuid) using the stored content hashes; only objects
+    whose hashes differ are inspected field by field.
+
+    Returns:
+        {resource: {'added': [...], 'removed': [...], 'changed': [...]}} for resources with
+        differences. Entries hold 'key' and 'name'; changed entries also list the top-level
+        'fields' that differ. Resources that failed to list in either snapshot are skipped,
+        so an API error is not reported as every object being removed.
+    """
+    diff: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    old_resources = old.get("resources", {})
+    new_resources = new.get("resources", {})
+    failed = set(old.get("errors", {})) | set(new.get("errors", {}))
+    for resource in sorted((set(old_resources) | set(new_resources)) - failed):
+        before = old_resources.get(resource, {"hashes": {}, "items": {}})
+        after = new_resources.get(resource, {"hashes": {}, "items": {}})
+        old_hashes, new_hashes = before["hashes"], after["hashes"]
+
+        def entry(items: Dict[str, Any], key: str) -> Dict[str, Any]:
+            obj = items.get(key)
+            return {"key": key, "name": obj.get("name") if isinstance(obj, dict) else None}
+
+        added = [entry(after["items"], k) for k in new_hashes if k not in old_hashes]
+        removed = [entry(before["items"], k) for k in old_hashes if k not in new_hashes]
+        changed = []
+        for key, digest in new_hashes.items():
+            if key in old_hashes and old_hashes[key] != digest:
+                old_obj, new_obj = before["items"].get(key), after["items"].get(key)
+                if isinstance(old_obj, dict) and isinstance(new_obj, dict):
+                    fields = sorted(f for f in set(old_obj) | set(new_obj) if old_obj.get(f) != new_obj.get(f))
+                else:
+                    fields = []
+                changed.append({**entry(after["items"], key), "fields": fields})
+        if added or removed or changed:
+            diff[resource] = {"added": added, "removed": removed, "changed": changed}
+    return diff
+
+
+class InventoryClient:
+    def __init__(self, api_client: Any):
+        """
+        Cluster-wide inventory snapshots: every list endpoint fetched concurrently into one
+        document keyed by uuid, with per-object content hashes for fast local diffs.
+        """
+        self.api_client = api_client
+
+    def snapshot(
+        self,
+        resources: Iterable[str] = INVENTORY_RESOURCES,
+        include: Iterable[str] = (),
+        max_workers: int = 16
+    ) -> Dict[str, Any]:
+        """
+        Lists all given resources concurrently.
+
+        Args:
+            resources (Iterable[str]): Resource client attributes to list (default: INVENTORY_RESOURCES).
+            include (Iterable[str]): Extra resources to add, e.g. ("events", "tasks").
+            max_workers (int): Maximum number of concurrent list requests.
+
+        Returns:
+            A snapshot dict with 'resources' ({resource: {'items': {key: obj}, 'hashes': {key: sha1}}})
+            and 'errors' ({resource: message}) for resources whose listing failed.
+        """
+        names = list(dict.fromkeys(list(resources) + list(include)))
+        start_time = time.time()
+
+        def fetch(resource: str) -> Any:
+            listed = getattr(self.api_client, resource).get()
+            if listed is None:
+                raise RuntimeError("no response")
+            return listed if isinstance(listed, list) else [listed]
+
+        snapshot: Dict[str, Any] = {
+            "format": SNAPSHOT_FORMAT,
+            "created_millis": int(start_time * 1000),
+            "base_url": self.api_client.base_url,
+            "resources": {},
+            "errors": {},
+        }
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {name: pool.submit(fetch, name) for name in names}
+            for name, future in futures.items():
+                try:
+                    listed = future.result()
+                except Exception as e:
+                    logger.warning(f"Inventory: listing '{name}' failed: {e}")
+                    snapshot["errors"][name] = str(e)
+                    continue
+                items = {_object_key(obj, i): obj for i, obj in enumerate(listed)}
+                snapshot["resources"][name] = {
+                    "items": items,
+                    "hashes": {key: _content_hash(obj) for key, obj in items.items()},
+                }
+        total = sum(len(r["items"]) for r in snapshot["resources"].values())
+        logger.info(
+            f"Inventory snapshot: {total} objects from {len(snapshot['resources'])} resources in "
+            f"{time.time() - start_time:.2f}s ({len(snapshot['errors'])} failed)"
+        )
+        return snapshot
+
+    def save(self, path: str, **kwargs) -> Dict[str, Any]:
+        """Takes a snapshot (see snapshot() for kwargs) and writes it to path. Returns the snapshot."""
+        snapshot = self.snapshot(**kwargs)
+        save_snapshot(snapshot, path)
+        return snapshot
+
+    def diff_with(self, path: str, **kwargs) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """Diffs a saved snapshot against the current cluster state ("what changed since then")."""
+        return diff_snapshots(load_snapshot(path), self.snapshot(**kwargs))
@@ -1,6 +1,7 @@
 # hammerspace/metrics.py
 import logging
 from typing import Optional, List, Dict, Any
+from . import columnar
 logger = logging.getLogger(__name__)
 
 class MetricsClient:
@@ -74,4 +75,23 @@ class MetricsClient:
         
         logger.info(f"Querying native metrics with params: {query_params}")
         response = self.api_client.make_rest_call(path=path, method="GET", query_params=query_params)
-        return self.api_client.read_and_parse_json_body(response)
\ No newline at end of file
+        return self.api_client.read_and_parse_json_body(response)
+
+    def query_metrics_custom_columnar(self, output: str = "numpy", **kwargs) -> Any:
+        """
+        Same query as query_metrics_custom, decoded straight into columns.
+        Args:
+            output (str): 'numpy' (default), 'arrow', 'pandas' or 'columns' (plain lists).
+                See hammerspace.columnar for the result layout; time is int64 ms, values float64.
+        """
+        return columnar.convert(self.query_metrics_custom(**kwargs), output)
+
+    def get_metrics_capacity_columnar(
+        self, object_type_path: str, object_uuid_path: str, output: str = "numpy", **kwargs
+    ) -> Any:
+        """
+        Same query as get_metrics_capacity, decoded straight into columns.
+        Args:
+            output (str): 'numpy' (default), 'arrow', 'pandas' or 'columns' (plain lists).
+        """
+        return columnar.convert(self.get_metrics_capacity(object_type_path, object_uuid_path, **kwargs), output)
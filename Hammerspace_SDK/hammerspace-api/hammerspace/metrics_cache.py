@@ -0,0 +1,319 @@
+# hammerspace/metrics_cache.py
+import os
+import json
+import time
+import array
+import struct
+import hashlib
+import logging
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+from . import columnar
+
+logger = logging.getLogger(__name__)
+
+_DURATION_UNITS_MS = {"ms": 1, "s": 1000, "m": 60 * 1000, "h": 3600 * 1000, "d": 86400 * 1000, "w": 7 * 86400 * 1000}
+_BUCKET_MAGIC = b"HSMC1"
+
+
+def parse_duration_millis(duration: Any) -> int:
+    """Parses an API duration such as '60s', '5m', '1h' or '7d' (or a number of ms) into milliseconds."""
+    if isinstance(duration, (int, float)):
+        return int(duration)
+    text = str(duration).strip().lower()
+    for unit in sorted(_DURATION_UNITS_MS, key=len, reverse=True):
+        if text.endswith(unit) and text[:-len(unit)].replace(".", "", 1).isdigit():
+            return int(float(text[:-len(unit)]) * _DURATION_UNITS_MS[unit])
+    if text.isdigit():
+        return int(text)
+    raise ValueError(f"Invalid duration '{duration}'")
+
+
+def _encode_bucket(series: List[Dict[str, Any]]) -> bytes:
+    """
+    Encodes decoded series ({'name', 'tags', 'columns': {col: list}}) as a small JSON header
+    followed by packed int64 (time) / float64 (numeric) columns.
+    """
+    header = []
+    blobs = []
+    for serie in series:
+        columns_meta = []
+        for column, values in serie["columns"].items():
+            if column == columnar.TIME_COLUMN:
+                columns_meta.append({"name": column, "kind": "q"})
+                blobs.append(array.array("q", [v if v is not None else 0 for v in values]).tobytes())
+            elif all(isinstance(v, float) for v in values):
+                columns_meta.append({"name": column, "kind": "d"})
+                blobs.append(array.array("d", values).tobytes())
+            else:
+                columns_meta.append({"name": column, "kind": "json", "values": values})
+        rows = len(next(iter(serie["columns"].values()), []))
+        header.append({"name": serie.get("name"), "tags": serie.get("tags") or {}, "rows": rows, "columns": columns_meta})
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return _BUCKET_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + b"".join(blobs)
+
+
+def _decode_bucket(payload: bytes) -> List[Dict[str, Any]]:
+    if not payload.startswith(_BUCKET_MAGIC):
+        raise ValueError("Not a metrics cache bucket")
+    offset = len(_BUCKET_MAGIC)
+    (header_len,) = struct.unpack_from("<I", payload, offset)
+    offset += 4
+    header = json.loads(payload[offset:offset + header_len].decode("utf-8"))
+    offset += header_len
+    series = []
+    for meta in header:
+        columns: Dict[str, List[Any]] = {}
+        for column in meta["columns"]:
+            if column["kind"] == "json":
+                columns[column["name"]] = column["values"]
+                continue
+            values = array.array(column["kind"])
+            size = values.itemsize * meta["rows"]
+            values.frombytes(payload[offset:offset + size])
+            offset += size
+            columns[column["name"]] = values.tolist()
+        series.append({"name": meta["name"], "tags": meta["tags"], "columns": columns})
+    return series
+
+
+def _serie_key(serie: Dict[str, Any]) -> Tuple[Any, str]:
+    return serie.get("name"), json.dumps(serie.get("tags") or {}, sort_keys=True)
+
+
+def _pad_value(values: List[Any]) -> Any:
+    """Filler for rows where a column is absent: NaN for numeric columns, None otherwise."""
+    return float("nan") if any(isinstance(v, float) for v in values) else None
+
+
+class MetricsCache:
+    def __init__(
+        self,
+        api_client: Any,
+        cache_dir: str,
+        points_per_bucket: int = 360,
+        settle_intervals: int = 1
+    ):
+        """
+        Disk cache for historical metrics queries. Queries are split into time buckets
+        aligned to the query's grouping interval; buckets that are closed (entirely in
+        the past) never change, so they are stored permanently and only the open "now"
+        bucket and never-seen buckets are fetched from the API. A closed bucket is only
+        stored when the response reached its last interval; a covered bucket without data
+        (an outage gap) is stored as an empty marker, so it is not refetched either.
+
+        Args:
+            api_client: An instance of HammerspaceApiClient.
+            cache_dir (str): Directory holding the cached buckets.
+            points_per_bucket (int): Grouping intervals per bucket (e.g. 360 x 60s = 6h buckets).
+            settle_intervals (int): Grouping intervals a bucket must be in the past before it is
+                considered closed, so late-arriving samples are not frozen out.
+        """
+        self.api_client = api_client
+        self.cache_dir = cache_dir
+        self.points_per_bucket = points_per_bucket
+        self.settle_intervals = settle_intervals
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _bucket_path(self, query_key: str, bucket_start: int) -> str:
+        return os.path.join(self.cache_dir, query_key, f"{bucket_start}.bin")
+
+    def _load_bucket(self, query_key: str, bucket_start: int) -> Optional[List[Dict[str, Any]]]:
+        path = self._bucket_path(query_key, bucket_start)
+        try:
+            with open(path, "rb") as f:
+                return _decode_bucket(f.read())
+        except FileNotFoundError:
+            return None
+        except (ValueError, struct.error) as e:
+            logger.warning(f"Discarding unreadable metrics cache bucket {path}: {e}")
+            return None
+
+    def _store_bucket(self, query_key: str, bucket_start: int, series: List[Dict[str, Any]]) -> None:
+        path = self._bucket_path(query_key, bucket_start)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_encode_bucket(series))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _split_by_bucket(
+        response: Any, bucket_starts: List[int], bucket_millis: int
+    ) -> Tuple[Dict[int, List[Dict[str, Any]]], Optional[int]]:
+        """
+        Decodes a response and splits every serie's rows into the given buckets.
+
+        Returns:
+            The split series and the latest timestamp in the response (None if it held no rows).
+        """
+        split: Dict[int, List[Dict[str, Any]]] = {b: [] for b in bucket_starts}
+        last_time: Optional[int] = None
+        for serie in columnar.iter_series(response):
+            columns = columnar.series_to_columns(serie)
+            times = columns.get(columnar.TIME_COLUMN)
+            if times is None:
+                continue
+            rows_by_bucket: Dict[int, List[int]] = {}
+            for row, t in enumerate(times):
+                if t is None:
+                    continue
+                last_time = t if last_time is None else max(last_time, t)
+                bucket = t - (t % bucket_millis)
+                if bucket in split:
+                    rows_by_bucket.setdefault(bucket, []).append(row)
+            for bucket, rows in rows_by_bucket.items():
+                split[bucket].append({
+                    "name": serie.get("name"),
+                    "tags": serie.get("tags") or {},
+                    "columns": {c: [values[r] for r in rows] for c, values in columns.items()},
+                })
+        return split, last_time
+
+    def _cached_range(
+        self,
+        key_parts: Dict[str, Any],
+        start_millis: int,
+        end_millis: int,
+        step_millis: int,
+        fetch_range: Callable[[int, int], Any],
+        output: str
+    ) -> Any:
+        bucket_millis = step_millis * self.points_per_bucket
+        query_key = hashlib.sha1(json.dumps(key_parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        now_millis = int(time.time() * 1000)
+        closed_before = now_millis - step_millis * self.settle_intervals
+
+        first_bucket = start_millis - (start_millis % bucket_millis)
+        bucket_starts = list(range(first_bucket, end_millis + 1, bucket_millis))
+        buckets: Dict[int, List[Dict[str, Any]]] = {}
+        missing: List[int] = []
+        for bucket in bucket_starts:
+            closed = bucket + bucket_millis <= closed_before
+            cached = self._load_bucket(query_key, bucket) if closed else None
+            if cached is not None:
+                buckets[bucket] = cached
+            else:
+                missing.append(bucket)
+
+        # Fetch each contiguous run of missing buckets with a single request
+        runs: List[List[int]] = []
+        for bucket in missing:
+            if runs and runs[-1][-1] + bucket_millis == bucket:
+                runs[-1].append(bucket)
+            else:
+                runs.append([bucket])
+        for run in runs:
+            fetch_start = run[0]
+            fetch_end = min(run[-1] + bucket_millis - 1, max(end_millis, now_millis))
+            logger.info(f"Metrics cache miss for {len(run)} bucket(s), fetching {fetch_start}..{fetch_end}")
+            fetched, last_time = self._split_by_bucket(fetch_range(fetch_start, fetch_end), run, bucket_millis)
+            for bucket, series in fetched.items():
+                buckets[bucket] = series
+                # Only persist closed buckets the response demonstrably covers up to their last
+                # interval: a None, empty or truncated response must not freeze a gap forever.
+                # A covered bucket without rows is a real gap and is stored as an empty marker.
+                complete = last_time is not None and last_time >= bucket + bucket_millis - step_millis
+                if complete and bucket + bucket_millis <= closed_before:
+                    self._store_bucket(query_key, bucket, series)
+        logger.info(f"Metrics cache: {len(bucket_starts) - len(missing)}/{len(bucket_starts)} buckets served from disk")
+
+        # Merge buckets in time order, clipped to the requested window. Columns are matched by
+        # name, since buckets fetched at different times may carry different column sets.
+        merged: Dict[Tuple[Any, str], Dict[str, Any]] = {}
+        for bucket in bucket_starts:
+            for serie in buckets.get(bucket, []):
+                target = merged.setdefault(
+                    _serie_key(serie), {"name": serie.get("name"), "tags": serie.get("tags") or {}, "columns": {}, "rows": 0}
+                )
+                times = serie["columns"].get(columnar.TIME_COLUMN, [])
+                keep = [i for i, t in enumerate(times) if start_millis <= t <= end_millis]
+                if not keep:
+                    continue
+                for column, values in serie["columns"].items():
+                    if column not in target["columns"]:
+                        target["columns"][column] = [_pad_value(values)] * target["rows"]
+                    target["columns"][column].extend(values[i] for i in keep)
+                for column, values in target["columns"].items():
+                    if column not in serie["columns"]:
+                        values.extend([_pad_value(values)] * len(keep))
+                target["rows"] += len(keep)
+        for serie in merged.values():
+            del serie["rows"]
+
+        decoded = list(merged.values())
+        if output == "columns":
+            return decoded
+        series = []
+        for serie in decoded:
+            names = list(serie["columns"])
+            series.append({
+                "name": serie["name"],
+                "tags": serie["tags"],
+                "columns": names,
+                "values": [list(row) for row in zip(*(serie["columns"][n] for n in names))],
+            })
+        return columnar.convert(series, output)
+
+    def query_metrics_custom(
+        self, start: int, end: int, group_by: str = "60s", output: str = "columns", **kwargs
+    ) -> Any:
+        """
+        Cached equivalent of MetricsClient.query_metrics_custom over [start, end] (ms from epoch).
+
+        Args:
+            start (int): Start of interval in ms from epoch.
+            end (int): End of interval in ms from epoch.
+            group_by (str): Time grouping interval (e.g. "60s"); also sets the bucket alignment.
+            output (str): 'columns' (default), 'numpy', 'arrow' or 'pandas' (see hammerspace.columnar).
+            **kwargs: Remaining query_metrics_custom kwargs (func, object_type, name, uuid, field).
+                'limit' is not supported, as it would truncate individual buckets.
+        """
+        if "limit" in kwargs:
+            raise ValueError("'limit' cannot be combined with bucketed caching.")
+        key_parts = {"endpoint": "metrics", "group_by": group_by, **kwargs}
+
+        def fetch_range(range_start: int, range_end: int) -> Any:
+            return self.api_client.metrics.query_metrics_custom(start=range_start, end=range_end, group_by=group_by, **kwargs)
+
+        return self._cached_range(key_parts, start, end, parse_duration_millis(group_by), fetch_range, output)
+
+    def get_metrics_capacity(
+        self,
+        object_type_path: str,
+        object_uuid_path: str,
+        start: int,
+        end: Optional[int] = None,
+        interval_duration: str = "60s",
+        output: str = "columns",
+        **kwargs
+    ) -> Any:
+        """
+        Cached equivalent of MetricsClient.get_metrics_capacity over [start, end] (ms from epoch).
+        The endpoint only accepts a preceding duration, so missing ranges are fetched as
+        "the last N seconds" and clipped locally.
+
+        Args:
+            object_type_path (str): Source Object Type (CLUSTER, SHARE, etc.).
+            object_uuid_path (str): Source Object UUID.
+            start (int): Start of interval in ms from epoch.
+            end (int): End of interval in ms from epoch (default: now).
+            interval_duration (str): Sampling interval (e.g. "60s"); also sets the bucket alignment.
+            output (str): 'columns' (default), 'numpy', 'arrow' or 'pandas'.
+            **kwargs: Remaining get_metrics_capacity kwargs (include_managed_data_usage).
+        """
+        if end is None:
+            end = int(time.time() * 1000)
+        key_parts = {
+            "endpoint": "capacity", "object_type": object_type_path, "uuid": object_uuid_path,
+            "interval_duration": interval_duration, **kwargs
+        }
+
+        def fetch_range(range_start: int, range_end: int) -> Any:
+            preceding_seconds = max(1, -(-(int(time.time() * 1000) - range_start) // 1000))
+            return self.api_client.metrics.get_metrics_capacity(
+                object_type_path, object_uuid_path,
+                preceding_duration=f"{preceding_seconds}s", interval_duration=interval_duration, **kwargs
+            )
+
+        return self._cached_range(key_parts, start, end, parse_duration_millis(interval_duration), fetch_range, output)
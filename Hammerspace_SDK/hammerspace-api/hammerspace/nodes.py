@@ -1,6 +1,6 @@
 # hammerspace/nodes.py
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 # from .client import HammerspaceApiClient
 
 logger = logging.getLogger(__name__)
@@ -30,6 +30,30 @@ class NodesClient:
         response = self.api_client.make_rest_call(path=path, method="GET", query_params=query_params)
         return self.api_client.read_and_parse_json_body(response)
 
+    def get(
+        self, identifier: Optional[str] = None, **kwargs
+    ) -> Union[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]]]:
+        """
+        Gets all nodes or a specific node by its identifier, with the same signature as the
+        other resource clients' get() (used by generic helpers such as Informer and NameResolver).
+        Optional kwargs for listing: spec (str), page (int), page_size (int),
+                                     page_sort (str), page_sort_dir (str)
+        """
+        if identifier:
+            return self.get_node_by_id(identifier, block_device_info=kwargs.get("block_device_info"))
+        return self.list_nodes(
+            spec=kwargs.get("spec"), page=kwargs.get("page"), page_size=kwargs.get("page_size"),
+            page_sort=kwargs.get("page_sort"), page_sort_dir=kwargs.get("page_sort_dir")
+        )
+
+    def get_many(self, identifiers: List[str], field: str = "uoid.uuid", **kwargs) -> Dict[str, Any]:
+        """
+        Gets many nodes in a handful of spec-filtered list calls instead of one get() per identifier.
+        See HammerspaceApiClient.get_by_identifiers for kwargs (max_url_length, max_workers).
+        Returns {'items': [...in input order, None if not found], 'missing': [...]}.
+        """
+        return self.api_client.get_by_identifiers("nodes", identifiers, field=field, **kwargs)
+
     def create_node(
         self, node_data: Dict[str, Any], create_placement_objectives: Optional[bool] = None, task_timeout_seconds: int = 300
     ) -> Optional[str]:
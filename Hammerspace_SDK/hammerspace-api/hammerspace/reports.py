@@ -1,6 +1,11 @@
 # hammerspace/reports.py
+import time
 import logging
-from typing import Optional, List, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Union, Callable, Iterator, Tuple
+import requests
+from . import columnar
 
 logger = logging.getLogger(__name__)
 
@@ -439,6 +444,18 @@ class ReportsClient:
         response = self.api_client.make_rest_call(path=path, method="GET", query_params=query_params)
         return self.api_client.read_and_parse_json_body(response)
 
+    def get_stats_report_columnar(
+        self, category: str, object_type_path: str, object_uuid_path: str, output: str = "numpy", **kwargs
+    ) -> Any:
+        """
+        Same query as get_stats_report, decoded straight into columns.
+
+        Args:
+            output (str): 'numpy' (default), 'arrow', 'pandas' or 'columns' (plain lists).
+                See hammerspace.columnar for the result layout; time is int64 ms, values float64.
+        """
+        return columnar.convert(self.get_stats_report(category, object_type_path, object_uuid_path, **kwargs), output)
+
     def get_volumes_exceeded_threshold_report(self, **kwargs) -> Optional[Dict[str, Any]]: # Returns VolumesExceededThresholdReportView
         """
         Query the influxDB for performance reports (volumes exceeded threshold).
@@ -462,3 +479,215 @@ class ReportsClient:
         logger.info(f"Getting volumes exceeded threshold report with params: {query_params}")
         response = self.api_client.make_rest_call(path=path, method="GET", query_params=query_params)
         return self.api_client.read_and_parse_json_body(response)
+
+    # Report methods that accept start_millis/end_millis and return per-record rows, so
+    # slices can be concatenated. Summary endpoints (mobility/activity summaries, MOE
+    # bandwidth, volumes exceeded threshold) aggregate over the window and are excluded.
+    TIME_SLICEABLE_REPORTS = (
+        "get_active_files_report",
+        "get_cloud_activity_report",
+        "get_mobility_report",
+    )
+
+    # Reports whose rows describe an object rather than an event: an object active in
+    # several slices is listed once per slice and must be de-duplicated when merging
+    SLICE_DEDUPE_KEYS = {
+        "get_active_files_report": (("shareUuid", "shareName", "share"), ("path", "filePath", "fileName", "name")),
+    }
+
+    def _resolve_report(self, report: Union[str, Callable[..., Any]]) -> Callable[..., Any]:
+        if callable(report):
+            return report
+        if report not in self.TIME_SLICEABLE_REPORTS:
+            raise ValueError(f"Report '{report}' does not support start_millis/end_millis slicing.")
+        return getattr(self, report)
+
+    def _fetch_with_retries(
+        self, fetch: Callable[..., Any], max_retries: int, retry_backoff_seconds: float, **kwargs
+    ) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return fetch(**kwargs)
+            except requests.exceptions.RequestException as e:
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                delay = retry_backoff_seconds * (2 ** (attempt - 1))
+                logger.warning(f"Report fetch failed ({e}), retry {attempt}/{max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def iter_report_slices(
+        self,
+        report: Union[str, Callable[..., Any]],
+        start_millis: int,
+        end_millis: int,
+        slice_millis: int = 3600 * 1000,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 1.0,
+        **kwargs
+    ) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Splits [start_millis, end_millis] into time slices, fetches them concurrently and
+        yields them in chronological order as soon as each next slice is available.
+
+        Args:
+            report: Name of a ReportsClient method listed in TIME_SLICEABLE_REPORTS
+                (e.g. "get_active_files_report"), or any callable taking start_millis/end_millis kwargs.
+            start_millis (int): Start of the window in [ms] from epoch.
+            end_millis (int): End of the window in [ms] from epoch.
+            slice_millis (int): Width of each slice in [ms] (default: 1 hour).
+            max_workers (int): Maximum number of slices fetched in parallel.
+            max_retries (int): Retries per slice on request failures; a slice that still
+                fails raises its exception when it is reached in the output order.
+            retry_backoff_seconds (float): Initial retry delay, doubled on each retry.
+            **kwargs: Passed through to the report method (e.g. share, sv, osv).
+
+        Yields:
+            (slice_start_millis, slice_end_millis, result) tuples. Slice bounds are inclusive
+            and do not overlap.
+        """
+        if slice_millis <= 0:
+            raise ValueError("slice_millis must be positive.")
+        fetch = self._resolve_report(report)
+        slices = []
+        slice_start = start_millis
+        while slice_start <= end_millis:
+            slice_end = min(slice_start + slice_millis - 1, end_millis)
+            slices.append((slice_start, slice_end))
+            slice_start = slice_end + 1
+        logger.info(f"Fetching report in {len(slices)} slices of {slice_millis}ms with {max_workers} workers")
+
+        # Keep a bounded window of slices in flight so memory does not grow with the window size
+        in_flight_limit = max(1, max_workers) * 2
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = []
+            next_to_submit = 0
+            for index in range(len(slices)):
+                while next_to_submit < len(slices) and next_to_submit < index + in_flight_limit:
+                    s_start, s_end = slices[next_to_submit]
+                    futures.append(pool.submit(
+                        self._fetch_with_retries, fetch, max_retries, retry_backoff_seconds,
+                        start_millis=s_start, end_millis=s_end, **kwargs
+                    ))
+                    next_to_submit += 1
+                result = futures[index].result()
+                futures[index] = None
+                yield slices[index][0], slices[index][1], result
+
+    @staticmethod
+    def _record_key(record: Any, key_fields: Tuple[Tuple[str, ...], ...]) -> Optional[Tuple[Any, ...]]:
+        """Identity of a report row: the first present field of each group (None if a group is missing)."""
+        if not isinstance(record, dict):
+            return None
+        key = []
+        for candidates in key_fields:
+            value = next((record[f] for f in candidates if record.get(f) is not None), None)
+            if value is None:
+                return None
+            key.append(str(value))
+        return tuple(key)
+
+    def get_report_sliced(
+        self,
+        report: Union[str, Callable[..., Any]],
+        start_millis: int,
+        end_millis: int,
+        slice_millis: int = 3600 * 1000,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 1.0,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Fetches a large report window as parallel time slices and merges the results in order.
+        List results are concatenated; any other non-empty result is appended as one element.
+        Rows of reports listed in SLICE_DEDUPE_KEYS appear once, at their first position,
+        holding the row of the latest slice. See iter_report_slices for the arguments.
+        """
+        key_fields = self.SLICE_DEDUPE_KEYS.get(report) if isinstance(report, str) else None
+        merged: List[Any] = []
+        positions: Dict[Tuple[Any, ...], int] = {}
+        for _, _, result in self.iter_report_slices(
+            report, start_millis, end_millis, slice_millis=slice_millis, max_workers=max_workers,
+            max_retries=max_retries, retry_backoff_seconds=retry_backoff_seconds, **kwargs
+        ):
+            if not isinstance(result, list):
+                if result:
+                    merged.append(result)
+                continue
+            for record in result:
+                key = self._record_key(record, key_fields) if key_fields else None
+                if key is None:
+                    merged.append(record)
+                elif key in positions:
+                    merged[positions[key]] = record
+                else:
+                    positions[key] = len(merged)
+                    merged.append(record)
+        return merged
+
+    # Report methods that accept limit/offset and can be paged
+    LIMIT_OFFSET_REPORTS = (
+        "get_active_files_report",
+    )
+
+    def iter_report_records(
+        self,
+        report: Union[str, Callable[..., Any]] = "get_active_files_report",
+        page_size: int = 1000,
+        prefetch: int = 2,
+        stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        top_n: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the records of a limit/offset report page by page, prefetching the next
+        pages in the background, so consumers never pull an unlimited result set at once.
+
+        Args:
+            report: Name of a ReportsClient method listed in LIMIT_OFFSET_REPORTS, or any
+                callable taking limit/offset kwargs and returning a list.
+            page_size (int): Records requested per page (API name: limit).
+            prefetch (int): Number of pages fetched ahead of the consumer.
+            stop_when (Callable): Optional predicate; iteration stops before the first record
+                for which it returns True (useful on results ordered by the server).
+            top_n (int): Optional cap on the number of records yielded.
+            **kwargs: Passed through to the report method (e.g. start_millis, share, sv).
+
+        Yields:
+            Report records in server order. Outstanding prefetches are cancelled on early stop.
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive.")
+        if callable(report):
+            fetch = report
+        elif report in self.LIMIT_OFFSET_REPORTS:
+            fetch = getattr(self, report)
+        else:
+            raise ValueError(f"Report '{report}' does not support limit/offset paging.")
+        start_offset = kwargs.pop("offset", 0)
+        kwargs.pop("limit", None)
+
+        yielded = 0
+        next_offset = start_offset
+        pending: deque = deque()
+        pool = ThreadPoolExecutor(max_workers=max(1, prefetch))
+        try:
+            while True:
+                while len(pending) < max(1, prefetch):
+                    pending.append(pool.submit(fetch, limit=page_size, offset=next_offset, **kwargs))
+                    next_offset += page_size
+                page = pending.popleft().result() or []
+                for record in page:
+                    if top_n is not None and yielded >= top_n:
+                        return
+                    if stop_when is not None and stop_when(record):
+                        return
+                    yield record
+                    yielded += 1
+                if len(page) < page_size or (top_n is not None and yielded >= top_n):
+                    return
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
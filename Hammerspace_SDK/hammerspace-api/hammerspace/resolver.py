@@ -0,0 +1,116 @@
+# hammerspace/resolver.py
+import time
+import logging
+import threading
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Resource client attribute -> API collection path, used to match mutations to cached maps
+RESOLVABLE_RESOURCES = {
+    "shares": "/shares",
+    "storage_volumes": "/storage-volumes",
+    "object_storage_volumes": "/object-storage-volumes",
+    "logical_volumes": "/logical-volumes",
+    "volume_groups": "/volume-groups",
+    "object_stores": "/object-stores",
+    "sites": "/sites",
+    "nodes": "/nodes",
+    "users": "/users",
+    "user_groups": "/user-groups",
+    "roles": "/roles",
+    "objectives": "/objectives",
+}
+
+
+class NameResolver:
+    def __init__(self, api_client: Any, min_refresh_seconds: float = 5.0):
+        """
+        In-memory name -> uuid index per resource type. Each map is bulk-loaded with one list
+        call on first use, refreshed lazily when a name is not found, and invalidated whenever
+        a create / update / delete request for that resource goes through the same api_client.
+
+        Args:
+            api_client: An instance of HammerspaceApiClient.
+            min_refresh_seconds (float): Minimum age of a map before a miss triggers a reload,
+                so repeated lookups of a non-existent name do not re-list every time.
+        """
+        self.api_client = api_client
+        self.min_refresh_seconds = min_refresh_seconds
+        self._maps: Dict[str, Dict[str, str]] = {}
+        self._names: Dict[str, Dict[str, str]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        api_client.add_mutation_listener(self._on_mutation)
+
+    def _load(self, resource: str) -> None:
+        if resource not in RESOLVABLE_RESOURCES:
+            raise ValueError(f"Unsupported resource '{resource}', expected one of {sorted(RESOLVABLE_RESOURCES)}.")
+        listed = getattr(self.api_client, resource).get() or []
+        by_name: Dict[str, str] = {}
+        for obj in listed:
+            uuid = (obj.get("uoid") or {}).get("uuid") or obj.get("uuid")
+            if obj.get("name") and uuid:
+                by_name[obj["name"]] = uuid
+        with self._lock:
+            self._maps[resource] = by_name
+            self._names[resource] = {uuid: name for name, uuid in by_name.items()}
+            self._loaded_at[resource] = time.monotonic()
+        logger.info(f"Resolver loaded {len(by_name)} {resource} names")
+
+    def _lookup(self, index: Dict[str, Dict[str, str]], resource: str, key: str) -> Optional[str]:
+        with self._lock:
+            loaded = resource in index
+            value = index.get(resource, {}).get(key)
+            age = time.monotonic() - self._loaded_at.get(resource, 0.0)
+        if value is not None:
+            return value
+        if loaded and age < self.min_refresh_seconds:
+            return None
+        self._load(resource)
+        with self._lock:
+            return index[resource].get(key)
+
+    def resolve(self, resource: str, name: str) -> Optional[str]:
+        """Returns the uuid of the named object (e.g. resolve("shares", "home")), or None if it does not exist."""
+        return self._lookup(self._maps, resource, name)
+
+    def resolve_many(self, resource: str, names: List[str]) -> Dict[str, Optional[str]]:
+        """Resolves several names with at most one reload of the resource map."""
+        return {name: self.resolve(resource, name) for name in names}
+
+    def name_of(self, resource: str, uuid: str) -> Optional[str]:
+        """Returns the name of the object with the given uuid, or None."""
+        return self._lookup(self._names, resource, uuid)
+
+    def invalidate(self, resource: Optional[str] = None) -> None:
+        """Drops the cached map of one resource (or all), so the next lookup reloads it."""
+        with self._lock:
+            for index in (self._maps, self._names, self._loaded_at):
+                if resource is None:
+                    index.clear()
+                else:
+                    index.pop(resource, None)
+
+    def _forget(self, resource: str, identifier: str) -> None:
+        """Removes one object (by uuid or name) from a loaded map."""
+        with self._lock:
+            names = self._names.get(resource)
+            by_name = self._maps.get(resource)
+            if names is None or by_name is None:
+                return
+            name = names.pop(identifier, None) or (identifier if identifier in by_name else None)
+            if name is not None:
+                names.pop(by_name.pop(name, None), None)
+
+    def _on_mutation(self, method: str, path: str) -> None:
+        path = "/" + path.split("?", 1)[0].lstrip("/")
+        for resource, prefix in RESOLVABLE_RESOURCES.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                identifier = path[len(prefix) + 1:]
+                if method == "DELETE" and identifier and "/" not in identifier:
+                    # A delete cannot rename other objects, so only that entry is dropped
+                    self._forget(resource, identifier)
+                else:
+                    logger.debug(f"Resolver invalidating {resource} after {method} {path}")
+                    self.invalidate(resource)
@@ -42,6 +42,14 @@ class SharesClient:
         response = self.api_client.make_rest_call(path=path, method="GET", query_params=query_params)
         return self.api_client.read_and_parse_json_body(response)
 
+    def get_many(self, identifiers: List[str], field: str = "uoid.uuid", **kwargs) -> Dict[str, Any]:
+        """
+        Gets many shares in a handful of spec-filtered list calls instead of one get() per identifier.
+        See HammerspaceApiClient.get_by_identifiers for kwargs (max_url_length, max_workers).
+        Returns {'items': [...in input order, None if not found], 'missing': [...]}.
+        """
+        return self.api_client.get_by_identifiers("shares", identifiers, field=field, **kwargs)
+
     def create_share(
         self, share_data: Dict[str, Any], monitor_task: bool = True, task_timeout_seconds: int = 300
     ) -> Union[Optional[str], Optional[Dict[str, Any]]]:
@@ -357,7 +357,10 @@ done
 
 # Set file paths
 PROMETHEUS_CONFIG="$TEMP_DIR/prometheus-config-generated.yaml"
+PROMETHEUS_RULES="$TEMP_DIR/prometheus-rules-generated.yaml"
 FINAL_CONFIG="$TEMP_DIR/final_config.yaml"
+DISCOVERY_STATE="$TEMP_DIR/discovery_state.json"
+DISCOVERY_UNCHANGED=false
 
 # Function to validate configuration
 validate_config() {
@@ -390,9 +393,16 @@ validate_config() {
 discover_nodes() {
     log_info "Discovering nodes from Hammerspace..."
 
-    if ! python3 scripts/discover_nodes.py \
+    # Exit code 3 means the discovered inventory matches the previous run
+    local rc=0
+    python3 scripts/discover_nodes.py \
         --config "$CONFIG_FILE" \
-        --output "$FINAL_CONFIG" >/dev/null; then
+        --output "$FINAL_CONFIG" \
+        --state-file "$DISCOVERY_STATE" >/dev/null || rc=$?
+    if [ "$rc" -eq 3 ]; then
+        log_info "Discovered nodes unchanged since last run"
+        DISCOVERY_UNCHANGED=true
+    elif [ "$rc" -ne 0 ]; then
         log_warn "Failed to run node discovery. Using static configuration."
         cp "$CONFIG_FILE" "$FINAL_CONFIG"
     fi
@@ -465,7 +475,8 @@ try:
     rendered = template.render(
         **{"global": config.get('global', {})},
         clusters=config.get('clusters', []),
-        namespace=config.get('global', {}).get('namespace', 'monitoring')
+        # Not 'namespace': that would shadow the Jinja namespace() the template uses
+        k8s_namespace=config.get('global', {}).get('namespace', 'monitoring')
     )
 
     # Write to file
@@ -482,6 +493,13 @@ PYTHON
     fi
 
     log_info "Generated Prometheus config at $PROMETHEUS_CONFIG"
+
+    # Recording rules for /etc/prometheus/rules/*.rules (mounted from the prometheus-rules ConfigMap)
+    if ! python3 scripts/prometheus/generate_recording_rules.py \
+        --output "$TEMP_DIR/rules/hammerspace.rules" \
+        --configmap "$PROMETHEUS_RULES" >/dev/null; then
+        log_warn "Failed to generate Prometheus recording rules"
+    fi
 }
 
 # Function to generate CSI secret
@@ -596,6 +614,14 @@ install_monitoring_stack() {
             return 1
         fi
     fi
+
+    # Apply Prometheus recording rules
+    if [ -f "$PROMETHEUS_RULES" ]; then
+        log_info "Applying Prometheus recording rules..."
+        if ! kubectl apply -f "$PROMETHEUS_RULES" -n "$namespace"; then
+            log_warn "Failed to apply Prometheus recording rules"
+        fi
+    fi
     
     log_info "Monitoring stack installed in namespace: $namespace"
     
@@ -666,8 +692,12 @@ main() {
         cp "$CONFIG_FILE" "$FINAL_CONFIG"
     fi
 
-    # Generate Prometheus configuration
-    generate_prometheus_config
+    # Generate Prometheus configuration (skipped when nothing changed since the last run)
+    if [ "$DISCOVERY_UNCHANGED" = true ] && [ -f "$PROMETHEUS_CONFIG" ]; then
+        log_info "Prometheus configuration is up to date; skipping regeneration"
+    else
+        generate_prometheus_config
+    fi
     
     # Show config if config-only mode
     if [ "$CONFIG_ONLY" = true ]; then
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Historical Metrics Backfill for Prometheus
+
+Streams the metric history kept by the Anvil (GET /metrics and
+GET /reports/stats/{category}/CLUSTER/{uuid}) and writes it as OpenMetrics text
+files that `promtool tsdb create-blocks-from openmetrics` can turn into TSDB blocks,
+so a new Prometheus starts with the weeks of history the cluster already holds.
+
+The custom metrics window is split into time slices that are fetched concurrently,
+with a bounded number in flight, and each slice is written to its own file as soon as
+it arrives; memory is bounded by one slice, not by the window. The stats endpoint only
+accepts a duration preceding now, so each stats category is one request for the whole
+window and held in memory once; its samples are still written as one file per slice.
+Slices are aligned to multiples of the 2h TSDB block range, so blocks created from
+different files do not overlap.
+
+Series use the labels of scripts/hammerspace_exporter.py (cluster, series, field and
+tag_*): hammerspace_<category> for the stats reports and hammerspace_metric for the
+custom metrics query. Prometheus adds job and instance when it scrapes the exporter;
+pass the same values with --job and --instance (and any other target labels with
+--extra-label) so the backfilled hammerspace_performance continues the live series.
+
+Usage:
+    python3 scripts/backfill_metrics.py --config config/config.yaml --since 14d \\
+        --job hammerspace-exporter --instance hammerspace-exporter:9180 \\
+        --output-dir .tmp/backfill --tsdb-dir /prometheus
+"""
+
+import os
+import re
+import sys
+import math
+import time
+import shutil
+import argparse
+import logging
+import subprocess
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Set up basic logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Add the SDK directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+try:
+    from hammerspace import HammerspaceApiClient, columnar
+except ImportError:
+    print("Error: Could not import Hammerspace SDK. Make sure it's installed.")
+    sys.exit(1)
+
+from hammerspace_exporter import (METRIC_METADATA, entity_name_uuid, escape_label_value, load_config,
+                                  sanitize_label_name)
+
+DEFAULT_OUTPUT_DIR = '.tmp/backfill'
+BLOCK_MILLIS = 2 * 3600 * 1000
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+STATS_CATEGORIES = ('alignment', 'metadata', 'performance', 'space')
+
+BACKFILL_METADATA = {
+    **METRIC_METADATA,
+    **{f'hammerspace_{c}': ('gauge', f'{c.capitalize()} stat value (GET /reports/stats/{c}).')
+       for c in STATS_CATEGORIES if c != 'performance'},
+    'hammerspace_metric': ('gauge', 'Custom metrics query value (GET /metrics).'),
+}
+
+# A series is identified by its metric name and sorted label pairs
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def parse_duration(value: str) -> int:
+    """Parse a duration such as '14d', '6h' or '1h30m' into seconds."""
+    text = str(value).strip()
+    parts = re.findall(r'(\d+)([smhdw])', text)
+    if not parts or ''.join(n + u for n, u in parts) != text:
+        raise argparse.ArgumentTypeError(f"Invalid duration: {value!r}")
+    return sum(int(n) * DURATION_UNITS[u] for n, u in parts)
+
+
+def parse_label(value: str) -> Tuple[str, str]:
+    """Parse a KEY=VALUE label argument."""
+    key, sep, label_value = value.partition('=')
+    if not sep or not key or sanitize_label_name(key) != key:
+        raise argparse.ArgumentTypeError(f"Invalid label {value!r}, expected KEY=VALUE")
+    return key, label_value
+
+
+def align_down(millis: int, step_millis: int) -> int:
+    return millis - millis % step_millis
+
+
+def split_by_slice(samples: Dict[SeriesKey, Dict[int, float]],
+                   slice_millis: int) -> Dict[int, Dict[SeriesKey, Dict[int, float]]]:
+    """Split samples into {slice start: samples} along multiples of slice_millis."""
+    slices: Dict[int, Dict[SeriesKey, Dict[int, float]]] = {}
+    for key, points in samples.items():
+        for timestamp, value in points.items():
+            slices.setdefault(align_down(timestamp, slice_millis), {}).setdefault(key, {})[timestamp] = value
+    return slices
+
+
+def collect_samples(response: Any, metric: str, base_labels: Dict[str, str],
+                    start_millis: int, end_millis: int) -> Dict[SeriesKey, Dict[int, float]]:
+    """
+    Decode every Serie of a response into {series key: {timestamp ms: value}}, one series
+    per numeric column. Samples outside [start_millis, end_millis] and NaN or infinite
+    values are dropped; a timestamp seen twice for one series keeps the last value.
+    """
+    samples: Dict[SeriesKey, Dict[int, float]] = {}
+    for serie in columnar.iter_series(response):
+        columns = columnar.series_to_columns(serie)
+        times = columns.get(columnar.TIME_COLUMN)
+        if not times:
+            continue
+        tags = {sanitize_label_name(f"tag_{k}"): str(v) for k, v in (serie.get('tags') or {}).items()}
+        for field, values in columns.items():
+            if field == columnar.TIME_COLUMN or not values or not isinstance(values[0], float):
+                continue
+            labels = {**tags, **base_labels, 'series': serie.get('name') or '', 'field': field}
+            points = samples.setdefault((metric, tuple(sorted(labels.items()))), {})
+            for timestamp, value in zip(times, values):
+                if timestamp is not None and start_millis <= timestamp <= end_millis and math.isfinite(value):
+                    points[timestamp] = value
+    return samples
+
+
+def write_openmetrics(path: str, samples: Dict[SeriesKey, Dict[int, float]]) -> int:
+    """
+    Write samples as an OpenMetrics text file: families and series in sorted order, each
+    series' samples in timestamp order, terminated by '# EOF'. The file is written to a
+    temporary name and renamed, so an interrupted run never leaves a truncated file.
+
+    Returns:
+        Number of samples written
+    """
+    written = 0
+    tmp_path = os.path.join(os.path.dirname(path) or '.', f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'w') as f:
+        current_family = None
+        for (name, labels), points in sorted(samples.items()):
+            if not points:
+                continue
+            if name != current_family:
+                metric_type, help_text = BACKFILL_METADATA.get(name, ('gauge', name))
+                f.write(f"# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n")
+                current_family = name
+            label_str = ','.join(f'{k}="{escape_label_value(v)}"' for k, v in labels)
+            series = f"{name}{{{label_str}}}" if label_str else name
+            for timestamp in sorted(points):
+                f.write(f"{series} {points[timestamp]!r} {timestamp / 1000:.3f}\n")
+                written += 1
+        f.write("# EOF\n")
+    os.replace(tmp_path, path)
+    return written
+
+
+def create_blocks(promtool: str, path: str, tsdb_dir: str) -> None:
+    """Convert one OpenMetrics file into TSDB blocks under tsdb_dir."""
+    subprocess.run([promtool, 'tsdb', 'create-blocks-from', 'openmetrics', path, tsdb_dir],
+                   check=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+
+class Backfill:
+    """Fetches the history of one cluster slice by slice and writes one OpenMetrics file per slice."""
+
+    def __init__(self, client: HammerspaceApiClient, cluster: str, cluster_uuid: str, output_dir: str,
+                 step_seconds: int, metric_query: Optional[Dict[str, Any]] = None,
+                 stats_categories: Iterable[str] = ('performance',), tsdb_dir: Optional[str] = None,
+                 promtool: str = 'promtool', labels: Optional[Dict[str, str]] = None):
+        self.client = client
+        self.cluster = cluster
+        # Target labels (job, instance, ...) Prometheus attaches to the live series
+        self.labels = {**(labels or {}), 'cluster': cluster}
+        self.cluster_uuid = cluster_uuid
+        self.output_dir = output_dir
+        self.step_seconds = step_seconds
+        self.metric_query = metric_query or {}
+        self.stats_categories = list(stats_categories)
+        self.tsdb_dir = tsdb_dir
+        self.promtool = promtool
+        self.files_written: List[str] = []
+        self.samples_written = 0
+
+    def fetch_slice(self, start_millis: int, end_millis: int) -> Dict[SeriesKey, Dict[int, float]]:
+        """Query the custom metrics of one slice and decode it (runs in the slice workers)."""
+        response = self.client.metrics.query_metrics_custom(
+            start=start_millis, end=end_millis, group_by=f"{self.step_seconds}s", **self.metric_query)
+        return collect_samples(response, 'hammerspace_metric', self.labels, start_millis, end_millis)
+
+    def emit(self, name: str, samples: Dict[SeriesKey, Dict[int, float]]) -> None:
+        path = os.path.join(self.output_dir, f"{name}.om")
+        count = write_openmetrics(path, samples)
+        self.samples_written += count
+        self.files_written.append(path)
+        logger.info(f"Wrote {count} samples of {len(samples)} series to {path}")
+        if self.tsdb_dir:
+            create_blocks(self.promtool, path, self.tsdb_dir)
+            logger.debug(f"Created blocks from {path} in {self.tsdb_dir}")
+
+    def backfill_metrics(self, start_millis: int, end_millis: int, slice_millis: int, max_workers: int) -> None:
+        """
+        Fetch the custom metrics window as concurrent time slices and write each slice as
+        soon as it and all earlier slices are done. The first slice starts at the block
+        boundary before start_millis, but no sample before start_millis is kept.
+        """
+        def fetch(start_millis: int, end_millis: int, window_start: int) -> Dict[SeriesKey, Dict[int, float]]:
+            return self.fetch_slice(max(start_millis, window_start), end_millis)
+
+        for slice_start, _, samples in self.client.reports.iter_report_slices(
+                fetch, align_down(start_millis, slice_millis), end_millis, slice_millis=slice_millis,
+                max_workers=max_workers, window_start=start_millis):
+            self.emit(f"hammerspace-metrics-{slice_start // 1000}", samples)
+
+    def backfill_stats(self, start_millis: int, end_millis: int, slice_millis: int) -> None:
+        """
+        Write each stats report category as one file per slice. The stats endpoint only
+        accepts a duration preceding now, so each category is a single request covering
+        the whole window: its response (not just one slice) is held in memory.
+        """
+        preceding_minutes = max(1, math.ceil((time.time() * 1000 - start_millis) / 60000))
+        for category in self.stats_categories:
+            response = self.client.reports.get_stats_report(
+                category, 'CLUSTER', self.cluster_uuid,
+                preceding_duration=f"{preceding_minutes}m", interval_duration=f"{self.step_seconds}s")
+            metric = f"hammerspace_{category}"
+            samples = collect_samples(response, metric, self.labels, start_millis, end_millis)
+            for slice_start, slice_samples in sorted(split_by_slice(samples, slice_millis).items()):
+                self.emit(f"hammerspace-stats-{category}-{slice_start // 1000}", slice_samples)
+
+
+def main():
+    """Main entry point for the backfill."""
+    parser = argparse.ArgumentParser(description='Backfill Prometheus with the metric history of a Hammerspace cluster')
+    parser.add_argument('--config', default='config/config.yaml', help='Path to the configuration file')
+    parser.add_argument('--api-url', help='Hammerspace API URL (overrides config)')
+    parser.add_argument('--cluster-name', help='Value of the "cluster" label (default: from cluster state)')
+    parser.add_argument('--since', type=parse_duration, default=parse_duration('14d'),
+                        help='How far back to backfill, e.g. 14d or 36h (default: 14d)')
+    parser.add_argument('--until', type=parse_duration, default=0,
+                        help='End the window this long before now, e.g. to stop where Prometheus has data (default: 0)')
+    parser.add_argument('--step', type=parse_duration, default=parse_duration('60s'),
+                        help='Sample resolution requested from the API (default: 60s)')
+    parser.add_argument('--slice', type=parse_duration, default=parse_duration('6h'),
+                        help='Time slice per request and output file, a multiple of 2h (default: 6h)')
+    parser.add_argument('--workers', type=int, default=4, help='Slices fetched concurrently (default: 4)')
+    parser.add_argument('--object-type', help='objectType criteria of the custom metrics query')
+    parser.add_argument('--name', action='append', help='Object name criteria (repeatable)')
+    parser.add_argument('--field', action='append', help='Field to backfill, e.g. network.bytesSent (repeatable)')
+    parser.add_argument('--func', default='MEAN', choices=['MIN', 'MAX', 'MEAN', 'MEDIAN'],
+                        help='Aggregate per step (default: MEAN)')
+    parser.add_argument('--no-metrics', action='store_true', help='Skip the custom metrics query (GET /metrics)')
+    parser.add_argument('--stats-category', action='append', choices=STATS_CATEGORIES,
+                        help='Stats report category to backfill (repeatable, default: performance)')
+    parser.add_argument('--no-stats', action='store_true', help='Skip the stats reports')
+    parser.add_argument('--job', help='"job" label of the live exporter scrape target, so backfilled series join it')
+    parser.add_argument('--instance', help='"instance" label of the live exporter scrape target')
+    parser.add_argument('--extra-label', action='append', type=parse_label, default=[], metavar='KEY=VALUE',
+                        help='Other label to add to every series, e.g. a target label of the scrape job (repeatable)')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f'Directory for the OpenMetrics files (default: {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--tsdb-dir', help='Also run promtool on every file, writing blocks to this directory')
+    parser.add_argument('--promtool', default='promtool', help='promtool binary (default: promtool on PATH)')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+    if args.slice % (BLOCK_MILLIS // 1000):
+        parser.error("--slice must be a multiple of 2h")
+    if args.until >= args.since:
+        parser.error("--until must be shorter than --since")
+    if args.tsdb_dir and not shutil.which(args.promtool):
+        parser.error(f"{args.promtool} not found; install promtool or omit --tsdb-dir")
+
+    config = load_config(args.config) if os.path.exists(args.config) else {}
+    hs_config = config.get('hammerspace', {})
+    api_url = args.api_url or hs_config.get('api_url') or os.getenv('HS_API_URL')
+    username = hs_config.get('username') or os.getenv('HS_USERNAME')
+    password = hs_config.get('password') or os.getenv('HS_PASSWORD')
+    if not api_url or not username or not password:
+        logger.error("Missing Hammerspace API URL or credentials")
+        return 1
+
+    client = HammerspaceApiClient(
+        base_url=api_url, username=username, password=password,
+        verify_ssl=hs_config.get('ssl_verify', True), timeout=hs_config.get('timeout', 30)
+    )
+    try:
+        state = client.cntl.get_cluster_state() or {}
+    except Exception as e:
+        logger.error(f"Could not read cluster state: {e}")
+        return 1
+    cluster_name = args.cluster_name or state.get('name') or api_url
+    cluster_uuid = entity_name_uuid(state)[1]
+
+    metric_query = {'func': args.func}
+    if args.object_type:
+        metric_query['object_type'] = args.object_type
+    if args.name:
+        metric_query['name'] = args.name
+    if args.field:
+        metric_query['field'] = args.field
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.tsdb_dir:
+        os.makedirs(args.tsdb_dir, exist_ok=True)
+    labels = dict(args.extra_label)
+    if args.job:
+        labels['job'] = args.job
+    if args.instance:
+        labels['instance'] = args.instance
+    if not args.job or not args.instance:
+        logger.warning("Without --job and --instance the backfilled series do not continue the live exporter series")
+    backfill = Backfill(client, cluster_name, cluster_uuid, args.output_dir, args.step, metric_query=metric_query,
+                        stats_categories=args.stats_category or ['performance'], tsdb_dir=args.tsdb_dir,
+                        promtool=args.promtool, labels=labels)
+
+    now_millis = int(time.time() * 1000)
+    start_millis = now_millis - args.since * 1000
+    end_millis = now_millis - args.until * 1000
+    start = time.monotonic()
+    try:
+        if not args.no_metrics:
+            backfill.backfill_metrics(start_millis, end_millis, args.slice * 1000, args.workers)
+        if not args.no_stats:
+            if cluster_uuid:
+                backfill.backfill_stats(start_millis, end_millis, args.slice * 1000)
+            else:
+                logger.warning("Cluster UUID unknown; skipping the stats reports")
+    except subprocess.CalledProcessError as e:
+        logger.error(f"promtool failed: {e.stdout}")
+        return 1
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        return 1
+
+    logger.info(f"✓ Wrote {backfill.samples_written} samples in {len(backfill.files_written)} file(s) "
+                f"to {args.output_dir} in {time.monotonic() - start:.1f}s")
+    if not args.tsdb_dir and backfill.files_written:
+        logger.info("Create blocks with: promtool tsdb create-blocks-from openmetrics <file> <prometheus data dir>")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Discovery Benchmark: filtered /nodes listing vs. full /network-interfaces listing
+
+Starts a local synthetic Hammerspace API (no cluster needed) with many nodes and
+interfaces, then times both discovery methods of scripts/discover_nodes.py and
+reports latency and bytes transferred.
+
+Usage:
+    python3 scripts/benchmarks/bench_discovery.py --nodes 5000 --target-nodes 40 --interfaces-per-node 6
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from requests.auth import HTTPBasicAuth
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from discover_nodes import HammerspaceClient  # noqa: E402
+
+logging.getLogger('discover_nodes').setLevel(logging.WARNING)
+
+
+def build_cluster(total_nodes: int, target_nodes: int, interfaces_per_node: int):
+    """Create synthetic nodes (target_nodes of them ANVIL/DSX) and their network interfaces."""
+    nodes = []
+    for i in range(total_nodes):
+        node_type = ('ANVIL' if i % 2 == 0 else 'DSX') if i < target_nodes else 'STORAGE'
+        nodes.append({
+            'name': f'node-{i:05d}',
+            'uoid': {'uuid': f'00000000-0000-0000-0000-{i:012d}', 'objectType': 'NODE'},
+            'productNodeType': node_type,
+            'mgmtIpAddress': {'address': f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}', 'prefixLength': 24},
+            'hwComponents': [{'type': 'DISK', 'serial': f'SN{i}-{d}'} for d in range(4)],
+            'operState': 'UP',
+        })
+    interfaces = [
+        {'name': f'eth{n}', 'uoid': {'uuid': f'{node["uoid"]["uuid"]}-{n}'}, 'mtu': 9000, 'node': node}
+        for node in nodes for n in range(interfaces_per_node)
+    ]
+    return nodes, interfaces
+
+
+def make_server(nodes, interfaces):
+    interfaces_body = json.dumps(interfaces).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            if parsed.path.endswith('/network-interfaces'):
+                body = interfaces_body
+            elif parsed.path.endswith('/nodes'):
+                selected = nodes
+                spec = query.get('spec', [''])[0]
+                if spec.startswith('productNodeType=in=('):
+                    wanted = set(spec[len('productNodeType=in=('):-1].split(','))
+                    selected = [n for n in nodes if n['productNodeType'] in wanted]
+                page = int(query.get('page', ['0'])[0])
+                size = int(query.get('page.size', [str(len(selected) or 1)])[0])
+                body = json.dumps(selected[page * size:(page + 1) * size]).encode('utf-8')
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(client: HammerspaceClient, method: str, repeat: int):
+    timings = []
+    received = 0
+    found = 0
+    for _ in range(repeat):
+        received = 0
+
+        def count_bytes(response, *args, **kwargs):
+            nonlocal received
+            received += len(response.content)
+
+        client.session.hooks['response'] = [count_bytes]
+        start = time.perf_counter()
+        found = len(client.get_nodes_filtered() if method == 'nodes' else client.get_nodes())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), received, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark node discovery methods on a synthetic cluster')
+    parser.add_argument('--nodes', type=int, default=5000, help='Total nodes in the synthetic cluster')
+    parser.add_argument('--target-nodes', type=int, default=40, help='How many of them are ANVIL/DSX')
+    parser.add_argument('--interfaces-per-node', type=int, default=6, help='Network interfaces per node')
+    parser.add_argument('--page-size', type=int, default=100, help='Page size of the filtered listing')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per method (median is reported)')
+    args = parser.parse_args()
+
+    nodes, interfaces = build_cluster(args.nodes, args.target_nodes, args.interfaces_per_node)
+    server = make_server(nodes, interfaces)
+    client = HammerspaceClient(f'http://127.0.0.1:{server.server_port}/mgmt/v1.2/rest',
+                               HTTPBasicAuth('admin', 'admin'), verify_ssl=False, timeout=300)
+    print(f"Synthetic cluster: {len(nodes)} nodes ({args.target_nodes} ANVIL/DSX), {len(interfaces)} interfaces")
+
+    results = {}
+    for method in ('interfaces', 'nodes'):
+        results[method] = run(client, method, args.repeat)
+        seconds, received, found = results[method]
+        print(f"  {method:<10} {seconds * 1000:9.1f} ms  {received / 1024:10.1f} KiB  {found} nodes")
+
+    speedup = results['interfaces'][0] / results['nodes'][0] if results['nodes'][0] else float('inf')
+    reduction = results['interfaces'][1] / results['nodes'][1] if results['nodes'][1] else float('inf')
+    print(f"Filtered listing: {speedup:.1f}x faster, {reduction:.1f}x fewer bytes")
+    server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
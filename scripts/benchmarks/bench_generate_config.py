@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Config Generator Benchmark: target de-duplication and sharded generation
+
+Builds a synthetic node list (with duplicate entries, as produced by several cluster
+IPs reporting the same nodes) and times scripts/prometheus/generate_prometheus_config.py:
+the previous list-based de-duplication against the set-based collect_targets, and the
+generation of every hashmod shard. It also checks that shuffled input yields
+byte-identical output and reports how evenly the targets spread over the shards.
+
+Usage:
+    python3 scripts/benchmarks/bench_generate_config.py --targets 20000 --shards 4
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+import statistics
+
+import yaml
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'prometheus'))
+
+import generate_prometheus_config as generator  # noqa: E402
+
+logging.getLogger('generate_prometheus_config').setLevel(logging.WARNING)
+
+
+def build_nodes(count: int, duplicate_ratio: float):
+    nodes = [{'ip': f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}', 'name': f'node-{i:05d}'} for i in range(count)]
+    nodes += random.sample(nodes, int(count * duplicate_ratio))
+    random.shuffle(nodes)
+    return nodes
+
+
+def legacy_targets(nodes):
+    """The previous de-duplication: a membership test against a list for every node."""
+    targets = []
+    for node in nodes:
+        ip_str = str(node.get('ip') or '').strip()
+        if not ip_str:
+            continue
+        target = f"{ip_str}:9100"
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+def timed(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def render_all(nodes, shards: int):
+    targets = generator.collect_targets(nodes)
+    return [yaml.dump(generator.generate_prometheus_config(nodes, shards=shards, shard=shard, targets=targets),
+                      default_flow_style=False, sort_keys=False)
+            for shard in range(shards)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Prometheus config generation at scale')
+    parser.add_argument('--targets', type=int, default=10000, help='Distinct node targets')
+    parser.add_argument('--duplicates', type=float, default=0.2, help='Extra duplicate entries, as a fraction of --targets')
+    parser.add_argument('--shards', type=int, default=4, help='Number of hashmod shards')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (median is reported)')
+    parser.add_argument('--skip-legacy', action='store_true', help='Do not time the list-based de-duplication')
+    args = parser.parse_args()
+
+    random.seed(0)
+    nodes = build_nodes(args.targets, args.duplicates)
+    print(f"Synthetic inventory: {len(nodes)} node entries, {args.targets} distinct targets, {args.shards} shards")
+
+    new_seconds, targets = timed(lambda: generator.collect_targets(nodes), args.repeat)
+    if not args.skip_legacy:
+        legacy_seconds, legacy = timed(lambda: legacy_targets(nodes), 1)
+        assert sorted(legacy) == targets
+        print(f"  dedupe (list)  {legacy_seconds * 1000:10.1f} ms")
+    print(f"  dedupe (set)   {new_seconds * 1000:10.1f} ms")
+    if not args.skip_legacy and new_seconds:
+        print(f"  set-based de-duplication: {legacy_seconds / new_seconds:.0f}x faster")
+
+    render_seconds, rendered = timed(lambda: render_all(nodes, args.shards), args.repeat)
+    size = sum(len(r) for r in rendered)
+    print(f"  {args.shards} shard configs {render_seconds * 1000:8.1f} ms  {size / 1024:10.1f} KiB")
+
+    shuffled = list(nodes)
+    random.shuffle(shuffled)
+    print(f"  deterministic output: {render_all(shuffled, args.shards) == rendered}")
+
+    counts = [0] * args.shards
+    for target in targets:
+        counts[generator.hashmod_shard(target, args.shards)] += 1
+    print(f"  targets per shard: {counts} (max/mean {max(counts) / (len(targets) / args.shards):.3f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,12 +8,19 @@ with the discovered node information.
 
 import os
 import sys
+import json
+import time
+import signal
+import hashlib
 import argparse
+import threading
 import yaml
-from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union, Tuple, Iterator
 import logging
 import requests
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 # Set up basic logging
@@ -25,11 +32,22 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK',
 
 # Try to import the SDK
 try:
-    from get_nodes import get_management_ips, HammerspaceApiClient
+    from get_nodes import get_management_ips, iter_nodes_by_type, HammerspaceApiClient
 except ImportError:
     print("Error: Could not import Hammerspace SDK. Make sure it's installed.")
     sys.exit(1)
 
+DISCOVERY_NODE_TYPES = ('ANVIL', 'DSX')
+DISCOVERY_METHODS = ('nodes', 'interfaces')
+
+# Exit code when the discovered inventory (and thus the output) is unchanged
+EXIT_UNCHANGED = 3
+DEFAULT_STATE_TTL = 3600
+DEFAULT_DAEMON_INTERVAL = 60
+
+# Exporter ports scraped on every node (same defaults as prometheus/configmap.yaml.j2)
+NODE_PORTS = {'metrics': 9100, 'api': 9101, 'c_metrics': 9102, 'c_advisor': 9103}
+
 class ConfigError(Exception):
     """Custom exception for configuration errors."""
     pass
@@ -121,10 +139,50 @@ def get_hs_api_url(config: Dict[str, Any]) -> Optional[str]:
     # Check config file first, then environment variable
     return config.get('hammerspace', {}).get('api_url') or os.getenv('HS_API_URL')
 
+def get_cluster_api_urls(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the list of cluster API endpoints to discover from.
+
+    Every entry of `clusters:` that is not itself a discovered node is queried, at its own
+    `api_url` if set or at https://<ip>:8443/mgmt/v1.2/rest. The configured
+    `hammerspace.api_url` is included as well. Endpoints are deduplicated by URL.
+
+    Args:
+        config: The configuration dictionary (with normalized clusters)
+
+    Returns:
+        List of dicts with 'api_url', 'name', per-cluster 'timeout' and optional 'site'
+    """
+    default_timeout = config.get('hammerspace', {}).get('timeout', 30)
+    endpoints = []
+    seen = set()
+
+    def add(api_url: Optional[str], name: Optional[str], timeout: Any, site: Optional[str] = None) -> None:
+        if not api_url or api_url.rstrip('/') in seen:
+            return
+        seen.add(api_url.rstrip('/'))
+        endpoints.append({
+            'api_url': api_url,
+            'name': name or urlparse(api_url).hostname or api_url,
+            'timeout': timeout or default_timeout,
+            'site': site
+        })
+
+    add(get_hs_api_url(config), None, None)
+    for cluster in config.get('clusters', []):
+        if cluster.get('discovered'):
+            continue
+        api_url = cluster.get('api_url')
+        if not api_url and cluster.get('ip'):
+            api_url = f"https://{cluster['ip']}:8443/mgmt/v1.2/rest"
+        add(api_url, cluster.get('name'), cluster.get('timeout'), cluster.get('site'))
+    return endpoints
+
 class HammerspaceClient:
     """Client for interacting with the Hammerspace API."""
     
-    def __init__(self, base_url: str, auth: HTTPBasicAuth, verify_ssl: bool = True, timeout: int = 30):
+    def __init__(self, base_url: str, auth: HTTPBasicAuth, verify_ssl: bool = True, timeout: int = 30,
+                 session: Optional[requests.Session] = None):
         """
         Initialize the Hammerspace client.
         
@@ -133,12 +191,77 @@ class HammerspaceClient:
             auth: Authentication credentials
             verify_ssl: Whether to verify SSL certificates
             timeout: Request timeout in seconds
+            session: Shared session whose connection pool should be reused
         """
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+        self.session = session or requests.Session()
         self.session.auth = auth
         self.session.verify = verify_ssl
         self.timeout = timeout
+
+    def list_nodes(self, spec: Optional[str] = None, page: Optional[int] = None,
+                   page_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """One GET /nodes page, with the same arguments as the SDK's NodesClient.list_nodes."""
+        url = urljoin(f"{self.base_url}/", "nodes")
+        params = {'spec': spec, 'page': page, 'page.size': page_size}
+        logger.debug(f"Fetching nodes page {page} from: {url} (spec={spec})")
+        response = self.session.get(url, params={k: v for k, v in params.items() if v is not None},
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        batch = response.json()
+        if not isinstance(batch, list):
+            raise ValueError(f"Unexpected response format: {batch}")
+        return batch
+
+    def iter_nodes(self, node_types: Tuple[str, ...] = DISCOVERY_NODE_TYPES,
+                   page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Stream nodes of the given product types from /nodes, page by page.
+
+        The type filter is applied server-side with a spec predicate, so only the
+        matching nodes are transferred instead of every network interface.
+
+        Yields:
+            Node objects as returned by the API
+        """
+        return iter_nodes_by_type(self, list(node_types), page_size)
+
+    def get_nodes_filtered(self, page_size: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get ANVIL and DSX nodes with management IP addresses via the filtered /nodes listing.
+
+        Returns:
+            List of node objects in the same format as get_nodes()
+        """
+        nodes = []
+        for node in self.iter_nodes(DISCOVERY_NODE_TYPES, page_size):
+            node_name = node.get('name')
+            node_type = node.get('productNodeType')
+            # Re-check the type in case the server does not support the spec predicate
+            if node_type not in DISCOVERY_NODE_TYPES or not node_name:
+                continue
+            ip_address = (node.get('mgmtIpAddress') or {}).get('address')
+            if ip_address:
+                nodes.append({
+                    'name': node_name,
+                    'type': node_type,
+                    'ip_address': ip_address,
+                    'node_data': node
+                })
+        logger.info(f"Found {len(nodes)} ANVIL/DSX nodes with management IPs via filtered node listing")
+        return nodes
+
+    def discover(self, method: str = 'nodes') -> List[Dict[str, Any]]:
+        """
+        Discover ANVIL/DSX nodes with the given method, falling back to the
+        network-interfaces listing if the filtered node listing fails.
+        """
+        if method == 'nodes':
+            try:
+                return self.get_nodes_filtered()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"Filtered node listing failed ({e}); falling back to network interfaces")
+        return self.get_nodes()
         
     def get_nodes(self) -> List[Dict[str, Any]]:
         """
@@ -198,7 +321,157 @@ class HammerspaceClient:
                     logger.error(f"Could not parse response body: {parse_error}")
             raise
 
-def discover_nodes(config: Dict[str, Any]) -> Dict[str, Any]:
+class DiscoveryStateCache:
+    """
+    Persisted per-cluster discovery results with a TTL.
+
+    Clusters discovered less than ttl_seconds ago are served from the state file without
+    an API call. The fingerprint of the last written output is kept as well, so an
+    unchanged inventory can skip all downstream regeneration. With no path the state
+    is only kept in memory.
+    """
+
+    def __init__(self, path: Optional[str], ttl_seconds: float = DEFAULT_STATE_TTL):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.state: Dict[str, Any] = {'clusters': {}, 'output_fingerprint': None}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.state.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable discovery state {path}: {e}")
+
+    @staticmethod
+    def node_fingerprint(nodes: List[Dict[str, Any]]) -> str:
+        """Hash of the sorted (name, ip, type) tuples of a node list."""
+        key = sorted((n.get('name') or '', n.get('ip_address') or '', n.get('type') or '') for n in nodes)
+        return hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+
+    def cached_nodes(self, api_url: str, allow_stale: bool = False) -> Optional[List[Dict[str, Any]]]:
+        entry = self.state['clusters'].get(api_url)
+        if not entry:
+            return None
+        if allow_stale or time.time() - entry.get('discovered_at', 0) < self.ttl_seconds:
+            return entry['nodes']
+        return None
+
+    def record(self, api_url: str, nodes: List[Dict[str, Any]]) -> bool:
+        """Store a cluster's nodes. Returns True if the node list differs from the previous one."""
+        stripped = [{'name': n.get('name'), 'type': n.get('type'), 'ip_address': n.get('ip_address')} for n in nodes]
+        fingerprint = self.node_fingerprint(stripped)
+        previous = self.state['clusters'].get(api_url, {})
+        self.state['clusters'][api_url] = {
+            'nodes': stripped,
+            'node_count': len(stripped),
+            'fingerprint': fingerprint,
+            'discovered_at': time.time()
+        }
+        # Cheap check first: a different count always means a change
+        return previous.get('node_count') != len(stripped) or previous.get('fingerprint') != fingerprint
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def create_pooled_session(pool_size: int) -> requests.Session:
+    """Create a session whose connection pool can keep a connection open to every cluster."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def discover_cluster(endpoint: Dict[str, Any], auth: HTTPBasicAuth, verify_ssl: bool,
+                     session: requests.Session, method: str = 'nodes') -> Dict[str, Any]:
+    """
+    Discover the nodes of a single cluster, timing the request.
+
+    Returns:
+        Dict with the endpoint 'name' and 'api_url', 'nodes', 'latency_seconds' and 'error'
+    """
+    start = time.monotonic()
+    result = {'name': endpoint['name'], 'api_url': endpoint['api_url'], 'nodes': [], 'error': None}
+    try:
+        client = HammerspaceClient(endpoint['api_url'], auth, verify_ssl, endpoint['timeout'], session=session)
+        result['nodes'] = client.discover(method)
+    except Exception as e:
+        result['error'] = str(e)
+    result['latency_seconds'] = time.monotonic() - start
+    return result
+
+def discover_all_clusters(config: Dict[str, Any], auth: HTTPBasicAuth, max_workers: int = 16,
+                          cache: Optional[DiscoveryStateCache] = None,
+                          method: str = 'nodes') -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Discover nodes from every configured cluster concurrently.
+
+    Args:
+        config: The configuration dictionary (with normalized clusters)
+        auth: Authentication credentials
+        max_workers: Maximum number of clusters queried at once
+        cache: Discovery state; clusters with fresh entries are not queried, and failed
+               clusters fall back to their last known nodes
+        method: 'nodes' (filtered /nodes listing) or 'interfaces' (full /network-interfaces listing)
+
+    Returns:
+        Tuple of (nodes merged across clusters and deduplicated by IP, per-cluster results).
+        Every node carries its endpoint's 'cluster' name and configured 'site' (or None).
+    """
+    endpoints = get_cluster_api_urls(config)
+    if not endpoints:
+        return [], []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(endpoints)
+    pending = []
+    for index, endpoint in enumerate(endpoints):
+        cached = cache.cached_nodes(endpoint['api_url']) if cache else None
+        if cached is not None:
+            results[index] = {'name': endpoint['name'], 'api_url': endpoint['api_url'], 'nodes': cached,
+                              'error': None, 'latency_seconds': 0.0, 'cached': True}
+        else:
+            pending.append(index)
+
+    if pending:
+        verify_ssl = config.get('hammerspace', {}).get('ssl_verify', True)
+        session = create_pooled_session(min(len(pending), max_workers))
+        # Plain requests.Session is safe to share here: every request carries its own URL and timeout
+        with ThreadPoolExecutor(max_workers=min(len(pending), max_workers)) as pool:
+            fetched = pool.map(lambda i: discover_cluster(endpoints[i], auth, verify_ssl, session, method), pending)
+            for index, result in zip(pending, fetched):
+                results[index] = result
+
+    nodes = []
+    seen_ips = set()
+    for endpoint, result in zip(endpoints, results):
+        if result.get('cached'):
+            logger.info(f"Using cached discovery of {result['name']} ({len(result['nodes'])} nodes)")
+        elif cache and not result['error']:
+            if cache.record(result['api_url'], result['nodes']):
+                logger.info(f"Node inventory of {result['name']} changed")
+        elif cache and result['error']:
+            stale = cache.cached_nodes(result['api_url'], allow_stale=True)
+            if stale is not None:
+                logger.warning(f"Discovery from {result['name']} failed ({result['error']}); using last known nodes")
+                result['nodes'], result['error'] = stale, None
+        if result['error']:
+            logger.warning(f"Discovery from {result['name']} failed after {result['latency_seconds']:.2f}s: {result['error']}")
+            continue
+        logger.info(f"Discovered {len(result['nodes'])} nodes from {result['name']} in {result['latency_seconds']:.2f}s")
+        for node in result['nodes']:
+            # Several cluster IPs may belong to the same cluster; the first one wins
+            if node['ip_address'] in seen_ips:
+                continue
+            seen_ips.add(node['ip_address'])
+            nodes.append({**node, 'cluster': result['name'], 'site': endpoint.get('site')})
+    return nodes, results
+
+def discover_nodes(config: Dict[str, Any], max_workers: int = 16,
+                   cache: Optional[DiscoveryStateCache] = None, method: str = 'nodes') -> Dict[str, Any]:
     """
     Discover nodes from Hammerspace clusters.
     
@@ -212,30 +485,27 @@ def discover_nodes(config: Dict[str, Any]) -> Dict[str, Any]:
     config = config.copy()
     config['clusters'] = normalize_clusters(config.get('clusters', []))
     
-    # Get credentials and API URL
+    # Get credentials and cluster API URLs
     auth = get_hs_credentials(config)
-    api_url = get_hs_api_url(config)
+    endpoints = get_cluster_api_urls(config)
     
     logger.debug(f"Auth object: {'Present' if auth else 'None'}")
-    logger.debug(f"API URL: {api_url}")
+    logger.debug(f"API URLs: {[e['api_url'] for e in endpoints]}")
     
-    if not auth or not api_url:
+    if not auth or not endpoints:
         logger.warning("Skipping node discovery: Missing credentials or API URL")
         if not auth:
             logger.warning("No authentication credentials found")
-        if not api_url:
-            logger.warning("No API URL found in config")
+        if not endpoints:
+            logger.warning("No API URL or clusters found in config")
         return config
     
     try:
-        # Initialize client
-        verify_ssl = config.get('hammerspace', {}).get('ssl_verify', True)
-        timeout = config.get('hammerspace', {}).get('timeout', 30)
-        client = HammerspaceClient(api_url, auth, verify_ssl, timeout)
-        
-        # Get nodes
-        logger.info(f"Discovering nodes from {api_url}")
-        nodes = client.get_nodes()
+        # Query all clusters concurrently
+        logger.info(f"Discovering nodes from {len(endpoints)} cluster endpoint(s)")
+        start = time.monotonic()
+        nodes, _ = discover_all_clusters(config, auth, max_workers, cache, method)
+        logger.info(f"Cluster discovery finished in {time.monotonic() - start:.2f}s")
         
         if not nodes:
             logger.warning("No nodes discovered")
@@ -265,6 +535,7 @@ def discover_nodes(config: Dict[str, Any]) -> Dict[str, Any]:
                     'name': node_name,
                     'ip': node_ip,
                     'type': node_type,
+                    'cluster': node.get('cluster'),
                     'discovered': True
                 })
                 existing_ips.add(node_ip)
@@ -298,6 +569,121 @@ def discover_nodes(config: Dict[str, Any]) -> Dict[str, Any]:
     
     return config
 
+def build_file_sd_targets(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build Prometheus file_sd target groups from discovered nodes.
+
+    Each node gets one group per exporter port, so targets on the same node keep distinct
+    `instance` labels. Groups are sorted, so an unchanged inventory yields identical output.
+    Nodes with a 'site' also get a `site` label.
+
+    Args:
+        nodes: Discovered nodes as returned by discover_all_clusters
+
+    Returns:
+        List of {'targets': [...], 'labels': {...}} groups
+    """
+    groups = []
+    for node in sorted(nodes, key=lambda n: (n.get('cluster') or '', n.get('name') or '', n.get('ip_address') or '')):
+        ip = node.get('ip_address')
+        if not ip:
+            continue
+        labels = {
+            'cluster': node.get('cluster') or '',
+            'node': node.get('name') or ip,
+            'node_type': (node.get('type') or 'unknown').lower()
+        }
+        if node.get('site'):
+            labels['site'] = node['site']
+        for exporter, port in NODE_PORTS.items():
+            groups.append({'targets': [f"{ip}:{port}"], 'labels': {**labels, 'exporter': exporter}})
+    return groups
+
+def write_file_sd(path: str, groups: List[Dict[str, Any]]) -> bool:
+    """
+    Atomically replace a file_sd target file, but only if its content changes.
+
+    Prometheus watches the file and reloads it on every write, so unchanged targets
+    are not rewritten. The new content is written to a temporary file in the same
+    directory and renamed over the target, so Prometheus never reads a partial file.
+
+    Returns:
+        True if the file was written
+    """
+    content = json.dumps(groups, indent=2, sort_keys=True) + '\n'
+    try:
+        with open(path, 'r') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # A dotfile, so a `*.json` file_sd glob never picks up the partial file
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+def run_discovery_daemon(config: Dict[str, Any], file_sd_path: str, interval: float = DEFAULT_DAEMON_INTERVAL,
+                         max_workers: int = 16, cache: Optional[DiscoveryStateCache] = None,
+                         method: str = 'nodes', stop_event: Optional[threading.Event] = None) -> int:
+    """
+    Re-discover all clusters every `interval` seconds and keep a file_sd target file current.
+
+    Clusters that fail keep their last known nodes (from the cache), so a transient API
+    error does not remove targets. If nothing could be discovered the file is left as is.
+
+    Args:
+        config: The configuration dictionary
+        file_sd_path: Path of the file_sd JSON target file
+        interval: Seconds between discovery runs
+        max_workers: Maximum number of clusters queried at once
+        cache: Discovery state (in-memory if None); its TTL should not exceed the interval
+        method: Discovery method, see DISCOVERY_METHODS
+        stop_event: Set to stop the loop (SIGTERM and SIGINT set it as well)
+
+    Returns:
+        Process exit code
+    """
+    config = config.copy()
+    config['clusters'] = normalize_clusters(config.get('clusters', []))
+    auth = get_hs_credentials(config)
+    endpoints = get_cluster_api_urls(config)
+    if not auth or not endpoints:
+        logger.error("Cannot run discovery daemon: Missing credentials or API URL")
+        return 1
+
+    cache = cache or DiscoveryStateCache(None, 0)
+    stop_event = stop_event or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda signum, frame: stop_event.set())
+
+    logger.info(f"Watching {len(endpoints)} cluster endpoint(s) every {interval:g}s; targets in {file_sd_path}")
+    while not stop_event.is_set():
+        start = time.monotonic()
+        try:
+            nodes, results = discover_all_clusters(config, auth, max_workers, cache, method)
+            failed = [r['name'] for r in results if r['error']]
+            if not nodes and failed:
+                logger.warning(f"No nodes discovered ({len(failed)} cluster(s) failed); keeping existing targets")
+            else:
+                groups = build_file_sd_targets(nodes)
+                if write_file_sd(file_sd_path, groups):
+                    logger.info(f"✓ Wrote {len(groups)} targets for {len(nodes)} nodes to {file_sd_path}")
+                else:
+                    logger.debug("Targets unchanged")
+            cache.save()
+        except Exception as e:
+            logger.error(f"Discovery run failed: {e}", exc_info=True)
+        stop_event.wait(max(0.0, interval - (time.monotonic() - start)))
+    logger.info("Discovery daemon stopped")
+    return 0
+
 def generate_prometheus_config(nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Generate Prometheus scrape configuration from discovered nodes.
@@ -338,13 +724,29 @@ def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Discover nodes in Hammerspace clusters')
     parser.add_argument('--config', required=True, help='Path to the configuration file')
-    parser.add_argument('--output', required=True, help='Path to the output file')
+    parser.add_argument('--output', help='Path to the output file (required unless --daemon)')
     parser.add_argument('--username', help='Hammerspace API username (overrides config)')
     parser.add_argument('--password', help='Hammerspace API password (overrides config)')
     parser.add_argument('--api-url', help='Hammerspace API URL (overrides config)')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     parser.add_argument('--prometheus-output', help='Path to output Prometheus configuration')
+    parser.add_argument('--workers', type=int, default=16, help='Maximum number of clusters queried concurrently')
+    parser.add_argument('--state-file', help='Discovery state file; enables cached, incremental discovery')
+    parser.add_argument('--state-ttl', type=float, default=DEFAULT_STATE_TTL,
+                        help=f'Seconds a cluster\'s cached discovery stays valid (default: {DEFAULT_STATE_TTL})')
+    parser.add_argument('--force-refresh', action='store_true', help='Ignore cached discovery results')
+    parser.add_argument('--discovery-method', choices=DISCOVERY_METHODS, default='nodes',
+                        help='nodes: filtered /nodes listing (default); interfaces: full /network-interfaces listing')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and rewrite the --file-sd-output target file whenever targets change')
+    parser.add_argument('--interval', type=float, default=DEFAULT_DAEMON_INTERVAL,
+                        help=f'Seconds between discovery runs in daemon mode (default: {DEFAULT_DAEMON_INTERVAL})')
+    parser.add_argument('--file-sd-output', help='Path of the Prometheus file_sd JSON target file written in daemon mode')
     args = parser.parse_args()
+    if args.daemon and not args.file_sd_output:
+        parser.error('--daemon requires --file-sd-output')
+    if not args.daemon and not args.output:
+        parser.error('--output is required')
 
     # Configure logging level
     logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO,
@@ -362,8 +764,29 @@ def main():
         if args.api_url:
             config.setdefault('hammerspace', {})['api_url'] = args.api_url
         
+        cache = None
+        if args.daemon:
+            # Every run queries the clusters; the state only supplies last known nodes on failure
+            cache = DiscoveryStateCache(args.state_file, 0)
+            return run_discovery_daemon(config, args.file_sd_output, args.interval, args.workers,
+                                        cache, args.discovery_method)
+        if args.state_file:
+            cache = DiscoveryStateCache(args.state_file, 0 if args.force_refresh else args.state_ttl)
+
         # Discover nodes
-        config = discover_nodes(config)
+        config = discover_nodes(config, max_workers=args.workers, cache=cache, method=args.discovery_method)
+
+        if cache:
+            fingerprint = hashlib.sha256(
+                yaml.dump(config, default_flow_style=False, sort_keys=True).encode('utf-8')).hexdigest()
+            outputs = [args.output] + ([args.prometheus_output] if args.prometheus_output else [])
+            unchanged = (fingerprint == cache.state.get('output_fingerprint')
+                         and all(os.path.exists(path) for path in outputs))
+            cache.state['output_fingerprint'] = fingerprint
+            cache.save()
+            if unchanged:
+                logger.info(f"✓ Discovered inventory unchanged; keeping {args.output}")
+                return EXIT_UNCHANGED
         
         # Save updated config
         with open(args.output, 'w') as f:
@@ -408,4 +831,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
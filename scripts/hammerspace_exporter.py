@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Prometheus Exporter for Hammerspace API Metrics
+
+Collects cluster state, per-share and per-volume capacity, performance stats and
+task/event counts through the Hammerspace SDK and serves them on /metrics.
+
+Collection runs concurrently in a background loop and the rendered exposition is
+cached, so scrapes are served from memory and never block on the API.
+"""
+
+import os
+import sys
+import math
+import re
+import time
+import argparse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+import yaml
+
+# Set up basic logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Add the SDK directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+try:
+    from hammerspace import HammerspaceApiClient, columnar
+except ImportError:
+    print("Error: Could not import Hammerspace SDK. Make sure it's installed.")
+    sys.exit(1)
+
+DEFAULT_PORT = 9180
+
+# A sample is (metric name, labels, value); metadata maps metric name -> (type, help)
+Sample = Tuple[str, Dict[str, str], float]
+
+METRIC_METADATA = {
+    'hammerspace_up': ('gauge', 'Whether the last collection from the Hammerspace API succeeded.'),
+    'hammerspace_cluster_info': ('gauge', 'Hammerspace cluster information.'),
+    'hammerspace_cluster_state': ('gauge', 'Numeric and boolean fields of the cluster state (GET /cntl/state).'),
+    'hammerspace_capacity': ('gauge', 'Latest capacity metric value per object (GET /metrics/capacity).'),
+    'hammerspace_performance': ('gauge', 'Latest performance stat value (GET /reports/stats/performance).'),
+    'hammerspace_objects': ('gauge', 'Number of objects of each type.'),
+    'hammerspace_tasks': ('gauge', 'Number of tasks by state.'),
+    'hammerspace_events': ('gauge', 'Number of events by severity.'),
+    'hammerspace_exporter_collect_duration_seconds': ('gauge', 'Duration of the last collection cycle.'),
+    'hammerspace_exporter_last_success_timestamp_seconds': ('gauge', 'Unix time of the last successful collection.'),
+    'hammerspace_exporter_collect_errors_total': ('counter', 'Collection steps that failed.'),
+}
+
+
+class PartialCollectionError(Exception):
+    """A collection step that failed in part; carries the samples it did collect."""
+
+    def __init__(self, message: str, samples: List[Sample]):
+        super().__init__(message)
+        self.samples = samples
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Load and parse the config.yaml file."""
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def entity_name_uuid(entity: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the (name, uuid) of an API entity."""
+    uuid = (entity.get('uoid') or {}).get('uuid') or entity.get('uuid') or ''
+    return str(entity.get('name') or uuid), str(uuid)
+
+
+def latest_values(series: List[Dict[str, Any]]) -> List[Tuple[Optional[str], Dict[str, Any], str, float]]:
+    """Return (serie name, tags, field, latest non-NaN value) for every numeric column of decoded series."""
+    latest = []
+    for serie in series:
+        for field, values in serie['columns'].items():
+            if field == columnar.TIME_COLUMN or not values or not isinstance(values[0], float):
+                continue
+            for value in reversed(values):
+                if not math.isnan(value):
+                    latest.append((serie.get('name'), serie.get('tags') or {}, field, value))
+                    break
+    return latest
+
+
+def sanitize_label_name(name: str) -> str:
+    name = re.sub(r'[^a-zA-Z0-9_]', '_', str(name))
+    return name if name and not name[0].isdigit() else f"_{name}"
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render_exposition(samples: List[Sample]) -> bytes:
+    """Render samples in the Prometheus text exposition format, grouped by metric name."""
+    by_name: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_name.setdefault(sample[0], []).append(sample)
+    lines = []
+    for name in sorted(by_name):
+        metric_type, help_text = METRIC_METADATA.get(name, ('gauge', name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for _, labels, value in by_name[name]:
+            if labels:
+                label_str = ','.join(f'{k}="{escape_label_value(v)}"' for k, v in sorted(labels.items()))
+                lines.append(f"{name}{{{label_str}}} {value!r}")
+            else:
+                lines.append(f"{name} {value!r}")
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class HammerspaceCollector:
+    """Collects Hammerspace metrics concurrently and keeps the rendered result cached."""
+
+    def __init__(self, client: HammerspaceApiClient, cluster: str, max_workers: int = 8,
+                 capacity_duration: str = '5m', stats_duration: str = '5m'):
+        self.client = client
+        self.cluster = cluster
+        self.max_workers = max_workers
+        self.capacity_duration = capacity_duration
+        self.stats_duration = stats_duration
+        self.cluster_uuid: Optional[str] = None
+        self.errors_total = 0
+        self.last_success = 0.0
+        self._snapshot = render_exposition([('hammerspace_up', {'cluster': cluster}, 0.0)])
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> bytes:
+        # Reading a reference is atomic; scrapes never wait on a collection
+        return self._snapshot
+
+    def _labels(self, **labels: Any) -> Dict[str, str]:
+        return {'cluster': self.cluster, **{k: str(v) for k, v in labels.items() if v is not None}}
+
+    def collect_cluster_state(self) -> List[Sample]:
+        state = self.client.cntl.get_cluster_state() or {}
+        self.cluster_uuid = entity_name_uuid(state)[1] or self.cluster_uuid
+        samples = [('hammerspace_cluster_info', self._labels(
+            name=state.get('name', ''), version=state.get('softwareVersion', state.get('version', ''))), 1.0)]
+        for field, value in state.items():
+            if isinstance(value, bool):
+                samples.append(('hammerspace_cluster_state', self._labels(field=field), float(value)))
+            elif isinstance(value, (int, float)):
+                samples.append(('hammerspace_cluster_state', self._labels(field=field), float(value)))
+        return samples
+
+    def collect_capacity(self) -> List[Sample]:
+        objects = self.client.capacity.list_objects()
+        samples = [('hammerspace_objects', self._labels(object_type=t), float(len(e))) for t, e in objects.items()]
+        errors: List[str] = []
+        series = self.client.capacity.collect(
+            objects=objects, preceding_duration=self.capacity_duration, max_workers=self.max_workers, errors=errors)
+        for _, tags, field, value in latest_values(series):
+            labels = self._labels(
+                object_type=tags.get('object_type'), name=tags.get('object_name'), uuid=tags.get('object_uuid'), field=field)
+            samples.append(('hammerspace_capacity', labels, value))
+        if errors:
+            raise PartialCollectionError(f"{len(errors)} capacity requests failed", samples)
+        return samples
+
+    def collect_performance(self) -> List[Sample]:
+        if not self.cluster_uuid:
+            self.cluster_uuid = entity_name_uuid(self.client.cntl.get_cluster_state() or {})[1]
+        response = self.client.reports.get_stats_report(
+            'performance', 'CLUSTER', self.cluster_uuid, preceding_duration=self.stats_duration)
+        samples = []
+        for serie, tags, field, value in latest_values(columnar.convert(response, 'columns')):
+            labels = {sanitize_label_name(f"tag_{k}"): str(v) for k, v in tags.items()}
+            labels.update(self._labels(series=serie or '', field=field))
+            samples.append(('hammerspace_performance', labels, value))
+        return samples
+
+    def collect_tasks(self) -> List[Sample]:
+        counts: Dict[str, int] = {}
+        for task in self.client.tasks.get() or []:
+            state = self.client.get_task_state(task) or 'UNKNOWN'
+            counts[state] = counts.get(state, 0) + 1
+        return [('hammerspace_tasks', self._labels(state=s), float(n)) for s, n in sorted(counts.items())]
+
+    def collect_events(self) -> List[Sample]:
+        summary = self.client.events.get_summary(group_by='severity') or {}
+        # The summary is a {group: count} mapping or a list of {name/key, count} entries
+        if isinstance(summary, list):
+            items = [(e.get('name', e.get('key', e.get('severity'))), e.get('count', e.get('value', 0)))
+                     for e in summary if isinstance(e, dict)]
+        else:
+            items = list(summary.items())
+        return [('hammerspace_events', self._labels(severity=k), float(v))
+                for k, v in items if isinstance(v, (int, float))]
+
+    def collect(self) -> None:
+        """Run one collection cycle concurrently and swap in the freshly rendered snapshot."""
+        with self._lock:
+            start = time.time()
+            samples: List[Sample] = []
+            errors = 0
+            # Capacity fans out over its own bounded pool (CapacityClient.collect)
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                futures = [
+                    pool.submit(self.collect_capacity),
+                    pool.submit(self.collect_cluster_state),
+                    pool.submit(self.collect_performance),
+                    pool.submit(self.collect_tasks),
+                    pool.submit(self.collect_events),
+                ]
+                for future in futures:
+                    try:
+                        samples.extend(future.result())
+                    except PartialCollectionError as e:
+                        logger.warning(f"Collection step failed in part: {e}")
+                        samples.extend(e.samples)
+                        errors += 1
+                    except Exception as e:
+                        logger.warning(f"Collection step failed: {e}")
+                        errors += 1
+
+            duration = time.time() - start
+            self.errors_total += errors
+            up = 1.0 if errors == 0 else 0.0
+            if up:
+                self.last_success = time.time()
+            samples.extend([
+                ('hammerspace_up', self._labels(), up),
+                ('hammerspace_exporter_collect_duration_seconds', self._labels(), duration),
+                ('hammerspace_exporter_last_success_timestamp_seconds', self._labels(), self.last_success),
+                ('hammerspace_exporter_collect_errors_total', self._labels(), float(self.errors_total)),
+            ])
+            self._snapshot = render_exposition(samples)
+            logger.info(f"Collected {len(samples)} samples in {duration:.2f}s ({errors} errors)")
+
+    def run_forever(self, interval: float, stop_event: threading.Event) -> None:
+        while not stop_event.is_set():
+            try:
+                self.collect()
+            except Exception as e:
+                logger.error(f"Collection cycle failed: {e}", exc_info=True)
+            stop_event.wait(interval)
+
+
+def make_handler(collector: HammerspaceCollector):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] == '/metrics':
+                body = collector.snapshot
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            elif self.path == '/healthz':
+                body = b'ok\n'
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain')
+            else:
+                body = b'Not found\n'
+                self.send_response(404)
+                self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return MetricsHandler
+
+
+def main():
+    """Main entry point for the exporter."""
+    parser = argparse.ArgumentParser(description='Prometheus exporter for Hammerspace API metrics')
+    parser.add_argument('--config', default='config/config.yaml', help='Path to the configuration file')
+    parser.add_argument('--api-url', help='Hammerspace API URL (overrides config)')
+    parser.add_argument('--cluster-name', help='Value of the "cluster" label (default: from cluster state)')
+    parser.add_argument('--listen-address', default='0.0.0.0', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--interval', type=float, default=60, help='Seconds between collection cycles')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent API requests per collection cycle')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+
+    config = load_config(args.config) if os.path.exists(args.config) else {}
+    hs_config = config.get('hammerspace', {})
+    api_url = args.api_url or hs_config.get('api_url') or os.getenv('HS_API_URL')
+    username = hs_config.get('username') or os.getenv('HS_USERNAME')
+    password = hs_config.get('password') or os.getenv('HS_PASSWORD')
+    if not api_url or not username or not password:
+        logger.error("Missing Hammerspace API URL or credentials")
+        return 1
+
+    client = HammerspaceApiClient(
+        base_url=api_url, username=username, password=password,
+        verify_ssl=hs_config.get('ssl_verify', True), timeout=hs_config.get('timeout', 30)
+    )
+    state = {}
+    try:
+        state = client.cntl.get_cluster_state() or {}
+    except Exception as e:
+        logger.warning(f"Could not read cluster state: {e}")
+    cluster_name = args.cluster_name or state.get('name') or api_url
+
+    collector = HammerspaceCollector(client, cluster_name, max_workers=args.workers)
+    collector.cluster_uuid = entity_name_uuid(state)[1] or None
+    stop_event = threading.Event()
+    threading.Thread(target=collector.run_forever, args=(args.interval, stop_event), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.listen_address, args.port), make_handler(collector))
+    logger.info(f"✓ Serving Hammerspace metrics on http://{args.listen_address}:{args.port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Prometheus HTTP Service Discovery for Hammerspace Nodes
+
+Serves the ANVIL and DSX nodes of every configured cluster as Prometheus
+http_sd_configs targets (ports 9100-9103) with cluster, node_type and site labels.
+
+Clusters are re-listed concurrently through the SDK in a background loop and the
+JSON response is rendered once per change, with an ETag. Requests carrying a
+matching If-None-Match header are answered with 304 and no body.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+# Set up basic logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Add the SDK directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+try:
+    from hammerspace import HammerspaceApiClient
+    from get_nodes import iter_nodes_by_type
+except ImportError:
+    print("Error: Could not import Hammerspace SDK. Make sure it's installed.")
+    sys.exit(1)
+
+from discover_nodes import (DISCOVERY_NODE_TYPES, ConfigError, build_file_sd_targets, get_cluster_api_urls,
+                            get_hs_credentials, load_config, normalize_clusters)
+
+DEFAULT_PORT = 9190
+TARGETS_PATH = '/targets'
+
+
+def local_site_name(client: HammerspaceApiClient) -> Optional[str]:
+    """Name of the cluster's local site (the first site if none is flagged local)."""
+    sites = client.sites.get() or []
+    if isinstance(sites, dict):
+        sites = [sites]
+    for site in sites:
+        if site.get('local') or site.get('isLocal'):
+            return site.get('name')
+    return sites[0].get('name') if sites else None
+
+
+class TargetCache:
+    """Per-cluster node lists, refreshed concurrently, rendered into one http_sd response."""
+
+    def __init__(self, endpoints: List[Dict[str, Any]], username: str, password: str,
+                 verify_ssl: bool = True, max_workers: int = 16):
+        self.endpoints = endpoints
+        self.max_workers = max_workers
+        self.clients = {
+            e['api_url']: HammerspaceApiClient(base_url=e['api_url'], username=username, password=password,
+                                               verify_ssl=verify_ssl, timeout=e['timeout'])
+            for e in endpoints
+        }
+        self.nodes: Dict[str, List[Dict[str, Any]]] = {}
+        self.sites: Dict[str, Optional[str]] = {e['api_url']: e.get('site') for e in endpoints}
+        self._lock = threading.Lock()
+        self._body = b'[]'
+        self._etag = self.make_etag(self._body)
+        self.synced = threading.Event()
+        self.last_refresh = 0.0
+        self.errors_total = 0
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    @property
+    def snapshot(self) -> Tuple[bytes, str]:
+        with self._lock:
+            return self._body, self._etag
+
+    def discover(self, endpoint: Dict[str, Any]) -> List[Dict[str, Any]]:
+        client = self.clients[endpoint['api_url']]
+        if not self.sites.get(endpoint['api_url']):
+            try:
+                self.sites[endpoint['api_url']] = local_site_name(client)
+            except Exception as e:
+                logger.debug(f"Could not read site of {endpoint['name']}: {e}")
+        site = self.sites.get(endpoint['api_url'])
+        nodes = []
+        for node in iter_nodes_by_type(client.nodes, list(DISCOVERY_NODE_TYPES)):
+            node_type = (node.get('productNodeType') or '').upper()
+            ip_address = (node.get('mgmtIpAddress') or {}).get('address')
+            # Re-check the type in case the server does not support the spec predicate
+            if node_type not in DISCOVERY_NODE_TYPES or not node.get('name') or not ip_address:
+                continue
+            nodes.append({'name': node['name'], 'type': node_type, 'ip_address': ip_address,
+                          'cluster': endpoint['name'], 'site': site})
+        return nodes
+
+    def refresh(self) -> bool:
+        """
+        Re-list every cluster concurrently. Clusters that fail keep their previous nodes.
+
+        Returns:
+            True if the served targets changed
+        """
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(len(self.endpoints), self.max_workers) or 1) as pool:
+            futures = {e['api_url']: (e, pool.submit(self.discover, e)) for e in self.endpoints}
+            for api_url, (endpoint, future) in futures.items():
+                try:
+                    self.nodes[api_url] = future.result()
+                except Exception as e:
+                    self.errors_total += 1
+                    logger.warning(f"Listing nodes of {endpoint['name']} failed: {e}; keeping "
+                                   f"{len(self.nodes.get(api_url, []))} known nodes")
+
+        # Several endpoints may belong to one cluster; the first one wins, as in discover_nodes.py
+        merged = []
+        seen_ips = set()
+        for endpoint in self.endpoints:
+            for node in self.nodes.get(endpoint['api_url'], []):
+                if node['ip_address'] not in seen_ips:
+                    seen_ips.add(node['ip_address'])
+                    merged.append(node)
+        body = json.dumps(build_file_sd_targets(merged), sort_keys=True, separators=(',', ':')).encode('utf-8')
+        etag = self.make_etag(body)
+        with self._lock:
+            changed = etag != self._etag
+            self._body, self._etag = body, etag
+        self.last_refresh = time.time()
+        self.synced.set()
+        if changed:
+            logger.info(f"Targets changed: {len(merged)} nodes from {len(self.endpoints)} endpoint(s) "
+                        f"in {time.monotonic() - start:.2f}s")
+        return changed
+
+    def run_forever(self, interval: float, stop_event: threading.Event) -> None:
+        while not stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Target refresh failed: {e}", exc_info=True)
+            stop_event.wait(interval)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches the current ETag (weak comparison)."""
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(',')]
+    return '*' in candidates or etag in (c[2:] if c.startswith('W/') else c for c in candidates)
+
+
+def make_handler(cache: TargetCache):
+    class ServiceDiscoveryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?')[0]
+            if path == TARGETS_PATH:
+                body, etag = cache.snapshot
+                if etag_matches(self.headers.get('If-None-Match'), etag):
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('ETag', etag)
+            elif path == '/healthz':
+                ready = cache.synced.is_set()
+                body = b'ok\n' if ready else b'not synced\n'
+                self.send_response(200 if ready else 503)
+                self.send_header('Content-Type', 'text/plain')
+            else:
+                body = b'Not found\n'
+                self.send_response(404)
+                self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return ServiceDiscoveryHandler
+
+
+def main():
+    """Main entry point for the service discovery server."""
+    parser = argparse.ArgumentParser(description='Prometheus HTTP service discovery for Hammerspace nodes')
+    parser.add_argument('--config', default='config/config.yaml', help='Path to the configuration file')
+    parser.add_argument('--listen-address', default='0.0.0.0', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--interval', type=float, default=60, help='Seconds between node listings')
+    parser.add_argument('--workers', type=int, default=16, help='Maximum number of clusters queried concurrently')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+
+    try:
+        config = load_config(args.config)
+    except ConfigError as e:
+        logger.error(f"Configuration error: {e}")
+        return 1
+    config['clusters'] = normalize_clusters(config.get('clusters', []))
+    auth = get_hs_credentials(config)
+    endpoints = get_cluster_api_urls(config)
+    if not auth or not endpoints:
+        logger.error("Missing Hammerspace API URL or credentials")
+        return 1
+
+    cache = TargetCache(endpoints, auth.username, auth.password,
+                        verify_ssl=config['hammerspace'].get('ssl_verify', True), max_workers=args.workers)
+    stop_event = threading.Event()
+    threading.Thread(target=cache.run_forever, args=(args.interval, stop_event), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.listen_address, args.port), make_handler(cache))
+    logger.info(f"✓ Serving Hammerspace targets on http://{args.listen_address}:{args.port}{TARGETS_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Loki Push Bridge for Hammerspace Events and Task History
+
+Tails Hammerspace events and task state transitions through the SDK and pushes them
+to Loki's push API (/loki/api/v1/push) as batched, gzip-compressed JSON.
+
+Producers put entries on a bounded queue; when Loki is slow or down the queue fills
+up and the producers block, so polling slows down instead of buffering without limit.
+The event high-water mark is only persisted once Loki has accepted the batch holding
+those events, so a crash or an outage replays them instead of losing them.
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import queue
+import argparse
+import logging
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import requests
+import yaml
+
+# Set up basic logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Add the SDK directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+try:
+    from hammerspace import HammerspaceApiClient
+except ImportError:
+    print("Error: Could not import Hammerspace SDK. Make sure it's installed.")
+    sys.exit(1)
+
+PUSH_PATH = '/loki/api/v1/push'
+TERMINAL_TASK_STATES = {'COMPLETED', 'FAILED', 'CANCELLED'}
+
+# (labels, timestamp in ns, log line)
+Entry = Tuple[Tuple[Tuple[str, str], ...], int, str]
+# An entry plus the API event it came from (None for task transitions), acknowledged after the push
+QueuedEntry = Tuple[Entry, Optional[Dict[str, Any]]]
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Load and parse the config.yaml file."""
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def to_nanos(value: Any) -> int:
+    """Convert an epoch-ms API timestamp to ns, defaulting to now."""
+    if isinstance(value, (int, float)) and value > 0:
+        return int(value) * 1_000_000
+    return time.time_ns()
+
+
+class LokiPusher:
+    """
+    Drains the entry queue into batched, gzip-compressed pushes with retry.
+
+    Pushes failing with 429, 5xx or a connection error are retried with backoff until they
+    succeed, so a Loki outage stalls the bridge instead of losing entries. With max_retries
+    set, a batch still failing after that many attempts stops the pusher and sets the stop
+    event (gave_up is True): later batches are never acknowledged past it, so the persisted
+    high-water mark stays behind its events and a restart replays them.
+    on_pushed receives the events of every batch Loki accepted.
+    """
+
+    def __init__(self, loki_url: str, entries: queue.Queue, batch_size: int = 500,
+                 batch_wait_seconds: float = 2.0, max_retries: Optional[int] = None, timeout: int = 30,
+                 tenant: Optional[str] = None, on_pushed: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                 max_backoff_seconds: float = 60.0):
+        self.push_url = loki_url.rstrip('/') + PUSH_PATH
+        self.entries = entries
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.max_retries = max_retries
+        self.max_backoff_seconds = max_backoff_seconds
+        self.timeout = timeout
+        self.on_pushed = on_pushed
+        self.gave_up = False
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+        if tenant:
+            self.session.headers['X-Scope-OrgID'] = tenant
+        self.pushed = 0
+        self.dropped = 0
+
+    @staticmethod
+    def encode(batch: List[Entry]) -> bytes:
+        """Group entries into one stream per label set and gzip the JSON push body."""
+        streams: Dict[Tuple[Tuple[str, str], ...], List[List[str]]] = {}
+        for labels, ts, line in batch:
+            streams.setdefault(labels, []).append([str(ts), line])
+        body = {'streams': [
+            {'stream': dict(labels), 'values': sorted(values, key=lambda v: int(v[0]))}
+            for labels, values in streams.items()
+        ]}
+        return gzip.compress(json.dumps(body, separators=(',', ':')).encode('utf-8'))
+
+    def push(self, batch: List[Entry], stop_event: Optional[threading.Event] = None) -> Optional[bool]:
+        """
+        Returns:
+            True once Loki accepted the batch, False if Loki rejected it with a 4xx that no
+            retry can fix, None if it was given up (max_retries exhausted, or stopping).
+        """
+        payload = self.encode(batch)
+        delay = min(1.0, self.max_backoff_seconds)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.session.post(self.push_url, data=payload, timeout=self.timeout)
+                if response.status_code < 300:
+                    self.pushed += len(batch)
+                    return True
+                if response.status_code != 429 and response.status_code < 500:
+                    # Other 4xx (bad labels, out-of-order, too old) will not succeed on retry
+                    logger.error(f"Loki rejected batch of {len(batch)} entries: {response.status_code} {response.text[:200]}")
+                    self.dropped += len(batch)
+                    return False
+                logger.warning(f"Loki push returned {response.status_code} (attempt {attempt})")
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Loki push failed: {e} (attempt {attempt})")
+            if self.max_retries is not None and attempt >= self.max_retries:
+                logger.error(f"Giving up on batch of {len(batch)} entries after {attempt} attempts")
+                break
+            if stop_event is not None and stop_event.wait(delay):
+                logger.error(f"Stopping with an unpushed batch of {len(batch)} entries")
+                break
+            if stop_event is None:
+                time.sleep(delay)
+            delay = min(delay * 2, self.max_backoff_seconds)
+        self.dropped += len(batch)
+        return None
+
+    def run(self, stop_event: threading.Event) -> None:
+        while not (stop_event.is_set() and self.entries.empty()):
+            batch: List[QueuedEntry] = []
+            deadline = time.time() + self.batch_wait_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.entries.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            result = self.push([entry for entry, _ in batch], stop_event)
+            if result is None:
+                # Not acknowledged: the events stay behind the persisted high-water mark and
+                # are replayed when the bridge restarts. Acknowledging any later batch would
+                # move the mark past them, so stop here rather than carry on without them.
+                if not stop_event.is_set():
+                    logger.error("Stopping the bridge; restart it to replay the unpushed events")
+                    self.gave_up = True
+                    stop_event.set()
+                return
+            # Delivered, or rejected for good (a retry can never succeed): move past them
+            events = [event for _, event in batch if event is not None]
+            if events and self.on_pushed:
+                self.on_pushed(events)
+            logger.debug(f"Pushed {self.pushed} entries total ({self.dropped} dropped)")
+
+
+class HammerspaceSource:
+    """Produces Loki entries from the events tail and from task state transitions."""
+
+    def __init__(self, client: HammerspaceApiClient, cluster: str, entries: queue.Queue,
+                 state_dir: str, task_poll_seconds: float = 15.0):
+        self.client = client
+        self.cluster = cluster
+        self.entries = entries
+        self.state_dir = state_dir
+        self.task_poll_seconds = task_poll_seconds
+        self.node_types: Dict[str, str] = {}
+
+    def refresh_node_types(self) -> None:
+        """Map node names and uuids to their product node type, for the node_type label."""
+        try:
+            for node in self.client.nodes.list_nodes() or []:
+                node_type = str(node.get('productNodeType') or node.get('nodeType') or 'unknown')
+                for key in (node.get('name'), (node.get('uoid') or {}).get('uuid')):
+                    if key:
+                        self.node_types[key] = node_type
+        except Exception as e:
+            logger.warning(f"Could not list nodes for node_type labels: {e}")
+
+    def node_type_of(self, record: Dict[str, Any]) -> str:
+        for key in ('nodeName', 'node', 'hostName'):
+            value = record.get(key)
+            if isinstance(value, dict):
+                value = value.get('name') or (value.get('uoid') or {}).get('uuid')
+            if value and value in self.node_types:
+                return self.node_types[value]
+        return 'cluster'
+
+    def labels(self, source: str, severity: str, node_type: str) -> Tuple[Tuple[str, str], ...]:
+        # Keep label values low-cardinality: everything else goes into the JSON line
+        return (('cluster', self.cluster), ('job', 'hammerspace-api'), ('node_type', node_type),
+                ('severity', severity.lower() or 'unknown'), ('source', source))
+
+    @property
+    def events_state_file(self) -> str:
+        return os.path.join(self.state_dir, 'events.state.json')
+
+    def commit_events(self, events: List[Dict[str, Any]]) -> None:
+        """Persist the high-water mark of events Loki has accepted (LokiPusher.on_pushed)."""
+        self.client.events.save_tail_state(self.events_state_file, events)
+
+    def run_events(self, stop_event: threading.Event) -> None:
+        # The tail only reads the state file; commit_events writes it after each accepted push
+        for event in self.client.events.tail(state_file=self.events_state_file, stop_event=stop_event,
+                                             save_state=False):
+            labels = self.labels('event', str(event.get('severity') or ''), self.node_type_of(event))
+            # Blocks while the queue is full (backpressure towards the API poller)
+            self.entries.put(((labels, to_nanos(event.get('created')), json.dumps(event, default=str)), event))
+
+    def run_tasks(self, stop_event: threading.Event) -> None:
+        last_states: Dict[str, str] = {}
+        first_poll = True
+        while not stop_event.is_set():
+            try:
+                tasks = self.client.tasks.get() or []
+            except Exception as e:
+                logger.warning(f"Task poll failed: {e}")
+                tasks = []
+            current: Dict[str, str] = {}
+            for task in tasks:
+                task_id = (task.get('uoid') or {}).get('uuid') or task.get('uuid')
+                if not task_id:
+                    continue
+                state = self.client.get_task_state(task) or 'UNKNOWN'
+                current[task_id] = state
+                previous = last_states.get(task_id)
+                # The first poll only records a baseline, so restarts do not replay history
+                if first_poll or previous == state:
+                    continue
+                severity = 'error' if state == 'FAILED' else 'info'
+                line = json.dumps({'task': task_id, 'name': task.get('name'), 'from': previous,
+                                   'to': state, 'detail': task}, default=str)
+                timestamp = task.get('ended') if state in TERMINAL_TASK_STATES else task.get('created')
+                self.entries.put(((self.labels('task', severity, self.node_type_of(task)), to_nanos(timestamp), line), None))
+            last_states = current
+            first_poll = False
+            stop_event.wait(self.task_poll_seconds)
+
+
+def main():
+    """Main entry point for the bridge."""
+    parser = argparse.ArgumentParser(description='Push Hammerspace events and task transitions to Loki')
+    parser.add_argument('--config', default='config/config.yaml', help='Path to the configuration file')
+    parser.add_argument('--api-url', help='Hammerspace API URL (overrides config)')
+    parser.add_argument('--cluster-name', help='Value of the "cluster" label (default: from cluster state)')
+    parser.add_argument('--loki-url', default=os.getenv('LOKI_URL', 'http://loki:3100'), help='Loki base URL')
+    parser.add_argument('--tenant', help='Loki tenant (X-Scope-OrgID header)')
+    parser.add_argument('--state-dir', default='.loki-bridge', help='Directory holding the event high-water mark')
+    parser.add_argument('--batch-size', type=int, default=500, help='Maximum entries per push')
+    parser.add_argument('--batch-wait', type=float, default=2.0, help='Maximum seconds to wait for a batch to fill')
+    parser.add_argument('--max-retries', type=int,
+                        help='Stop (exit 1) after this many failed attempts at one batch (default: retry forever)')
+    parser.add_argument('--queue-size', type=int, default=10000, help='Maximum buffered entries before producers block')
+    parser.add_argument('--task-interval', type=float, default=15.0, help='Seconds between task polls')
+    parser.add_argument('--no-tasks', action='store_true', help='Do not forward task state transitions')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+
+    config = load_config(args.config) if os.path.exists(args.config) else {}
+    hs_config = config.get('hammerspace', {})
+    api_url = args.api_url or hs_config.get('api_url') or os.getenv('HS_API_URL')
+    username = hs_config.get('username') or os.getenv('HS_USERNAME')
+    password = hs_config.get('password') or os.getenv('HS_PASSWORD')
+    if not api_url or not username or not password:
+        logger.error("Missing Hammerspace API URL or credentials")
+        return 1
+
+    client = HammerspaceApiClient(
+        base_url=api_url, username=username, password=password,
+        verify_ssl=hs_config.get('ssl_verify', True), timeout=hs_config.get('timeout', 30)
+    )
+    cluster_name = args.cluster_name
+    if not cluster_name:
+        try:
+            cluster_name = (client.cntl.get_cluster_state() or {}).get('name')
+        except Exception as e:
+            logger.warning(f"Could not read cluster name: {e}")
+        cluster_name = cluster_name or api_url
+
+    os.makedirs(args.state_dir, exist_ok=True)
+    entries: queue.Queue = queue.Queue(maxsize=args.queue_size)
+    stop_event = threading.Event()
+    source = HammerspaceSource(client, cluster_name, entries, args.state_dir, task_poll_seconds=args.task_interval)
+    pusher = LokiPusher(args.loki_url, entries, batch_size=args.batch_size, batch_wait_seconds=args.batch_wait,
+                        max_retries=args.max_retries, tenant=args.tenant, on_pushed=source.commit_events)
+    source.refresh_node_types()
+
+    threads = [threading.Thread(target=pusher.run, args=(stop_event,), name='pusher'),
+               threading.Thread(target=source.run_events, args=(stop_event,), name='events', daemon=True)]
+    if not args.no_tasks:
+        threads.append(threading.Thread(target=source.run_tasks, args=(stop_event,), name='tasks', daemon=True))
+    for thread in threads:
+        thread.start()
+    logger.info(f"✓ Forwarding events{'' if args.no_tasks else ' and task transitions'} of {cluster_name} to {pusher.push_url}")
+
+    try:
+        # The pusher only ends on its own when it gave up on a batch (--max-retries)
+        while threads[0].is_alive():
+            threads[0].join(1)
+    except KeyboardInterrupt:
+        logger.info("Stopping, flushing buffered entries...")
+    stop_event.set()
+    threads[0].join()
+    logger.info(f"Pushed {pusher.pushed} entries ({pusher.dropped} dropped)")
+    return 1 if pusher.gave_up else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Analyze the series cardinality of Hammerspace scrape jobs and generate drop rules.
+
+Reads a Prometheus server's TSDB status (/api/v1/status/tsdb) and the series of all
+Hammerspace node targets (/api/v1/series), ranks metrics and labels by series count
+per job, and writes `metric_relabel_configs` that drop the heaviest metrics and the
+high-cardinality labels that do not distinguish series. The rules are picked up by
+`generate_prometheus_config.py --metric-relabel-file`.
+
+The report estimates the head memory saved from the server's measured memory per
+series (process_resident_memory_bytes / head series), or --bytes-per-series.
+"""
+
+import os
+import sys
+import json
+import time
+import yaml
+import argparse
+import logging
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple
+from pathlib import Path
+
+import requests
+
+sys.path.append(os.path.dirname(__file__))
+
+from generate_recording_rules import DEFAULT_SELECTOR, RULE_FAMILIES  # noqa: E402
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = 'prometheus/metric_relabel.yaml'
+DEFAULT_BYTES_PER_SERIES = 4096
+# Labels that identify targets or are used by the recording rules are never dropped
+PROTECTED_LABELS = {'__name__', 'job', 'instance', 'cluster', 'node', 'node_type', 'exporter', 'site',
+                    'environment', 'device', 'fstype', 'mountpoint', 'le', 'quantile'}
+PROTECTED_METRICS = {metric for _, metric, _, _ in RULE_FAMILIES} | {'up', 'scrape_samples_scraped'}
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class PrometheusApi:
+    """Minimal client for the Prometheus HTTP API."""
+
+    def __init__(self, url: str, timeout: float = 60, verify_ssl: bool = True):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.verify = verify_ssl
+
+    def get(self, path: str, **params) -> Any:
+        response = self.session.get(f"{self.url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        body = response.json()
+        if body.get('status') != 'success':
+            raise RuntimeError(f"{path} failed: {body.get('error')}")
+        return body['data']
+
+    def tsdb_status(self) -> Dict[str, Any]:
+        return self.get('/api/v1/status/tsdb')
+
+    def series(self, match: str, lookback_seconds: float = 300) -> List[Dict[str, str]]:
+        end = time.time()
+        return self.get('/api/v1/series', **{'match[]': match, 'start': end - lookback_seconds, 'end': end})
+
+    def query_scalar(self, expr: str) -> Optional[float]:
+        try:
+            result = self.get('/api/v1/query', query=expr).get('result') or []
+            return float(result[0]['value'][1]) if result else None
+        except (requests.exceptions.RequestException, RuntimeError, KeyError, IndexError, ValueError) as e:
+            logger.debug(f"Query {expr!r} failed: {e}")
+            return None
+
+
+def rank_series(series: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Count series per job and metric, and distinct values per job and label.
+
+    Returns:
+        Dict with 'jobs' ({job: {'series', 'metrics': {name: count}, 'labels': {label: distinct values}}}),
+        'metrics' ({name: count}) and 'label_sets' ({name: [label sets]}) across all jobs
+    """
+    jobs: Dict[str, Dict[str, Any]] = {}
+    label_values: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+    metrics: Dict[str, int] = defaultdict(int)
+    label_sets: Dict[str, List[LabelSet]] = defaultdict(list)
+    for labels in series:
+        name = labels.get('__name__', '')
+        job = labels.get('job', '')
+        entry = jobs.setdefault(job, {'series': 0, 'metrics': defaultdict(int)})
+        entry['series'] += 1
+        entry['metrics'][name] += 1
+        metrics[name] += 1
+        label_sets[name].append(tuple(sorted(labels.items())))
+        for label, value in labels.items():
+            label_values[job][label].add(value)
+    for job, entry in jobs.items():
+        entry['metrics'] = dict(sorted(entry['metrics'].items(), key=lambda kv: (-kv[1], kv[0])))
+        entry['labels'] = dict(sorted(((label, len(values)) for label, values in label_values[job].items()),
+                                      key=lambda kv: (-kv[1], kv[0])))
+    return {'jobs': dict(sorted(jobs.items())), 'metrics': dict(metrics), 'label_sets': label_sets}
+
+
+def label_is_redundant(label: str, label_sets: Dict[str, List[LabelSet]], dropped: Set[str]) -> bool:
+    """Whether removing a label (on top of the already dropped ones) keeps every series of every metric distinct."""
+    for sets in label_sets.values():
+        if not any(label == k for labels in sets for k, _ in labels):
+            continue
+        reduced = {tuple(kv for kv in labels if kv[0] != label and kv[0] not in dropped) for labels in sets}
+        if len(reduced) != len(sets):
+            return False
+    return True
+
+
+def plan_rules(ranking: Dict[str, Any], max_series_per_metric: int, max_label_values: int,
+               keep_metrics: Set[str]) -> Dict[str, Any]:
+    """
+    Choose the metrics to drop (more than max_series_per_metric series) and the labels to
+    drop (more than max_label_values values in a job, and not needed to keep series apart).
+    """
+    drop_metrics = sorted(
+        name for name, count in ranking['metrics'].items()
+        if count > max_series_per_metric and name not in keep_metrics and name not in PROTECTED_METRICS
+    )
+    kept_sets = {name: sets for name, sets in ranking['label_sets'].items() if name not in drop_metrics}
+    # Count label values again without the dropped metrics, per job
+    values: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+    for sets in kept_sets.values():
+        for labels in sets:
+            job = dict(labels).get('job', '')
+            for label, value in labels:
+                if label not in PROTECTED_LABELS:
+                    values[(job, label)].add(value)
+    counts: Dict[str, int] = {}
+    for (_, label), seen in values.items():
+        if len(seen) > max_label_values:
+            counts[label] = max(counts.get(label, 0), len(seen))
+    # Highest cardinality first; each label is checked with the previously chosen ones removed
+    drop_labels, unsafe_labels = [], []
+    for label in sorted(counts, key=lambda l: (-counts[l], l)):
+        (drop_labels if label_is_redundant(label, kept_sets, set(drop_labels)) else unsafe_labels).append(label)
+    return {'drop_metrics': drop_metrics, 'drop_labels': sorted(drop_labels), 'unsafe_labels': sorted(unsafe_labels)}
+
+
+def build_metric_relabel_configs(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    configs = []
+    if plan['drop_metrics']:
+        configs.append({'source_labels': ['__name__'], 'regex': f"({'|'.join(plan['drop_metrics'])})", 'action': 'drop'})
+    if plan['drop_labels']:
+        configs.append({'regex': f"({'|'.join(plan['drop_labels'])})", 'action': 'labeldrop'})
+    return configs
+
+
+def estimate_savings(plan: Dict[str, Any], ranking: Dict[str, Any], tsdb: Dict[str, Any],
+                     bytes_per_series: float) -> Dict[str, Any]:
+    """Estimate the series and head memory the plan removes."""
+    dropped_series = sum(ranking['metrics'][name] for name in plan['drop_metrics'])
+    # labeldrop does not remove series; it frees the label's postings and symbols
+    label_memory = {item['name']: item['value'] for item in tsdb.get('memoryInBytesByLabelName') or []}
+    label_bytes = sum(label_memory.get(label, 0) for label in plan['drop_labels'])
+    series_bytes = dropped_series * bytes_per_series
+    return {
+        'dropped_series': dropped_series,
+        'hammerspace_series': sum(ranking['metrics'].values()),
+        'head_series': (tsdb.get('headStats') or {}).get('numSeries'),
+        'bytes_per_series': round(bytes_per_series),
+        'series_bytes': round(series_bytes),
+        'label_bytes': label_bytes,
+        'total_bytes': round(series_bytes + label_bytes),
+    }
+
+
+def format_report(ranking: Dict[str, Any], plan: Dict[str, Any], savings: Dict[str, Any], top: int) -> str:
+    lines = []
+    for job, entry in ranking['jobs'].items():
+        lines.append(f"Job {job or '(none)'}: {entry['series']} series")
+        for name, count in list(entry['metrics'].items())[:top]:
+            marker = ' [drop]' if name in plan['drop_metrics'] else ''
+            lines.append(f"  {count:8d}  {name}{marker}")
+        labels = ', '.join(f"{label}={values}" for label, values in list(entry['labels'].items())[:top])
+        lines.append(f"  label values: {labels}")
+    lines.append(f"Drop metrics: {', '.join(plan['drop_metrics']) or '-'}")
+    lines.append(f"Drop labels: {', '.join(plan['drop_labels']) or '-'}")
+    if plan['unsafe_labels']:
+        lines.append(f"Kept (dropping would merge series): {', '.join(plan['unsafe_labels'])}")
+    mib = 1024 * 1024
+    lines.append(
+        f"Estimated savings: {savings['dropped_series']} of {savings['hammerspace_series']} Hammerspace series "
+        f"(head: {savings['head_series']}), ~{savings['series_bytes'] / mib:.1f} MiB series memory at "
+        f"{savings['bytes_per_series']} B/series + {savings['label_bytes'] / mib:.1f} MiB label index "
+        f"= ~{savings['total_bytes'] / mib:.1f} MiB"
+    )
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Rank Hammerspace series cardinality and generate metric_relabel_configs')
+    parser.add_argument('--prometheus-url', default=os.getenv('PROMETHEUS_URL', 'http://localhost:9090'),
+                        help='Prometheus base URL')
+    parser.add_argument('--selector', default=DEFAULT_SELECTOR,
+                        help=f'Matchers selecting Hammerspace node series (default: {DEFAULT_SELECTOR})')
+    parser.add_argument('--lookback', type=float, default=300, help='Seconds of series to inspect (default: 300)')
+    parser.add_argument('--max-series-per-metric', type=int, default=5000,
+                        help='Drop metrics with more series than this (default: 5000)')
+    parser.add_argument('--max-label-values', type=int, default=1000,
+                        help='Drop labels with more values per job than this, if series stay distinct (default: 1000)')
+    parser.add_argument('--keep', action='append', default=[], help='Metric never to drop (repeatable)')
+    parser.add_argument('--bytes-per-series', type=float,
+                        help=f'Head memory per series (default: measured, else {DEFAULT_BYTES_PER_SERIES})')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'metric_relabel_configs file (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--report', help='Also write the ranking, plan and savings as JSON to this path')
+    parser.add_argument('--top', type=int, default=10, help='Metrics and labels listed per job in the report')
+    parser.add_argument('--no-verify', action='store_true', help='Disable TLS verification')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+
+    api = PrometheusApi(args.prometheus_url, verify_ssl=not args.no_verify)
+    try:
+        tsdb = api.tsdb_status()
+        series = api.series(f'{{{args.selector}}}', args.lookback)
+    except (requests.exceptions.RequestException, RuntimeError, ValueError) as e:
+        logger.error(f"Failed to read from {args.prometheus_url}: {e}")
+        return 1
+    logger.info(f"Read {len(series)} Hammerspace series "
+                f"({(tsdb.get('headStats') or {}).get('numSeries', '?')} in head)")
+
+    bytes_per_series = args.bytes_per_series
+    if bytes_per_series is None:
+        rss = api.query_scalar('sum(process_resident_memory_bytes{job="prometheus"})')
+        head_series = (tsdb.get('headStats') or {}).get('numSeries')
+        bytes_per_series = rss / head_series if rss and head_series else DEFAULT_BYTES_PER_SERIES
+
+    ranking = rank_series(series)
+    plan = plan_rules(ranking, args.max_series_per_metric, args.max_label_values, set(args.keep))
+    savings = estimate_savings(plan, ranking, tsdb, bytes_per_series)
+    print(format_report(ranking, plan, savings, args.top))
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        f.write('# Generated by scripts/prometheus/analyze_cardinality.py\n')
+        yaml.dump({'metric_relabel_configs': build_metric_relabel_configs(plan)}, f,
+                  default_flow_style=False, sort_keys=False)
+    logger.info(f"✓ metric_relabel_configs saved to {output_path}")
+
+    if args.report:
+        report = {
+            'prometheus_url': args.prometheus_url,
+            'jobs': {job: {**entry, 'metrics': dict(list(entry['metrics'].items())[:args.top])}
+                     for job, entry in ranking['jobs'].items()},
+            'plan': plan,
+            'savings': savings,
+        }
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"✓ Report saved to {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
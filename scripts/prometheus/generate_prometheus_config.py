@@ -4,7 +4,9 @@ Generate Prometheus configuration from discovered nodes and templates.
 """
 
 import os
+import re
 import sys
+import hashlib
 import yaml
 import argparse
 import logging
@@ -15,6 +17,13 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Exporter ports scraped on every node (same defaults as prometheus/configmap.yaml.j2)
+NODE_PORTS = {'metrics': 9100, 'api': 9101, 'c_metrics': 9102, 'c_advisor': 9103}
+# Node types served by scripts/hammerspace_http_sd.py
+HTTP_SD_NODE_TYPES = ('anvil', 'dsx')
+DEFAULT_TIER = {'interval': '15s', 'timeout': '10s', 'sample_limit': 0}
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'y': 31536000}
+
 def normalize_node(node: Any) -> Dict[str, Any]:
     """Normalize a node entry to a dictionary format."""
     if isinstance(node, dict):
@@ -45,50 +54,211 @@ def load_nodes_config(config_path: str) -> List[Dict[str, Any]]:
         logger.error(f"Failed to load config from {config_path}: {e}")
         return []
 
-def generate_prometheus_config(nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate Prometheus configuration from discovered nodes."""
-    # Filter nodes with IP addresses and format as targets
-    targets = []
+def load_scrape_tiers(config_path: str) -> Optional[Dict[str, Any]]:
+    """Load `global.prometheus.scrape_tiers` from the main config file, if set."""
+    try:
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.error(f"Failed to load config from {config_path}: {e}")
+        return None
+    return ((config.get('global') or {}).get('prometheus') or {}).get('scrape_tiers')
+
+def load_metric_relabel_configs(path: str) -> List[Dict[str, Any]]:
+    """Load the `metric_relabel_configs` list written by analyze_cardinality.py."""
+    with open(path, 'r') as f:
+        return (yaml.safe_load(f) or {}).get('metric_relabel_configs') or []
+
+def parse_duration(value: Any) -> float:
+    """Parse a Prometheus duration such as '15s', '1m30s' or '500ms' into seconds."""
+    text = str(value).strip()
+    parts = re.findall(r'(\d+)(ms|[smhdwy])', text)
+    if not parts or ''.join(n + u for n, u in parts) != text:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return sum(int(n) * DURATION_UNITS[u] for n, u in parts)
+
+def resolve_tier(tiers: Dict[str, Any], node_type: str, port_name: str) -> Dict[str, Any]:
+    """
+    Resolve the interval, timeout and sample_limit of one node type and port.
+
+    Later entries win: DEFAULT_TIER, `defaults`, `ports.<port>`, `node_types.<type>.defaults`
+    and `node_types.<type>.<port>`. The timeout is capped at the interval, which
+    Prometheus requires.
+    """
+    type_tiers = (tiers.get('node_types') or {}).get(node_type) or {}
+    tier = dict(DEFAULT_TIER)
+    for layer in (tiers.get('defaults'), (tiers.get('ports') or {}).get(port_name),
+                  type_tiers.get('defaults'), type_tiers.get(port_name)):
+        tier.update({k: v for k, v in (layer or {}).items() if k in DEFAULT_TIER})
+    if parse_duration(tier['timeout']) > parse_duration(tier['interval']):
+        logger.warning(f"Scrape timeout {tier['timeout']} of {node_type}/{port_name} exceeds "
+                       f"interval {tier['interval']}; using the interval")
+        tier['timeout'] = tier['interval']
+    return tier
+
+def tiered_jobs(nodes: List[Dict[str, Any]], tiers: Dict[str, Any], http_sd_url: Optional[str] = None,
+                http_sd_refresh: str = '1m', shards: int = 1, shard: int = 0) -> List[Dict[str, Any]]:
+    """
+    Build one scrape job per node type and exporter port, each with its own interval,
+    timeout and sample_limit (see resolve_tier).
+
+    Static jobs list the targets of their node type and port; nodes without a type (the
+    configured cluster addresses) are skipped. With http_sd_url every job
+    reads the same endpoint and keeps only its node_type/exporter targets. All jobs set
+    job="hammerspace", so existing queries keep matching.
+    """
+    if http_sd_url:
+        groups = {node_type: None for node_type in sorted(set(HTTP_SD_NODE_TYPES) | set(tiers.get('node_types') or {}))}
+    else:
+        groups = {}
+        for node in nodes:
+            ip_str = str(node.get('ip') or '').strip()
+            if not ip_str:
+                continue
+            if not node.get('type'):
+                # Untyped entries are configured cluster addresses, not nodes
+                logger.debug(f"Skipping node without a type: {node}")
+                continue
+            groups.setdefault(str(node['type']).lower(), []).append((ip_str, node.get('ports') or {}))
+
+    jobs = []
+    for node_type in sorted(groups):
+        for port_name, default_port in NODE_PORTS.items():
+            tier = resolve_tier(tiers, node_type, port_name)
+            job = {
+                'job_name': f'hammerspace-{node_type}-{port_name}',
+                'scrape_interval': tier['interval'],
+                'scrape_timeout': tier['timeout'],
+            }
+            if tier['sample_limit']:
+                job['sample_limit'] = int(tier['sample_limit'])
+            relabel_configs = shard_relabel_configs(shards, shard) if shards > 1 else []
+            labels = {'job': 'hammerspace', 'environment': 'production',
+                      'node_type': node_type, 'exporter': port_name}
+            if http_sd_url:
+                job['http_sd_configs'] = [{'url': http_sd_url, 'refresh_interval': http_sd_refresh}]
+                relabel_configs = [
+                    {'source_labels': ['node_type', 'exporter'], 'regex': f'{node_type};{port_name}', 'action': 'keep'}
+                ] + relabel_configs + [{'target_label': k, 'replacement': labels[k]} for k in ('job', 'environment')]
+            else:
+                targets = sorted({f"{ip}:{ports.get(port_name, default_port)}" for ip, ports in groups[node_type]})
+                job['static_configs'] = [{'targets': targets, 'labels': labels}]
+            if relabel_configs:
+                job['relabel_configs'] = relabel_configs
+            jobs.append(job)
+    return jobs
+
+def collect_targets(nodes: List[Dict[str, Any]], port: int = 9100) -> List[str]:
+    """Build the sorted, de-duplicated `ip:port` target list of the nodes."""
+    targets = set()
     for node in nodes:
-        ip = node.get('ip')
-        if not ip:
-            logger.debug(f"Skipping node with missing IP: {node}")
-            continue
-            
-        # Convert IP to string in case it's not already
-        ip_str = str(ip).strip()
+        ip_str = str(node.get('ip') or '').strip()
         if not ip_str:
-            logger.debug(f"Skipping empty IP in node: {node}")
+            logger.debug(f"Skipping node with missing IP: {node}")
             continue
-            
-        # Add port 9100 for node_exporter
-        target = f"{ip_str}:9100"
-        if target not in targets:  # Avoid duplicates
-            targets.append(target)
+        targets.add(f"{ip_str}:{port}")
+    # Sorted, so reordering or re-discovering the same nodes does not change the output
+    return sorted(targets)
+
+def hashmod_shard(address: str, modulus: int) -> int:
+    """The shard Prometheus' hashmod relabel action assigns to an __address__ value."""
+    digest = hashlib.md5(address.encode('utf-8')).digest()
+    return int.from_bytes(digest[8:], 'big') % modulus
+
+def shard_relabel_configs(shards: int, shard: int) -> List[Dict[str, Any]]:
+    """Relabel rules that keep only the targets whose address hashes to this shard."""
+    return [
+        {
+            'source_labels': ['__address__'],
+            'modulus': shards,
+            'target_label': '__tmp_hash',
+            'action': 'hashmod'
+        },
+        {
+            'source_labels': ['__tmp_hash'],
+            'regex': str(shard),
+            'action': 'keep'
+        }
+    ]
+
+def shard_output_path(output: str, shard: int) -> str:
+    """Output path of one shard: '{shard}' in the path is replaced, else '-shard<N>' is appended to the stem."""
+    if '{shard}' in output:
+        return output.replace('{shard}', str(shard))
+    path = Path(output)
+    return str(path.with_name(f"{path.stem}-shard{shard}{path.suffix}"))
+
+def hammerspace_nodes_job(targets: List[str], http_sd_url: Optional[str] = None,
+                          http_sd_refresh: str = '1m', shards: int = 1, shard: int = 0) -> Dict[str, Any]:
+    """Build the hammerspace-nodes scrape job from static targets or an http_sd endpoint."""
+    job = {'job_name': 'hammerspace-nodes', 'scrape_interval': '15s'}
+    if http_sd_url:
+        # Targets and their cluster/node_type/site labels come from scripts/hammerspace_http_sd.py
+        job['http_sd_configs'] = [{'url': http_sd_url, 'refresh_interval': http_sd_refresh}]
+        job['relabel_configs'] = [
+            {'target_label': 'job', 'replacement': 'hammerspace'},
+            {'target_label': 'environment', 'replacement': 'production'}
+        ]
+    if shards > 1:
+        job['relabel_configs'] = shard_relabel_configs(shards, shard) + job.get('relabel_configs', [])
+    if not http_sd_url:
+        job['static_configs'] = [
+            {
+                'targets': targets,
+                'labels': {
+                    'job': 'hammerspace',
+                    'environment': 'production'
+                }
+            }
+        ]
+    return job
+
+def generate_prometheus_config(nodes: List[Dict[str, Any]], http_sd_url: Optional[str] = None,
+                               http_sd_refresh: str = '1m', shards: int = 1, shard: int = 0,
+                               targets: Optional[List[str]] = None,
+                               tiers: Optional[Dict[str, Any]] = None,
+                               metric_relabel_configs: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Generate Prometheus configuration from discovered nodes.
+
+    With http_sd_url the hammerspace-nodes job discovers its targets from that
+    http_sd endpoint instead of listing them statically. With shards > 1 the config
+    is for replica `shard` of `shards`: every replica gets the same target list and a
+    hashmod relabel rule keeps only its share, and the replica is recorded in the
+    `prometheus_shard` external label. With tiers (`global.prometheus.scrape_tiers`)
+    the single job is replaced by per node type and port jobs (see tiered_jobs).
+    metric_relabel_configs (see analyze_cardinality.py) are added to every Hammerspace job.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {shard} out of range for {shards} shards")
+    if targets is None:
+        targets = collect_targets(nodes)
     
-    logger.info(f"Generated {len(targets)} targets for Prometheus")
+    if http_sd_url:
+        logger.info(f"Using http_sd targets from {http_sd_url}")
+    else:
+        logger.info(f"Generated {len(targets)} targets for Prometheus")
     
+    global_config = {
+        'scrape_interval': '15s',
+        'evaluation_interval': '15s',
+        'scrape_timeout': '10s',
+    }
+    if shards > 1:
+        global_config['external_labels'] = {'prometheus_shard': str(shard)}
+
+    hammerspace_jobs = (
+        tiered_jobs(nodes, tiers, http_sd_url, http_sd_refresh, shards, shard) if tiers else
+        [hammerspace_nodes_job(targets, http_sd_url, http_sd_refresh, shards, shard)]
+    )
+    if metric_relabel_configs:
+        for job in hammerspace_jobs:
+            job['metric_relabel_configs'] = metric_relabel_configs
+
     # Create Prometheus scrape config
     return {
-        'global': {
-            'scrape_interval': '15s',
-            'evaluation_interval': '15s',
-            'scrape_timeout': '10s',
-        },
-        'scrape_configs': [
-            {
-                'job_name': 'hammerspace-nodes',
-                'scrape_interval': '15s',
-                'static_configs': [
-                    {
-                        'targets': targets,
-                        'labels': {
-                            'job': 'hammerspace',
-                            'environment': 'production'
-                        }
-                    }
-                ]
-            },
+        'global': global_config,
+        'scrape_configs': hammerspace_jobs + [
             {
                 'job_name': 'prometheus',
                 'static_configs': [
@@ -120,6 +290,16 @@ def main():
     parser = argparse.ArgumentParser(description='Generate Prometheus configuration')
     parser.add_argument('--config', required=True, help='Path to the main config file')
     parser.add_argument('--output', required=True, help='Path to the output file')
+    parser.add_argument('--http-sd-url', help='Discover node targets from this http_sd endpoint '
+                        '(e.g. http://hammerspace-sd:9190/targets) instead of listing them statically')
+    parser.add_argument('--http-sd-refresh', default='1m', help='http_sd refresh interval (default: 1m)')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Number of Prometheus replicas sharing the targets via hashmod (default: 1)')
+    parser.add_argument('--shard', type=int,
+                        help='Generate only this shard (default: all shards, one file each; '
+                        '"{shard}" in --output is replaced by the shard index)')
+    parser.add_argument('--metric-relabel-file',
+                        help='Add the metric_relabel_configs of this file (from analyze_cardinality.py) to the node jobs')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     args = parser.parse_args()
     
@@ -133,24 +313,53 @@ def main():
     else:
         logger.info(f"Loaded {len(nodes)} nodes from config")
     
-    # Generate Prometheus config
-    prometheus_config = generate_prometheus_config(nodes)
-    
-    # Ensure output directory exists
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if args.shards < 1:
+        parser.error('--shards must be at least 1')
+    if args.shard is not None and not 0 <= args.shard < args.shards:
+        parser.error(f'--shard must be between 0 and {args.shards - 1}')
     
-    # Write config to file
-    with open(output_path, 'w') as f:
-        yaml.dump(prometheus_config, f, default_flow_style=False, sort_keys=False)
+    targets = collect_targets(nodes)
+    tiers = load_scrape_tiers(args.config)
+    metric_relabel_configs = None
+    if args.metric_relabel_file:
+        metric_relabel_configs = load_metric_relabel_configs(args.metric_relabel_file)
+        logger.info(f"Adding {len(metric_relabel_configs)} metric_relabel_configs from {args.metric_relabel_file}")
+    if tiers:
+        logger.info("Generating per node type and port jobs from global.prometheus.scrape_tiers")
+    if args.shards == 1:
+        outputs = [(0, args.output)]
+    elif args.shard is not None:
+        outputs = [(args.shard, args.output.replace('{shard}', str(args.shard)))]
+    else:
+        outputs = [(shard, shard_output_path(args.output, shard)) for shard in range(args.shards)]
     
-    logger.info(f"✓ Prometheus configuration saved to {output_path}")
+    if args.shards > 1 and not args.http_sd_url:
+        counts = [0] * args.shards
+        for target in targets:
+            counts[hashmod_shard(target, args.shards)] += 1
+        logger.info(f"Targets per shard: {counts}")
     
-    # Print the generated config if debug is enabled
-    if args.debug:
-        logger.debug("Generated Prometheus configuration:")
-        with open(output_path, 'r') as f:
-            logger.debug(f.read())
+    for shard, output in outputs:
+        # Generate Prometheus config
+        prometheus_config = generate_prometheus_config(nodes, args.http_sd_url, args.http_sd_refresh,
+                                                       args.shards, shard, targets=targets, tiers=tiers,
+                                                       metric_relabel_configs=metric_relabel_configs)
+        
+        # Ensure output directory exists
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write config to file
+        with open(output_path, 'w') as f:
+            yaml.dump(prometheus_config, f, default_flow_style=False, sort_keys=False)
+        
+        logger.info(f"✓ Prometheus configuration saved to {output_path}")
+        
+        # Print the generated config if debug is enabled
+        if args.debug:
+            logger.debug("Generated Prometheus configuration:")
+            with open(output_path, 'r') as f:
+                logger.debug(f.read())
 
 if __name__ == '__main__':
     main()
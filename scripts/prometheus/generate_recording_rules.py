@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Generate Prometheus recording rules for the Hammerspace dashboards.
+
+The rules pre-aggregate node_exporter throughput, IOPS, capacity and error rates of
+all Hammerspace nodes per cluster and node type, and write them to a rule file for
+the `rule_files: /etc/prometheus/rules/*.rules` path of prometheus/configmap.yaml.j2
+(optionally wrapped in the `prometheus-rules` ConfigMap mounted there).
+
+With --dashboards-dir, panel queries of Grafana dashboard JSON files that compute
+the same aggregation from raw series are rewritten to read the recorded series.
+"""
+
+import os
+import re
+import sys
+import json
+import yaml
+import argparse
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = 'prometheus/rules/hammerspace.rules'
+DEFAULT_SELECTOR = 'cluster!=""'
+DEFAULT_WINDOW = '5m'
+DEFAULT_INTERVAL = '30s'
+CONFIGMAP_NAME = 'prometheus-rules'
+RULES_KEY = 'hammerspace.rules'
+AGGREGATION_LABELS = ('cluster', 'node_type')
+
+# (group, source metric, kind, extra matchers) - kind 'rate' records per-second rates of counters,
+# 'sum' records summed gauges. Extra matchers are part of the rule and must also be in a panel query.
+RULE_FAMILIES = [
+    ('hammerspace-throughput', 'node_disk_read_bytes_total', 'rate', ()),
+    ('hammerspace-throughput', 'node_disk_written_bytes_total', 'rate', ()),
+    ('hammerspace-throughput', 'node_network_receive_bytes_total', 'rate', (('device', '!=', 'lo'),)),
+    ('hammerspace-throughput', 'node_network_transmit_bytes_total', 'rate', (('device', '!=', 'lo'),)),
+    ('hammerspace-iops', 'node_disk_reads_completed_total', 'rate', ()),
+    ('hammerspace-iops', 'node_disk_writes_completed_total', 'rate', ()),
+    ('hammerspace-capacity', 'node_filesystem_size_bytes', 'sum', (('fstype', '!~', 'tmpfs|overlay|squashfs'),)),
+    ('hammerspace-capacity', 'node_filesystem_avail_bytes', 'sum', (('fstype', '!~', 'tmpfs|overlay|squashfs'),)),
+    ('hammerspace-errors', 'node_network_receive_errs_total', 'rate', (('device', '!=', 'lo'),)),
+    ('hammerspace-errors', 'node_network_transmit_errs_total', 'rate', (('device', '!=', 'lo'),)),
+    ('hammerspace-errors', 'node_network_receive_drop_total', 'rate', (('device', '!=', 'lo'),)),
+    ('hammerspace-errors', 'node_network_transmit_drop_total', 'rate', (('device', '!=', 'lo'),)),
+]
+
+Matcher = Tuple[str, str, str]
+
+MATCHER_RE = re.compile(r'\s*([a-zA-Z_]\w*)\s*(=~|!~|!=|=)\s*"((?:[^"\\]|\\.)*)"\s*')
+GROUPING = r'(?:by\s*\(\s*(?P<{0}>[\w\s,]*)\))'
+SELECTOR = r'(?P<metric>[a-zA-Z_:][\w:]*)\s*(?:\{(?P<matchers>[^}]*)\})?'
+RATE_EXPR_RE = re.compile(
+    r'(?<![\w:])sum\s*(?:' + GROUPING.format('pre') + r'\s*)?\(\s*rate\s*\(\s*' + SELECTOR +
+    r'\s*\[(?P<window>[^\]]+)\]\s*\)\s*\)(?:\s*' + GROUPING.format('post') + r')?'
+)
+SUM_EXPR_RE = re.compile(
+    r'(?<![\w:])sum\s*(?:' + GROUPING.format('pre') + r'\s*)?\(\s*' + SELECTOR +
+    r'\s*\)(?:\s*' + GROUPING.format('post') + r')?'
+)
+
+
+def record_name(metric: str, kind: str, window: str) -> str:
+    """Recorded series name, following the level:metric:operations convention."""
+    if kind == 'rate':
+        return f"{':'.join(AGGREGATION_LABELS)}:{metric[:-len('_total')] if metric.endswith('_total') else metric}:rate{window}"
+    return f"{':'.join(AGGREGATION_LABELS)}:{metric}:sum"
+
+
+def format_matchers(matchers: List[Matcher]) -> str:
+    return ','.join(f'{label}{op}"{value}"' for label, op, value in matchers)
+
+
+def parse_matchers(text: Optional[str]) -> Optional[List[Matcher]]:
+    """Parse the inside of a PromQL selector; None if it is not a plain list of matchers."""
+    if not text or not text.strip():
+        return []
+    matchers = []
+    for part in re.split(r',(?=(?:[^"]*"[^"]*")*[^"]*$)', text.strip().rstrip(',')):
+        match = MATCHER_RE.fullmatch(part)
+        if not match:
+            return None
+        matchers.append(match.groups())
+    return matchers
+
+
+def build_rule_groups(selector: str = DEFAULT_SELECTOR, window: str = DEFAULT_WINDOW,
+                      interval: str = DEFAULT_INTERVAL) -> Dict[str, Any]:
+    """
+    Build the rule file content: one group per family (throughput, IOPS, capacity, errors),
+    each recording per cluster and node type series and per cluster totals.
+    """
+    by = ', '.join(AGGREGATION_LABELS)
+    groups: Dict[str, List[Dict[str, str]]] = {}
+    for group, metric, kind, extra in RULE_FAMILIES:
+        matchers = ','.join(filter(None, [selector, format_matchers(list(extra))]))
+        source = f'{metric}{{{matchers}}}'
+        inner = f'rate({source}[{window}])' if kind == 'rate' else source
+        record = record_name(metric, kind, window)
+        rules = groups.setdefault(group, [])
+        rules.append({'record': record, 'expr': f'sum by ({by}) ({inner})'})
+        rules.append({'record': 'cluster:' + record.split(':', len(AGGREGATION_LABELS))[-1],
+                      'expr': f'sum by (cluster) ({record})'})
+    return {'groups': [{'name': name, 'interval': interval, 'rules': rules} for name, rules in groups.items()]}
+
+
+def render_rules(rules: Dict[str, Any]) -> str:
+    header = '# Generated by scripts/prometheus/generate_recording_rules.py - do not edit\n'
+    return header + yaml.dump(rules, default_flow_style=False, sort_keys=False)
+
+
+class _BlockStyleDumper(yaml.SafeDumper):
+    """Dumps multi-line strings as literal blocks, so the embedded rule file stays readable."""
+
+
+_BlockStyleDumper.add_representer(str, lambda dumper, value: dumper.represent_scalar(
+    'tag:yaml.org,2002:str', value, style='|' if '\n' in value else None))
+
+
+def render_configmap(content: str, name: str = CONFIGMAP_NAME) -> str:
+    """Wrap the rule file in a ConfigMap (mounted at /etc/prometheus/rules by the Prometheus deployment)."""
+    return yaml.dump({
+        'apiVersion': 'v1',
+        'kind': 'ConfigMap',
+        'metadata': {'name': name},
+        'data': {RULES_KEY: content}
+    }, Dumper=_BlockStyleDumper, default_flow_style=False, sort_keys=False)
+
+
+def rewrite_expr(expr: str, window: str = DEFAULT_WINDOW, selector: str = DEFAULT_SELECTOR) -> Tuple[str, int]:
+    """
+    Replace sub-expressions computing a recorded aggregation from raw series.
+
+    A `sum [by (...)] (rate(metric{...}[w]))` (or `sum [by (...)] (metric{...})` for gauges)
+    is rewritten when the grouping labels are a subset of cluster/node_type, the window is
+    the rule window or $__rate_interval, and the matchers are the rule's own filters,
+    matchers on cluster or node_type, and matchers identical to one of the rule selector's
+    (which the recorded series already enforce). Anything else, e.g. a job="..." matcher
+    the selector does not contain, is left as is.
+
+    Returns:
+        Tuple of (new expression, number of replacements)
+    """
+    families = {metric: (kind, set(extra)) for _, metric, kind, extra in RULE_FAMILIES}
+    enforced = set(parse_matchers(selector) or [])
+    count = 0
+
+    def replace(match: re.Match, kind: str) -> str:
+        nonlocal count
+        metric = match.group('metric')
+        family = families.get(metric)
+        if not family or family[0] != kind:
+            return match.group(0)
+        if match.group('pre') is not None and match.group('post') is not None:
+            return match.group(0)
+        if kind == 'rate' and match.group('window').strip() not in (window, '$__rate_interval'):
+            return match.group(0)
+        grouping = match.group('pre') if match.group('pre') is not None else match.group('post') or ''
+        labels = [l.strip() for l in grouping.split(',') if l.strip()]
+        matchers = parse_matchers(match.group('matchers'))
+        if matchers is None or any(l not in AGGREGATION_LABELS for l in labels):
+            return match.group(0)
+        kept = [m for m in matchers if m[0] in AGGREGATION_LABELS]
+        filters = {m for m in matchers if m[0] not in AGGREGATION_LABELS}
+        if not family[1] <= filters or not filters - family[1] <= enforced:
+            return match.group(0)
+        count += 1
+        record = record_name(metric, kind, window)
+        if 'node_type' not in labels and not any(m[0] == 'node_type' for m in kept):
+            # The per cluster totals have fewer series to read
+            record = 'cluster:' + record.split(':', len(AGGREGATION_LABELS))[-1]
+        selector = f'{record}{{{format_matchers(kept)}}}' if kept else record
+        return f"sum by ({', '.join(labels)}) ({selector})" if labels else f'sum({selector})'
+
+    expr = RATE_EXPR_RE.sub(lambda m: replace(m, 'rate'), expr)
+    expr = SUM_EXPR_RE.sub(lambda m: replace(m, 'sum'), expr)
+    return expr, count
+
+
+def iter_targets(node: Any):
+    """Yield every panel query target (dicts with an 'expr') of a dashboard, including nested rows."""
+    if isinstance(node, dict):
+        for target in node.get('targets') or []:
+            if isinstance(target, dict) and isinstance(target.get('expr'), str):
+                yield target
+        for key in ('panels', 'rows', 'dashboard'):
+            yield from iter_targets(node.get(key))
+    elif isinstance(node, list):
+        for item in node:
+            yield from iter_targets(item)
+
+
+def rewrite_dashboards(directory: str, window: str = DEFAULT_WINDOW, dry_run: bool = False,
+                       selector: str = DEFAULT_SELECTOR) -> int:
+    """
+    Rewrite the panel queries of every *.json dashboard below a directory to use the
+    recorded series. Files are only written when a query changed.
+
+    Returns:
+        Number of rewritten queries
+    """
+    total = 0
+    for path in sorted(Path(directory).rglob('*.json')):
+        try:
+            with open(path, 'r') as f:
+                dashboard = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        changed = 0
+        for target in iter_targets(dashboard):
+            expr, count = rewrite_expr(target['expr'], window, selector)
+            if count:
+                logger.info(f"{path.name}: {target['expr']!r} -> {expr!r}")
+                target['expr'] = expr
+                changed += count
+        if changed and not dry_run:
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(dashboard, f, indent=2)
+                f.write('\n')
+            os.replace(tmp_path, path)
+        total += changed
+    return total
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Generate Prometheus recording rules for Hammerspace dashboards')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f'Rule file to write, e.g. /etc/prometheus/rules/hammerspace.rules (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--configmap', help=f'Also write the rules as the {CONFIGMAP_NAME} ConfigMap manifest to this path')
+    parser.add_argument('--selector', default=DEFAULT_SELECTOR,
+                        help=f'Matchers selecting Hammerspace node series (default: {DEFAULT_SELECTOR})')
+    parser.add_argument('--window', default=DEFAULT_WINDOW, help=f'rate() window (default: {DEFAULT_WINDOW})')
+    parser.add_argument('--interval', default=DEFAULT_INTERVAL, help=f'Rule evaluation interval (default: {DEFAULT_INTERVAL})')
+    parser.add_argument('--dashboards-dir', help='Rewrite panel queries of the Grafana dashboard JSON files in this directory')
+    parser.add_argument('--dry-run', action='store_true', help='Only log dashboard rewrites, do not write the files')
+    parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    args = parser.parse_args()
+
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+
+    content = render_rules(build_rule_groups(args.selector, args.window, args.interval))
+    for path, text in [(args.output, content)] + ([(args.configmap, render_configmap(content))] if args.configmap else []):
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as f:
+            f.write(text)
+        logger.info(f"✓ Recording rules saved to {output_path}")
+
+    if args.dashboards_dir:
+        rewritten = rewrite_dashboards(args.dashboards_dir, args.window, args.dry_run, args.selector)
+        logger.info(f"✓ {'Would rewrite' if args.dry_run else 'Rewrote'} {rewritten} dashboard queries in {args.dashboards_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
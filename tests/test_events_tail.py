@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+from hammerspace.events import EventsClient  # noqa: E402
+
+
+class FlakyEvents(EventsClient):
+    """Serves a fixed event list in pages; the listed page numbers fail once."""
+
+    def __init__(self, events, fail_pages=()):
+        super().__init__(api_client=None)
+        self.events = events
+        self.fail_pages = set(fail_pages)
+        self.calls = []
+
+    def get(self, identifier=None, **kwargs):
+        page, page_size = kwargs['page'], kwargs['page_size']
+        self.calls.append(kwargs)
+        if page in self.fail_pages:
+            self.fail_pages.discard(page)
+            raise ConnectionError('page unavailable')
+        mark = int(kwargs['spec'].split('=ge=')[1]) if 'spec' in kwargs else None
+        matching = [e for e in self.events if mark is None or e['created'] >= mark]
+        return matching[page * page_size:(page + 1) * page_size]
+
+
+def make_events(count):
+    return [{'uuid': f'e{i}', 'created': 1000 + i} for i in range(count)]
+
+
+def take(client, count, **kwargs):
+    stop_event = threading.Event()
+    delivered = []
+    for event in client.tail(stop_event=stop_event, min_poll_seconds=0, max_poll_seconds=0, **kwargs):
+        delivered.append(event['uuid'])
+        if len(delivered) == count:
+            stop_event.set()
+    return delivered
+
+
+def test_failed_page_does_not_advance_state(tmp_path):
+    state_file = str(tmp_path / 'tail.json')
+    client = FlakyEvents(make_events(5), fail_pages={1})
+    stop_event = threading.Event()
+    tail = client.tail(state_file=state_file, page_size=2, start_millis=0,
+                       stop_event=stop_event, min_poll_seconds=0, max_poll_seconds=0)
+
+    # The first poll fails on page 2: nothing is yielded and nothing is persisted
+    first = next(tail)
+    assert client.calls[1]['page'] == 1
+    assert not os.path.exists(state_file) or json.load(open(state_file))['high_water_mark'] == 0
+
+    # The retried poll starts from the original mark and delivers every event exactly once
+    delivered = [first['uuid']] + [next(tail)['uuid'] for _ in range(4)]
+    assert delivered == ['e0', 'e1', 'e2', 'e3', 'e4']
+    stop_event.set()
+    list(tail)
+
+    saved = json.load(open(state_file))
+    assert saved['high_water_mark'] == 1004
+    assert saved['recent_ids'] == ['e0', 'e1', 'e2', 'e3', 'e4']
+
+
+def test_restart_resumes_after_delivered_events(tmp_path):
+    state_file = str(tmp_path / 'tail.json')
+    events = make_events(3)
+    assert take(FlakyEvents(events), 3, state_file=state_file, start_millis=0) == ['e0', 'e1', 'e2']
+
+    events.append({'uuid': 'e3', 'created': 1002})
+    events.append({'uuid': 'e4', 'created': 1010})
+    # Events sharing the high-water timestamp are re-read but dropped as already seen
+    assert take(FlakyEvents(events), 2, state_file=state_file) == ['e3', 'e4']
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+from hammerspace.file_sync import FileSyncClient  # noqa: E402
+
+
+def not_found():
+    response = requests.models.Response()
+    response.status_code = 404
+    return requests.exceptions.HTTPError('404 Not Found', response=response)
+
+
+class FakeFiles:
+    """A share holding the listed directories; browsing anything else answers 404."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def browse_files(self, share, path, page=0, page_size=1000):
+        if path not in self.tree:
+            raise not_found()
+        return self.tree[path] if page == 0 else []
+
+
+class FakeApiClient:
+    def __init__(self, tree):
+        self.files = FakeFiles(tree)
+
+
+def test_missing_local_source_is_not_an_empty_tree(tmp_path):
+    sync = FileSyncClient(FakeApiClient({'dst': [{'name': 'keep.txt', 'size': 1}]}))
+    with pytest.raises(FileNotFoundError):
+        sync.plan_sync(str(tmp_path / 'typo'), 'share', 'dst', direction='upload', delete=True)
+
+
+def test_missing_remote_source_is_not_an_empty_tree(tmp_path):
+    (tmp_path / 'keep.txt').write_text('x')
+    sync = FileSyncClient(FakeApiClient({}))
+    with pytest.raises(FileNotFoundError):
+        sync.plan_sync(str(tmp_path), 'share', 'gone', direction='download', delete=True)
+
+
+def test_missing_destinations_are_created(tmp_path):
+    (tmp_path / 'a.txt').write_text('x')
+    upload = FileSyncClient(FakeApiClient({})).plan_sync(str(tmp_path), 'share', 'new', delete=True)
+    assert upload['create_remote_dir'] and upload['transfer'] == ['a.txt'] and upload['delete'] == []
+
+    download = FileSyncClient(FakeApiClient({'src': [{'name': 'b.txt', 'size': 1}]})).plan_sync(
+        str(tmp_path / 'new'), 'share', 'src', direction='download', delete=True)
+    assert download['transfer'] == ['b.txt'] and download['delete'] == []
@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+from hammerspace import HammerspaceApiClient  # noqa: E402
+from hammerspace.shares import SharesClient  # noqa: E402
+
+
+class ListingShares(SharesClient):
+    """Answers spec-filtered listings from a fixed share list, recording the specs."""
+
+    def __init__(self, api_client, shares):
+        super().__init__(api_client)
+        self.shares = shares
+        self.specs = []
+
+    def get(self, identifier=None, **kwargs):
+        spec = kwargs['spec']
+        self.specs.append(spec)
+        field, values = spec.split('=in=')
+        wanted = set(values.strip('()').split(','))
+        return [s for s in self.shares if self.api_client._field_value(s, field) in wanted]
+
+
+def test_get_many_filters_on_uoid_uuid():
+    client = HammerspaceApiClient(base_url='https://hs.example:8443/mgmt/v1.2/rest')
+    shares = [{'name': 'a', 'uoid': {'uuid': 'u1'}}, {'name': 'b', 'uoid': {'uuid': 'u2'}}]
+    client.shares = ListingShares(client, shares)
+
+    result = client.shares.get_many(['u2', 'u3', 'u1'])
+
+    assert client.shares.specs == ['uoid.uuid=in=(u2,u3,u1)']
+    assert [s and s['name'] for s in result['items']] == ['b', None, 'a']
+    assert result['missing'] == ['u3']
@@ -0,0 +1,179 @@
+import os
+import sys
+import gzip
+import json
+import queue
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import pytest  # noqa: E402
+
+from hammerspace.events import EventsClient  # noqa: E402
+from loki_event_bridge import LokiPusher, HammerspaceSource  # noqa: E402
+
+
+class StandInLoki:
+    """Records decoded push bodies and answers with the queued status codes (204 once drained)."""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.pushes = []
+        loki = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                loki.pushes.append({
+                    'path': self.path,
+                    'headers': dict(self.headers),
+                    'body': json.loads(gzip.decompress(body)),
+                })
+                status = loki.statuses.pop(0) if loki.statuses else 204
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeClient:
+    def __init__(self):
+        self.events = EventsClient(api_client=None)
+
+
+@pytest.fixture
+def source(tmp_path):
+    return HammerspaceSource(FakeClient(), 'hs1', queue.Queue(), str(tmp_path))
+
+
+def queue_event(source, event):
+    labels = source.labels('event', event['severity'], 'ANVIL')
+    source.entries.put(((labels, event['created'] * 1_000_000, json.dumps(event)), event))
+
+
+def run_pusher(pusher, stop_event):
+    thread = threading.Thread(target=pusher.run, args=(stop_event,))
+    thread.start()
+    return thread
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.05)
+
+
+def test_push_payload_and_state_after_retry(source):
+    loki = StandInLoki(statuses=[503, 429])
+    try:
+        states = []
+
+        def on_pushed(events):
+            # Only called once Loki answered 2xx
+            states.append(len(loki.pushes))
+            source.commit_events(events)
+
+        pusher = LokiPusher(loki.url, source.entries, batch_wait_seconds=0.2, tenant='team-a',
+                            on_pushed=on_pushed, max_backoff_seconds=0.05)
+        event = {'uuid': 'e1', 'created': 1700000000000, 'severity': 'WARNING', 'message': 'disk slow'}
+        queue_event(source, event)
+        source.entries.put(((source.labels('task', 'info', 'cluster'), 1700000000001000000, 'task line'), None))
+
+        stop_event = threading.Event()
+        thread = run_pusher(pusher, stop_event)
+        wait_until(lambda: states)
+        stop_event.set()
+        thread.join(timeout=30)
+        assert not thread.is_alive()
+
+        # Two transient failures, then the same batch again
+        assert len(loki.pushes) == 3
+        assert all(p['body'] == loki.pushes[0]['body'] for p in loki.pushes)
+        first = loki.pushes[0]
+        assert first['path'] == '/loki/api/v1/push'
+        assert first['headers']['Content-Encoding'] == 'gzip'
+        assert first['headers']['X-Scope-OrgID'] == 'team-a'
+        streams = {s['stream']['source']: s for s in first['body']['streams']}
+        assert streams['event']['stream'] == {'cluster': 'hs1', 'job': 'hammerspace-api', 'node_type': 'ANVIL',
+                                              'severity': 'warning', 'source': 'event'}
+        assert streams['event']['values'] == [['1700000000000000000', json.dumps(event)]]
+        assert streams['task']['values'] == [['1700000000001000000', 'task line']]
+
+        assert states == [3]
+        assert pusher.pushed == 2 and pusher.dropped == 0
+        with open(source.events_state_file) as f:
+            saved = json.load(f)
+        assert saved['high_water_mark'] == 1700000000000
+        assert saved['recent_ids'] == ['e1']
+    finally:
+        loki.close()
+
+
+def test_state_not_saved_when_push_never_succeeds(source):
+    loki = StandInLoki(statuses=[503] * 100)
+    try:
+        pushed = []
+        pusher = LokiPusher(loki.url, source.entries, batch_wait_seconds=0.1,
+                            on_pushed=pushed.append, max_backoff_seconds=0.05)
+        queue_event(source, {'uuid': 'e1', 'created': 1700000000000, 'severity': 'INFO'})
+
+        stop_event = threading.Event()
+        thread = run_pusher(pusher, stop_event)
+        wait_until(lambda: len(loki.pushes) >= 3)
+        stop_event.set()
+        thread.join(timeout=30)
+        assert not thread.is_alive()
+
+        assert len(loki.pushes) >= 3
+        assert pushed == []
+        assert not os.path.exists(source.events_state_file)
+    finally:
+        loki.close()
+
+
+def test_permanent_rejection_is_not_retried(source):
+    loki = StandInLoki(statuses=[400])
+    try:
+        pusher = LokiPusher(loki.url, source.entries, max_backoff_seconds=0.05)
+        entry = ((('source', 'event'),), 1, 'line')
+        assert pusher.push([entry]) is False
+        assert len(loki.pushes) == 1
+        assert pusher.dropped == 1
+    finally:
+        loki.close()
+
+
+def test_exhausted_retries_stop_before_later_batches(source):
+    loki = StandInLoki(statuses=[503, 503])
+    try:
+        pushed = []
+        pusher = LokiPusher(loki.url, source.entries, batch_size=1, batch_wait_seconds=0.1, max_retries=2,
+                            on_pushed=pushed.append, max_backoff_seconds=0.05)
+        queue_event(source, {'uuid': 'e1', 'created': 1700000000000, 'severity': 'INFO'})
+        queue_event(source, {'uuid': 'e2', 'created': 1700000001000, 'severity': 'INFO'})
+
+        stop_event = threading.Event()
+        thread = run_pusher(pusher, stop_event)
+        thread.join(timeout=30)
+        assert not thread.is_alive()
+
+        # e2 would succeed, but acknowledging it would move the mark past the unpushed e1
+        assert len(loki.pushes) == 2
+        assert pusher.gave_up and stop_event.is_set()
+        assert pushed == []
+        assert not os.path.exists(source.events_state_file)
+    finally:
+        loki.close()
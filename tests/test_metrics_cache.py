@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Hammerspace_SDK', 'hammerspace-api'))
+
+from hammerspace.metrics_cache import MetricsCache  # noqa: E402
+
+STEP = 60 * 1000
+BUCKET = STEP * 10
+
+
+class FakeMetrics:
+    """Serves one sample per step, except inside the gap; records the fetched ranges."""
+
+    def __init__(self, gap, empty=False):
+        self.gap = gap
+        self.empty = empty
+        self.calls = []
+
+    def query_metrics_custom(self, start, end, group_by, **kwargs):
+        self.calls.append((start, end))
+        if self.empty:
+            return []
+        times = [t for t in range(start - start % STEP, end + 1, STEP) if not self.gap[0] <= t < self.gap[1]]
+        return [{'name': 'cpu', 'tags': {}, 'columns': ['time', 'value'], 'values': [[t, 1.0] for t in times]}]
+
+
+class FakeApiClient:
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+
+def window():
+    now = int(time.time() * 1000)
+    start = now - now % BUCKET - 6 * BUCKET
+    return start, start + 4 * BUCKET - 1
+
+
+def test_closed_empty_bucket_is_cached_as_a_gap(tmp_path):
+    start, end = window()
+    metrics = FakeMetrics(gap=(start + BUCKET, start + 2 * BUCKET))
+    cache = MetricsCache(FakeApiClient(metrics), str(tmp_path), points_per_bucket=10)
+
+    first = cache.query_metrics_custom(start, end)
+    second = cache.query_metrics_custom(start, end)
+
+    assert metrics.calls == [(start, end)]
+    assert first == second
+    assert len(first[0]['columns']['time']) == 30
+
+
+def test_empty_response_is_not_cached(tmp_path):
+    start, end = window()
+    metrics = FakeMetrics(gap=(0, 0), empty=True)
+    cache = MetricsCache(FakeApiClient(metrics), str(tmp_path), points_per_bucket=10)
+
+    cache.query_metrics_custom(start, end)
+    cache.query_metrics_custom(start, end)
+
+    assert len(metrics.calls) == 2
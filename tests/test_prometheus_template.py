@@ -0,0 +1,34 @@
+import os
+
+import yaml
+from jinja2 import Environment, FileSystemLoader
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def render(prometheus, clusters):
+    """Renders prometheus/configmap.yaml.j2 with the same arguments as bootstrap.sh."""
+    env = Environment(loader=FileSystemLoader(ROOT), trim_blocks=True, lstrip_blocks=True)
+    rendered = env.get_template('prometheus/configmap.yaml.j2').render(
+        **{'global': {'namespace': 'monitoring', 'prometheus': prometheus}},
+        clusters=clusters,
+        k8s_namespace='monitoring'
+    )
+    return yaml.safe_load(yaml.safe_load(rendered)['data']['prometheus.yml'])['scrape_configs']
+
+
+def test_tiered_jobs_group_typed_nodes_and_cap_timeouts():
+    clusters = [
+        {'name': 'cluster-1', 'ip': '10.0.0.100', 'ports': {}},
+        {'name': 'anvil-1', 'ip': '10.0.0.1', 'type': 'ANVIL', 'cluster': 'hs', 'ports': {}},
+        {'name': 'anvil-2', 'ip': '10.0.0.2', 'type': 'ANVIL', 'cluster': 'hs', 'ports': {}},
+    ]
+    jobs = render({'scrape_tiers': {'ports': {'api': {'interval': '5s'}}}}, clusters)
+
+    node_jobs = {j['job_name']: j for j in jobs if j['job_name'].startswith('hammerspace-')}
+    assert sorted(node_jobs) == ['hammerspace-anvil-api', 'hammerspace-anvil-c_advisor',
+                                 'hammerspace-anvil-c_metrics', 'hammerspace-anvil-metrics']
+    api = node_jobs['hammerspace-anvil-api']
+    assert (api['scrape_interval'], api['scrape_timeout']) == ('5s', '5s')
+    assert [c['targets'] for c in api['static_configs']] == [['10.0.0.1:9101'], ['10.0.0.2:9101']]
+    assert api['static_configs'][0]['labels']['cluster'] == 'hs'